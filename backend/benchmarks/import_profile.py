@@ -0,0 +1,117 @@
+"""
+모듈 import 시간 프로파일 (python -X importtime)
+
+- 새 인터프리터에서 모듈을 import해 누적 시간이 큰 하위 모듈 상위 N개를 보여준다
+- import 시점에 로드되면 안 되는 무거운 SDK(openai, qdrant_client, elasticsearch, motor, passlib, jose 등)가
+  끌려오면 실패(exit 1) → 지연 import가 깨지는 변경을 잡는다
+- --max-ms를 주면 전체 import 시간 예산 초과도 실패로 처리
+
+사용법:
+    python -m backend.benchmarks.import_profile
+    python -m backend.benchmarks.import_profile --modules backend.main,backend.services.search_service --max-ms 800
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+REPO_ROOT: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# 첫 사용 시점에만 로드해야 하는 SDK (backend.core.clients / core.security / core.auth 참고)
+LAZY_MODULES: tuple = (
+    "openai",
+    "qdrant_client",
+    "elasticsearch",
+    "elastic_transport",
+    "motor",
+    "pymongo",
+    "passlib",
+    "jose",
+    "fitz",
+)
+
+_importtime_line = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+def profile_import(module: str) -> Dict:
+    """새 프로세스에서 module을 import하고 -X importtime 출력을 파싱"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        tail: str = "\n".join(completed.stderr.strip().splitlines()[-5:])
+        raise RuntimeError(f"{module} import 실패:\n{tail}")
+
+    entries: List[Dict] = []
+    for line in completed.stderr.splitlines():
+        match = _importtime_line.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                "depth": len(indent) // 2,
+            })
+    # 들여쓰기가 없는 항목이 최상위 import (합이 전체 import 시간)
+    total_us: int = sum(e["cumulative_us"] for e in entries if e["depth"] == 0)
+    loaded: set = {e["module"].split(".")[0] for e in entries}
+    return {
+        "module": module,
+        "total_ms": round(total_us / 1000, 2),
+        "entries": entries,
+        "lazy_violations": sorted(m for m in LAZY_MODULES if m in loaded),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="python -X importtime 기반 import 시간 점검")
+    parser.add_argument("--modules", default="backend.main", help="점검할 모듈 목록 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (전체 시간은 중앙값)")
+    parser.add_argument("--top", type=int, default=15, help="누적 시간 상위 N개 출력")
+    parser.add_argument("--max-ms", type=float, help="모듈별 전체 import 시간 예산 (ms)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    failed: bool = False
+    report: List[Dict] = []
+    for module in [m.strip() for m in args.modules.split(",") if m.strip()]:
+        runs: List[Dict] = [profile_import(module) for _ in range(max(1, args.repeat))]
+        total_ms: float = round(statistics.median(r["total_ms"] for r in runs), 2)
+        last: Dict = runs[-1]
+        top: List[Dict] = sorted(last["entries"], key=lambda e: e["cumulative_us"], reverse=True)[: args.top]
+
+        print(f"\n📦 {module}: {total_ms:.1f}ms (median of {len(runs)})", file=sys.stderr)
+        for e in top:
+            print(f"  {e['cumulative_us'] / 1000:>9.1f}ms  {'  ' * e['depth']}{e['module']}", file=sys.stderr)
+        if last["lazy_violations"]:
+            failed = True
+            print(f"❌ import 시점에 로드됨 (지연 import 필요): {', '.join(last['lazy_violations'])}", file=sys.stderr)
+        if args.max_ms is not None and total_ms > args.max_ms:
+            failed = True
+            print(f"❌ import 시간 예산 초과: {total_ms:.1f}ms > {args.max_ms:.1f}ms", file=sys.stderr)
+
+        report.append({
+            "module": module,
+            "total_ms": total_ms,
+            "runs_ms": [r["total_ms"] for r in runs],
+            "lazy_violations": last["lazy_violations"],
+            "top": [{"module": e["module"], "cumulative_ms": round(e["cumulative_us"] / 1000, 2)} for e in top],
+        })
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"results": report}, f, ensure_ascii=False, indent=2)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+FastAPI 앱 부하 테스트 드라이버
+
+loadtest_app(외부 서비스를 대체 클라이언트로 바꾼 backend.main:app)을 uvicorn 워커 수별로 띄우고,
+동시 요청 수(closed-loop 가상 사용자)별로 시나리오 혼합 부하를 걸어 처리량과 꼬리 지연을 측정한다.
+
+시나리오 (--mix 가중치):
+- search: GET  /api/patents/?tech_q=...&view=list   (ES 대체 + 쿼리 빌더)
+- detail: GET  /api/patents/{출원번호}                (ES 대체 + ETag)
+- chat:   POST /api/chatbot/ask                       (키워드 스캔 + Qdrant/OpenAI 대체 + mongomock 저장)
+- login:  POST /api/auth/login                        (bcrypt)
+
+동시 요청 수를 늘려도 rps가 늘지 않고 p95만 커지면 이벤트 루프가 막혀 있다는 뜻이다
+(키워드 스캔, bcrypt 등). 워커 수를 늘렸을 때 회복되는 정도로 CPU 병목인지 구분할 수 있다.
+
+사용법:
+    python -m backend.benchmarks.load_driver --workers 1,4 --concurrency 1,8,32,64 --duration 20 --output load.json
+    python -m backend.benchmarks.load_driver --mix chat=1 --openai-generation-latency lognormal:3000,0.4
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.benchmarks.run_search_bench import _git_commit, make_queries
+from backend.benchmarks.synthetic_corpus import TECH_TERMS, iter_patents, write_corpus
+
+REPO_ROOT: str = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+SCENARIOS: tuple = ("search", "detail", "chat", "login")
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for part in spec.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"알 수 없는 시나리오: {name} (가능: {', '.join(SCENARIOS)})")
+        mix[name] = int(weight or "1")
+    return {k: v for k, v in mix.items() if v > 0}
+
+
+def percentile_ms(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000, 2)
+
+
+def summarize(samples: Dict[str, List[float]], errors: Dict[str, int], wall_s: float) -> Dict[str, Dict]:
+    summary: Dict[str, Dict] = {}
+    names: List[str] = sorted(set(samples) | set(errors))
+    all_samples: List[float] = sorted(s for name in names for s in samples.get(name, []))
+    for name, values in [(n, sorted(samples.get(n, []))) for n in names] + [("total", all_samples)]:
+        error_count: int = sum(errors.values()) if name == "total" else errors.get(name, 0)
+        count: int = len(values) + error_count
+        summary[name] = {
+            "requests": count,
+            "rps": round(len(values) / wall_s, 2) if wall_s else 0.0,
+            "error_rate": round(error_count / count, 4) if count else 0.0,
+            "p50_ms": percentile_ms(values, 0.50),
+            "p95_ms": percentile_ms(values, 0.95),
+            "p99_ms": percentile_ms(values, 0.99),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        }
+    return summary
+
+
+class LoadClient:
+    """시나리오별 요청 생성 (가상 사용자마다 하나)"""
+
+    def __init__(self, http: httpx.AsyncClient, rng: random.Random, app_numbers: List[str], queries: List[str], user: dict):
+        self.http = http
+        self.rng = rng
+        self.app_numbers = app_numbers
+        self.queries = queries
+        self.user = user
+        self.session_id: Optional[str] = None
+
+    async def search(self) -> httpx.Response:
+        terms: str = " ".join(self.rng.sample(TECH_TERMS, 2))
+        return await self.http.get("/api/patents/", params={"tech_q": terms, "view": "list", "page": self.rng.randint(1, 5)})
+
+    async def detail(self) -> httpx.Response:
+        return await self.http.get(f"/api/patents/{self.rng.choice(self.app_numbers)}")
+
+    async def chat(self) -> httpx.Response:
+        # 같은 가상 사용자는 세션을 이어서 사용 (후속 질문/세션 저장 경로 포함)
+        response = await self.http.post(
+            "/api/chatbot/ask",
+            json={"query": self.rng.choice(self.queries), "session_id": self.session_id},
+        )
+        if response.status_code == 200:
+            self.session_id = response.json().get("session_id") or self.session_id
+        return response
+
+    async def login(self) -> httpx.Response:
+        return await self.http.post("/api/auth/login", json=self.user)
+
+
+async def run_level(
+    base_url: str, concurrency: int, duration_s: float, warmup_s: float, mix: Dict[str, int],
+    app_numbers: List[str], queries: List[str], user: dict, timeout_s: float,
+) -> Dict:
+    """concurrency명의 가상 사용자가 duration_s 동안 쉬지 않고 요청 (warmup_s 구간은 집계 제외)"""
+    samples: Dict[str, List[float]] = {name: [] for name in mix}
+    errors: Dict[str, int] = {name: 0 for name in mix}
+    status_codes: Dict[str, int] = {}
+    names: List[str] = list(mix)
+    weights: List[int] = [mix[n] for n in names]
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout_s, limits=limits) as http:
+        start: float = time.perf_counter()
+        measure_from: float = start + warmup_s
+        stop_at: float = measure_from + duration_s
+
+        async def virtual_user(index: int) -> None:
+            rng = random.Random(index)
+            client = LoadClient(http, rng, app_numbers, queries, user)
+            while time.perf_counter() < stop_at:
+                name: str = rng.choices(names, weights)[0]
+                sent: float = time.perf_counter()
+                try:
+                    response = await getattr(client, name)()
+                    ok: bool = response.status_code < 400
+                    code: str = str(response.status_code)
+                except httpx.HTTPError as e:
+                    ok, code = False, type(e).__name__
+                done: float = time.perf_counter()
+                if sent < measure_from:
+                    continue
+                status_codes[code] = status_codes.get(code, 0) + 1
+                if ok:
+                    samples[name].append(done - sent)
+                else:
+                    errors[name] += 1
+
+        await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+        wall_s: float = time.perf_counter() - measure_from
+
+    return {
+        "concurrency": concurrency,
+        "wall_s": round(wall_s, 2),
+        "status_codes": status_codes,
+        "scenarios": summarize(samples, errors, wall_s),
+    }
+
+
+def start_server(workers: int, port: int, env: dict) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "backend.benchmarks.loadtest_app:app",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=REPO_ROOT,
+        env=env,
+    )
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout_s: float) -> None:
+    deadline: float = time.time() + timeout_s
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn이 종료되었습니다 (exit={server.returncode})")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{timeout_s:.0f}초 안에 서버가 준비되지 않았습니다: {base_url}")
+
+
+def stop_server(server: subprocess.Popen) -> None:
+    server.terminate()
+    try:
+        server.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def print_table(workers: int, level: Dict) -> None:
+    print(f"\n▶ workers={workers} concurrency={level['concurrency']} ({level['wall_s']}s) status={level['status_codes']}", file=sys.stderr)
+    print(f"  {'scenario':<8} {'req':>7} {'rps':>9} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}", file=sys.stderr)
+    for name, s in level["scenarios"].items():
+        print(
+            f"  {name:<8} {s['requests']:>7} {s['rps']:>9.2f} {s['error_rate'] * 100:>5.1f}% "
+            f"{s['p50_ms']:>8.1f}ms {s['p95_ms']:>7.1f}ms {s['p99_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms",
+            file=sys.stderr,
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="FastAPI 앱 부하 테스트 (외부 서비스 대체 클라이언트 사용)")
+    parser.add_argument("--workers", default="1", help="uvicorn 워커 수 목록 (예: 1,2,4)")
+    parser.add_argument("--concurrency", default="1,8,32,64", help="동시 가상 사용자 수 목록")
+    parser.add_argument("--duration", type=float, default=20.0, help="단계별 측정 시간 (초)")
+    parser.add_argument("--warmup", type=float, default=3.0, help="단계별 워밍업 시간 (초, 집계 제외)")
+    parser.add_argument("--mix", default="search=6,detail=1,chat=2,login=1", help="시나리오 가중치")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--startup-timeout", type=float, default=300.0, help="서버 준비 대기 시간 (초)")
+    parser.add_argument("--corpus-size", type=int, default=10000)
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "linkai-bench"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--es-latency", default="lognormal:15,0.5", help="ms 단위 지연 분포 (stubs.parse_latency)")
+    parser.add_argument("--qdrant-latency", default="lognormal:20,0.4")
+    parser.add_argument("--openai-keyword-latency", default="lognormal:800,0.4")
+    parser.add_argument("--openai-embedding-latency", default="lognormal:150,0.3")
+    parser.add_argument("--openai-generation-latency", default="lognormal:3000,0.4")
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 stdout)")
+    args = parser.parse_args()
+
+    mix: Dict[str, int] = parse_mix(args.mix)
+    worker_counts: List[int] = [int(w) for w in args.workers.split(",") if w.strip()]
+    levels: List[int] = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    # 워커들이 동시에 코퍼스를 만들지 않도록 미리 생성
+    corpus_path: str = os.path.join(args.corpus_dir, f"patents_{args.corpus_size}_{args.seed}.json")
+    print(f"📝 코퍼스 준비: {args.corpus_size}건 → {corpus_path}", file=sys.stderr)
+    write_corpus(corpus_path, args.corpus_size, args.seed)
+    app_numbers: List[str] = [p["applicationNumber"] for p in iter_patents(min(args.corpus_size, 5000), args.seed)]
+    queries: List[str] = make_queries(200)
+    user: dict = {"email": "loadtest@example.com", "password": "loadtest-password"}
+
+    env: dict = {
+        **os.environ,
+        "LOADTEST_CORPUS_PATH": corpus_path,
+        "LOADTEST_CORPUS_SIZE": str(args.corpus_size),
+        "LOADTEST_CORPUS_SEED": str(args.seed),
+        "LOADTEST_ES_LATENCY": args.es_latency,
+        "LOADTEST_QDRANT_LATENCY": args.qdrant_latency,
+        "LOADTEST_OPENAI_KEYWORD_LATENCY": args.openai_keyword_latency,
+        "LOADTEST_OPENAI_EMBEDDING_LATENCY": args.openai_embedding_latency,
+        "LOADTEST_OPENAI_GENERATION_LATENCY": args.openai_generation_latency,
+        "LOADTEST_USER_EMAIL": user["email"],
+        "LOADTEST_USER_PASSWORD": user["password"],
+        # 로그인 시나리오가 rate limit(429)에 걸리지 않도록 (bcrypt 비용 자체를 측정)
+        "LOGIN_RATE_LIMIT_PER_IP": "1000000000",
+        "LOGIN_FAILURE_LIMIT": "1000000000",
+        "PYTHONUNBUFFERED": "1",
+    }
+    base_url: str = f"http://127.0.0.1:{args.port}"
+
+    runs: List[Dict] = []
+    for workers in worker_counts:
+        print(f"🚀 uvicorn 시작: workers={workers}", file=sys.stderr)
+        server = start_server(workers, args.port, env)
+        try:
+            wait_until_ready(base_url, server, args.startup_timeout)
+            for concurrency in levels:
+                level = asyncio.run(run_level(
+                    base_url, concurrency, args.duration, args.warmup, mix,
+                    app_numbers, queries, user, args.timeout,
+                ))
+                level["workers"] = workers
+                print_table(workers, level)
+                runs.append(level)
+        finally:
+            stop_server(server)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "corpus_size": args.corpus_size,
+            "mix": mix,
+            "duration_s": args.duration,
+            "latency": {
+                "es": args.es_latency,
+                "qdrant": args.qdrant_latency,
+                "openai_keyword": args.openai_keyword_latency,
+                "openai_embedding": args.openai_embedding_latency,
+                "openai_generation": args.openai_generation_latency,
+            },
+        },
+        "runs": runs,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
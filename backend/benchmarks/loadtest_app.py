@@ -0,0 +1,119 @@
+"""
+부하 테스트용 FastAPI 앱: backend.main:app을 그대로 쓰되 외부 서비스만 대체 클라이언트로 바꾼다
+
+- Elasticsearch / Qdrant / OpenAI → benchmarks.stubs (지연 분포 설정 가능)
+- MongoDB → mongomock-motor (워커 프로세스별 in-memory 저장소)
+- 코퍼스 → synthetic_corpus 합성 데이터 (load_corpus 경로는 실제와 동일하므로 키워드 스캔 비용이 그대로 재현됨)
+
+실행:
+    uvicorn backend.benchmarks.loadtest_app:app --workers 4
+
+환경 변수 (지연은 stubs.parse_latency 형식, ms 단위):
+    LOADTEST_CORPUS_PATH / LOADTEST_CORPUS_SIZE (기본 10000) / LOADTEST_CORPUS_SEED (기본 42)
+    LOADTEST_ES_LATENCY                  기본 lognormal:15,0.5
+    LOADTEST_QDRANT_LATENCY              기본 lognormal:20,0.4
+    LOADTEST_OPENAI_KEYWORD_LATENCY      기본 lognormal:800,0.4
+    LOADTEST_OPENAI_EMBEDDING_LATENCY    기본 lognormal:150,0.3
+    LOADTEST_OPENAI_GENERATION_LATENCY   기본 lognormal:3000,0.4
+    LOADTEST_USER_EMAIL / LOADTEST_USER_PASSWORD  로그인 시나리오용 계정 (워커 시작 시 생성)
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from mongomock_motor import AsyncMongoMockClient
+
+from backend.benchmarks.stubs import (
+    StubAsyncElasticsearch,
+    StubAsyncOpenAI,
+    StubAsyncQdrantClient,
+    parse_latency,
+)
+from backend.benchmarks.synthetic_corpus import iter_patents, write_corpus
+
+LOADTEST_CORPUS_SIZE: int = int(os.getenv("LOADTEST_CORPUS_SIZE", "10000"))
+LOADTEST_CORPUS_SEED: int = int(os.getenv("LOADTEST_CORPUS_SEED", "42"))
+LOADTEST_CORPUS_PATH: str = os.getenv(
+    "LOADTEST_CORPUS_PATH",
+    os.path.join(tempfile.gettempdir(), "linkai-bench", f"patents_{LOADTEST_CORPUS_SIZE}_{LOADTEST_CORPUS_SEED}.json"),
+)
+LOADTEST_DB_NAME: str = os.getenv("LOADTEST_DB_NAME", "loadtest")
+LOADTEST_USER_EMAIL: str = os.getenv("LOADTEST_USER_EMAIL", "loadtest@example.com")
+LOADTEST_USER_PASSWORD: str = os.getenv("LOADTEST_USER_PASSWORD", "loadtest-password")
+
+write_corpus(LOADTEST_CORPUS_PATH, LOADTEST_CORPUS_SIZE, LOADTEST_CORPUS_SEED)
+
+from backend.core import clients
+from backend.database import db_manager
+from backend.main import app
+from backend.services import search_service
+
+mongo_client = AsyncMongoMockClient()
+
+
+def to_service_document(raw: dict) -> dict:
+    """합성 원본 → ES 목록 응답에 필요한 서비스 문서 필드"""
+    biblio: dict = raw["biblioSummaryInfoArray"]["biblioSummaryInfo"]
+    applicant: dict = raw["applicantInfoArray"]["applicantInfo"][0]
+    return {
+        "applicationNumber": raw["applicationNumber"],
+        "applicationDate": biblio["applicationDate"],
+        "status": biblio["registerStatus"],
+        "title": {"ko": biblio["inventionTitle"], "en": biblio["inventionTitleEng"]},
+        "applicant": {"name": applicant["name"], "country": applicant["country"]},
+        "inventors": raw["inventorInfoArray"]["inventorInfo"],
+        "abstract": raw["abstractInfoArray"]["abstractInfo"]["astrtCont"],
+        "ipcCodes": [i["ipcNumber"] for i in raw["ipcInfoArray"]["ipcInfo"]],
+    }
+
+
+def _connect_mock() -> None:
+    db_manager.client = mongo_client
+    db_manager.db = mongo_client[LOADTEST_DB_NAME]
+    print(f"✅ MongoDB(mongomock) 연결 (DB: {LOADTEST_DB_NAME})")
+
+
+def _init_stub_clients() -> None:
+    search_service.client_openai = StubAsyncOpenAI(
+        keyword_latency=parse_latency(os.getenv("LOADTEST_OPENAI_KEYWORD_LATENCY", "lognormal:800,0.4")),
+        embedding_latency=parse_latency(os.getenv("LOADTEST_OPENAI_EMBEDDING_LATENCY", "lognormal:150,0.3")),
+        generation_latency=parse_latency(os.getenv("LOADTEST_OPENAI_GENERATION_LATENCY", "lognormal:3000,0.4")),
+    )
+    search_service.client_qdrant = StubAsyncQdrantClient(
+        latency=parse_latency(os.getenv("LOADTEST_QDRANT_LATENCY", "lognormal:20,0.4")),
+    )
+    print("▶ Stub OpenAI/Qdrant clients")
+
+
+# 외부 연결 지점만 교체하고 startup 흐름(db 연결 → 코퍼스 로드)은 그대로 둔다
+db_manager.connect = _connect_mock
+search_service.init_clients = _init_stub_clients
+search_service.JSON_PATH = LOADTEST_CORPUS_PATH
+clients.elasticsearch_client = StubAsyncElasticsearch(
+    [to_service_document(raw) for raw in iter_patents(min(LOADTEST_CORPUS_SIZE, 5000), LOADTEST_CORPUS_SEED)],
+    latency=parse_latency(os.getenv("LOADTEST_ES_LATENCY", "lognormal:15,0.5")),
+)
+
+
+@app.on_event("startup")
+async def _prepare_loadtest_state() -> None:
+    from backend.core.security import get_password_hash
+
+    # 측정이 코퍼스 로딩과 겹치지 않도록 이 워커는 로딩이 끝난 뒤에 요청을 받는다
+    await app.state.search_init_task
+
+    # Qdrant 대체 클라이언트가 실제 코퍼스의 출원번호를 돌려주도록 연결
+    if isinstance(search_service.client_qdrant, StubAsyncQdrantClient):
+        search_service.client_qdrant.app_numbers = list(search_service.corpus.index)
+
+    users = db_manager.db["users"]
+    if not await users.find_one({"email": LOADTEST_USER_EMAIL}):
+        await users.insert_one({
+            "email": LOADTEST_USER_EMAIL,
+            "password": get_password_hash(LOADTEST_USER_PASSWORD),
+            "name": "부하테스트",
+            "role": "user",
+            "status": "active",
+        })
@@ -0,0 +1,288 @@
+"""
+search_service 오프라인 벤치마크
+
+합성 KIPRIS 코퍼스(synthetic_corpus)와 OpenAI/Qdrant 대체 클라이언트(stubs)로 다음을 측정한다.
+- load_corpus 시작 시간과 peak RSS
+- build_patent_context_ko / ES 쿼리 빌더(_build_search_query) 호출당 시간
+- simple_match_search_app_numbers(키워드 전체 스캔) / hybrid_retrieve 질의당 지연 (p50/p95/max)
+- 동시 요청 수별 처리량 (이벤트 루프를 막는 스캔이 처리량을 얼마나 제한하는지)
+
+코퍼스 크기마다 새 프로세스에서 실행하므로 peak RSS가 서로 섞이지 않는다.
+외부 서비스 접속 없이 동작한다.
+
+사용법:
+    python -m backend.benchmarks.run_search_bench --sizes 10000,100000 --output bench.json
+    python -m backend.benchmarks.run_search_bench --sizes 10000 --compare bench.json   # 이전 결과와 비교
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.benchmarks.synthetic_corpus import FAMILY_NAMES, GIVEN_NAMES, TECH_TERMS, write_corpus
+
+# 비교 시 "낮을수록 좋은" 지표와 "높을수록 좋은" 지표
+LOWER_IS_BETTER: tuple = ("_s", "_mb", "_us", "_ms")
+HIGHER_IS_BETTER: tuple = ("qps",)
+
+
+def peak_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def latency_summary(samples_s: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples_s)
+    if not ordered:
+        return {}
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] * 1000
+
+    return {
+        "p50_ms": round(pick(0.50), 3),
+        "p95_ms": round(pick(0.95), 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000, 3),
+    }
+
+
+def make_queries(count: int, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    templates = [
+        "{t1} 관련 특허 알려줘",
+        "{name} 교수의 {t1} 특허",
+        "{t1}와 {t2}를 함께 사용하는 기술",
+        "{t1} {t2} 특허 몇 개야?",
+    ]
+    return [
+        rng.choice(templates).format(
+            t1=rng.choice(TECH_TERMS),
+            t2=rng.choice(TECH_TERMS),
+            name=rng.choice(FAMILY_NAMES) + rng.choice(GIVEN_NAMES),
+        )
+        for _ in range(count)
+    ]
+
+
+async def _timed_queries(func, queries: List[str], limit: int) -> List[float]:
+    samples: List[float] = []
+    for q in queries:
+        start = time.perf_counter()
+        await func(q, limit)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def _concurrent_throughput(func, queries: List[str], limit: int, concurrency: int) -> Dict[str, float]:
+    """concurrency개의 작업자가 queries를 나눠 처리할 때 처리량과 지연"""
+    pending = list(queries)
+    samples: List[float] = []
+
+    async def worker() -> None:
+        while pending:
+            q = pending.pop()
+            start = time.perf_counter()
+            await func(q, limit)
+            samples.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_s = time.perf_counter() - wall_start
+    return {"concurrency": concurrency, "qps": round(len(queries) / wall_s, 3), **latency_summary(samples)}
+
+
+def bench_corpus(corpus_path: str, size: int, query_count: int, concurrency_levels: List[int], latency_s: float) -> Dict:
+    """자식 프로세스에서 실행: 코퍼스 하나에 대한 전체 측정"""
+    from backend.benchmarks.stubs import StubAsyncOpenAI, StubAsyncQdrantClient
+
+    result: Dict = {"size": size}
+    rss_before = peak_rss_mb()
+
+    import_start = time.perf_counter()
+    from backend.services import search_service
+    result["import_s"] = round(time.perf_counter() - import_start, 4)
+
+    # load_corpus의 진행 출력은 결과 JSON과 섞이지 않도록 버린다
+    load_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        search_service.load_corpus(corpus_path)
+    result["startup_s"] = round(time.perf_counter() - load_start, 3)
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    result["corpus_rss_mb"] = round(peak_rss_mb() - rss_before, 1)
+    result["flattened"] = len(search_service.corpus.flattened)
+
+    # build_patent_context_ko 호출당 시간
+    sample = search_service.corpus.patents[:2000]
+    start = time.perf_counter()
+    for patent in sample:
+        search_service.build_patent_context_ko(patent)
+    result["build_context_us"] = round((time.perf_counter() - start) / max(1, len(sample)) * 1e6, 2)
+
+    # ES 쿼리 빌더 호출당 시간 (elasticsearch 패키지가 없으면 생략)
+    try:
+        from backend.routes.patents import _build_search_query, _build_status_filter
+
+        iterations = 5000
+        start = time.perf_counter()
+        for i in range(iterations):
+            _build_search_query(
+                tech_q="이차전지 AND 양극활물질 OR 전해질", prod_q=None, desc_q="고체전해질", claim_q=None,
+                inventor="김민수", manager=None, applicant="한양대학교", app_num=f"10-2020-{i:07d}",
+                reg_num=None,
+            )
+            _build_status_filter(["등록"])
+        result["query_builder_us"] = round((time.perf_counter() - start) / iterations * 1e6, 2)
+    except ImportError as e:
+        result["query_builder_us"] = None
+        result["query_builder_skipped"] = repr(e)
+
+    # 검색 경로: OpenAI/Qdrant를 대체 클라이언트로 교체
+    app_numbers = list(search_service.corpus.index)
+    search_service.client_openai = StubAsyncOpenAI(
+        keyword_latency=latency_s, embedding_latency=latency_s, generation_latency=latency_s
+    )
+    search_service.client_qdrant = StubAsyncQdrantClient(app_numbers, latency=latency_s)
+    queries = make_queries(query_count)
+
+    async def run_search_benchmarks() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            scan = await _timed_queries(search_service.simple_match_search_app_numbers, queries, 10)
+            hybrid = await _timed_queries(search_service.hybrid_retrieve, queries, 10)
+            result["scan"] = latency_summary(scan)
+            result["hybrid_retrieve"] = latency_summary(hybrid)
+            result["concurrency"] = [
+                await _concurrent_throughput(search_service.hybrid_retrieve, queries, 10, level)
+                for level in concurrency_levels
+            ]
+
+    asyncio.run(run_search_benchmarks())
+    result["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except Exception:
+        return None
+
+
+def _flatten(prefix: str, value, out: Dict[str, float]) -> None:
+    if isinstance(value, dict):
+        for k, v in value.items():
+            _flatten(f"{prefix}.{k}" if prefix else k, v, out)
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict) and "concurrency" in item:
+                _flatten(f"{prefix}[c={item['concurrency']}]", {k: v for k, v in item.items() if k != "concurrency"}, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = float(value)
+
+
+def compare_results(current: Dict, baseline: Dict, max_regression: float) -> List[str]:
+    """같은 코퍼스 크기끼리 지표를 비교해 max_regression 이상 나빠진 항목 목록을 반환"""
+    regressions: List[str] = []
+    baseline_by_size = {r["size"]: r for r in baseline.get("results", [])}
+    for run in current.get("results", []):
+        base = baseline_by_size.get(run["size"])
+        if not base:
+            continue
+        now_metrics: Dict[str, float] = {}
+        base_metrics: Dict[str, float] = {}
+        _flatten("", run, now_metrics)
+        _flatten("", base, base_metrics)
+        for key, now in sorted(now_metrics.items()):
+            before = base_metrics.get(key)
+            if not before or key == "size":
+                continue
+            change = (now - before) / before
+            if key.endswith(HIGHER_IS_BETTER):
+                worse = -change
+            elif key.endswith(LOWER_IS_BETTER):
+                worse = change
+            else:
+                continue
+            marker = "❌" if worse > max_regression else "  "
+            print(f"{marker} size={run['size']:>8} {key:<40} {before:>12.3f} → {now:>12.3f} ({change:+.1%})")
+            if worse > max_regression:
+                regressions.append(f"size={run['size']} {key}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="search_service 오프라인 벤치마크")
+    parser.add_argument("--sizes", default="10000", help="코퍼스 크기 목록 (예: 10000,100000,1000000)")
+    parser.add_argument("--queries", type=int, default=50, help="측정 질의 수")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시 요청 수 목록")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="대체 OpenAI/Qdrant 호출당 지연 (ms)")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "linkai-bench"))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 저장 경로 (없으면 stdout)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="허용 악화 비율 (기본 20%%)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    results: List[Dict] = []
+    ctx = multiprocessing.get_context("spawn")
+    for size in sizes:
+        corpus_path = os.path.join(args.corpus_dir, f"patents_{size}_{args.seed}.json")
+        print(f"📝 코퍼스 준비: {size}건 → {corpus_path}", file=sys.stderr)
+        write_corpus(corpus_path, size, args.seed)
+        print(f"⏱️  측정 중: {size}건", file=sys.stderr)
+        with ctx.Pool(1) as pool:
+            results.append(
+                pool.apply(bench_corpus, (corpus_path, size, args.queries, levels, args.latency_ms / 1000.0))
+            )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "queries": args.queries,
+            "latency_ms": args.latency_ms,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"✅ 결과 저장: {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.max_regression)
+        if regressions:
+            print(f"❌ 성능 저하 {len(regressions)}건", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
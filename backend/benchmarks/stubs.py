@@ -0,0 +1,189 @@
+"""
+오프라인 벤치마크/부하 테스트용 OpenAI, Qdrant, Elasticsearch 대체 클라이언트
+
+search_service가 사용하는 메서드/응답 형태만 흉내 낸다.
+- chat.completions.create: 키워드 추출 프롬프트면 "단어:가중치" 줄을, 그 외에는 짧은 답변을 반환
+- embeddings.create: 고정 차원의 결정적 벡터
+- query_points: 코퍼스 출원번호 중 질의 해시로 고른 결과
+- AsyncElasticsearch.search: 코퍼스에서 만든 문서 목록의 한 페이지 (+ took, 빈 집계)
+latency는 고정 값(초) 또는 인자 없는 함수(분포에서 샘플링)로 지정한다 (parse_latency 참고).
+"""
+import asyncio
+import hashlib
+import math
+import random
+import re
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Sequence, Union
+
+Latency = Union[float, Callable[[], float], None]
+
+_keyword_pattern = re.compile(r"[0-9A-Za-z가-힣]{2,}")
+
+
+def parse_latency(spec: Optional[str]) -> Latency:
+    """
+    지연 분포 문자열(ms 단위)을 샘플링 함수로 변환
+    - "20"                고정 20ms
+    - "uniform:10,50"     10~50ms 균등
+    - "normal:40,10"      평균 40ms, 표준편차 10ms (음수는 0)
+    - "lognormal:40,0.5"  중앙값 40ms, sigma 0.5 (긴 꼬리; 외부 API 지연에 가장 가깝다)
+    - "exp:30"            평균 30ms 지수 분포
+    """
+    if not spec:
+        return None
+    kind, _, params = spec.partition(":")
+    if not params:
+        return float(kind) / 1000.0
+    values: List[float] = [float(v) for v in params.split(",")]
+    rng = random.Random()
+    if kind == "uniform":
+        return lambda: rng.uniform(values[0], values[1]) / 1000.0
+    if kind == "normal":
+        return lambda: max(0.0, rng.gauss(values[0], values[1])) / 1000.0
+    if kind == "lognormal":
+        median_ms, sigma = values[0], values[1]
+        return lambda: median_ms * math.exp(rng.gauss(0.0, sigma)) / 1000.0
+    if kind == "exp":
+        return lambda: rng.expovariate(1.0 / values[0]) / 1000.0
+    raise ValueError(f"알 수 없는 지연 분포: {spec}")
+
+
+async def _sleep(latency: Latency) -> None:
+    seconds: float = latency() if callable(latency) else (latency or 0.0)
+    if seconds > 0:
+        await asyncio.sleep(seconds)
+
+
+def _usage(prompt: str, completion: str = "") -> SimpleNamespace:
+    # 한국어 기준 대략 글자 2개당 1토큰
+    prompt_tokens: int = max(1, len(prompt) // 2)
+    completion_tokens: int = len(completion) // 2
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+
+
+class _StubChatCompletions:
+    def __init__(self, owner: "StubAsyncOpenAI"):
+        self._owner = owner
+
+    async def create(self, model: str, messages: list, **kwargs):
+        self._owner.calls["chat"] += 1
+        prompt: str = messages[-1]["content"]
+        if "문장:" in prompt:
+            await _sleep(self._owner.keyword_latency)
+            sentence: str = prompt.rsplit("문장:", 1)[1]
+            words: List[str] = list(dict.fromkeys(_keyword_pattern.findall(sentence)))[:5]
+            content: str = "\n".join(f"{w}:{max(0.1, 1.0 - i * 0.2):.1f}" for i, w in enumerate(words))
+        else:
+            await _sleep(self._owner.generation_latency)
+            content = "제공된 특허 정보를 바탕으로 한 합성 답변입니다. " * 8
+        message = SimpleNamespace(content=content, role="assistant")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=_usage(prompt, content))
+
+
+class _StubEmbeddings:
+    def __init__(self, owner: "StubAsyncOpenAI"):
+        self._owner = owner
+
+    async def create(self, model: str, input: str, **kwargs):
+        self._owner.calls["embeddings"] += 1
+        await _sleep(self._owner.embedding_latency)
+        seed: int = int.from_bytes(hashlib.sha256(input.encode("utf-8")).digest()[:8], "big")
+        rng = random.Random(seed)
+        vector: List[float] = [rng.uniform(-1.0, 1.0) for _ in range(self._owner.embedding_dim)]
+        return SimpleNamespace(data=[SimpleNamespace(embedding=vector)], usage=_usage(input))
+
+
+class StubAsyncOpenAI:
+    def __init__(
+        self,
+        keyword_latency: Latency = 0.0,
+        embedding_latency: Latency = 0.0,
+        generation_latency: Latency = 0.0,
+        embedding_dim: int = 256,
+    ):
+        self.keyword_latency: Latency = keyword_latency
+        self.embedding_latency: Latency = embedding_latency
+        self.generation_latency: Latency = generation_latency
+        self.embedding_dim: int = embedding_dim
+        self.calls: dict = {"chat": 0, "embeddings": 0}
+        self.chat = SimpleNamespace(completions=_StubChatCompletions(self))
+        self.embeddings = _StubEmbeddings(self)
+
+    async def close(self) -> None:
+        return None
+
+
+class StubAsyncQdrantClient:
+    def __init__(self, app_numbers: Optional[Sequence[str]] = None, latency: Latency = 0.0):
+        self.app_numbers: List[str] = list(app_numbers or [])
+        self.latency: Latency = latency
+        self.calls: int = 0
+
+    async def query_points(self, collection_name: str, query: list, limit: int = 10, with_payload: bool = True, **kwargs):
+        self.calls += 1
+        await _sleep(self.latency)
+        points: list = []
+        if self.app_numbers:
+            rng = random.Random(hash(tuple(query[:4])))
+            for app_no in rng.sample(self.app_numbers, min(limit, len(self.app_numbers))):
+                points.append(SimpleNamespace(score=rng.random(), payload={"applicationNumber": app_no}))
+        return SimpleNamespace(points=points)
+
+    async def close(self) -> None:
+        return None
+
+
+class StubAsyncElasticsearch:
+    """
+    routes/patents.py와 /readyz가 쓰는 search/ping/close만 제공.
+    출원번호 term 질의(상세 조회)는 해당 문서를, 그 외 질의는 해석하지 않고 질의 해시로 고른 위치의 페이지를 돌려준다.
+    """
+
+    def __init__(self, documents: Optional[Sequence[dict]] = None, latency: Latency = 0.0):
+        self.documents: List[dict] = list(documents or [])
+        self._by_app_number: dict = {d.get("applicationNumber"): d for d in self.documents}
+        self.latency: Latency = latency
+        self.calls: int = 0
+
+    def _select(self, query: Optional[dict], from_: int, size: int) -> List[dict]:
+        term: dict = (query or {}).get("term") or {}
+        if "applicationNumber.keyword" in term:
+            doc = self._by_app_number.get(term["applicationNumber.keyword"])
+            return [doc] if doc else []
+        total: int = len(self.documents)
+        offset: int = (abs(hash(repr(query))) + from_) % total if total else 0
+        return self.documents[offset: offset + size]
+
+    async def search(self, index: str, query: Optional[dict] = None, from_: int = 0, size: int = 10, **kwargs):
+        self.calls += 1
+        start = asyncio.get_running_loop().time()
+        await _sleep(self.latency)
+        hits: list = []
+        for doc in self._select(query, from_, size):
+            hits.append({
+                "_index": index,
+                "_id": doc["applicationNumber"],
+                "_seq_no": 1,
+                "_primary_term": 1,
+                "_score": 1.0,
+                "_source": dict(doc),
+            })
+        response: dict = {
+            "took": int((asyncio.get_running_loop().time() - start) * 1000),
+            "hits": {"total": {"value": len(self.documents)}, "hits": hits},
+        }
+        if kwargs.get("aggregations"):
+            response["aggregations"] = {name: {"buckets": []} for name in kwargs["aggregations"]}
+        return response
+
+    async def ping(self) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
@@ -0,0 +1,137 @@
+"""
+KIPRIS Detail.json 구조를 흉내 낸 합성 특허 데이터 생성기
+
+- 같은 seed/size면 항상 같은 코퍼스를 만든다 (벤치마크 결과 비교용)
+- 한국어 제목/요약/청구항, 발명자/출원인 이름, IPC/CPC 코드 포함
+- 청구항 수와 길이는 실제 공보와 비슷하게 분포 (청구항 3~20개, 항당 120~700자)
+- 1M건처럼 큰 코퍼스도 메모리에 올리지 않고 파일로 바로 스트리밍해서 쓴다
+
+사용법:
+    python -m backend.benchmarks.synthetic_corpus --size 100000 --out /tmp/patents_100k.json
+"""
+import argparse
+import json
+import os
+import random
+from typing import Dict, Iterator, List
+
+TECH_TERMS: List[str] = [
+    "이차전지", "양극활물질", "음극재", "전해질", "고체전해질", "수소연료전지", "태양전지", "페로브스카이트",
+    "반도체", "트랜지스터", "메모리소자", "박막", "나노입자", "그래핀", "탄소나노튜브", "촉매",
+    "딥러닝", "신경망", "자연어처리", "영상인식", "자율주행", "라이다", "센서", "무선통신",
+    "블록체인", "암호화", "디스플레이", "유기발광", "바이오센서", "항체", "유전자가위", "약물전달",
+    "로봇", "액추에이터", "모터제어", "배터리관리시스템", "열교환기", "복합소재", "고분자", "코팅",
+]
+CLAIM_PHRASES: List[str] = [
+    "상기 {a}는 {b}를 포함하는 것을 특징으로 하는",
+    "{a}를 형성하는 단계; 및 상기 {a} 상에 {b}를 적층하는 단계를 포함하는",
+    "제1항에 있어서, 상기 {a}의 두께는 10 nm 내지 500 nm인",
+    "상기 {b}는 {a}와 전기적으로 연결되며, 제어부의 신호에 따라 동작하는",
+    "{a}로부터 획득한 데이터를 {b} 모델에 입력하여 결과값을 산출하는",
+    "상기 {a} 및 {b}의 중량비는 1:0.5 내지 1:3인",
+]
+ABSTRACT_TEMPLATES: List[str] = [
+    "본 발명은 {a} 및 {b}에 관한 것으로, 보다 상세하게는 {a}의 성능을 향상시키기 위한 {c} 기술에 관한 것이다.",
+    "본 발명에 따르면 {b}를 이용하여 {a}의 안정성과 효율을 동시에 개선할 수 있다.",
+    "{c} 공정을 적용하여 제조 비용을 절감하고 {a}의 수명을 연장하는 효과가 있다.",
+]
+FAMILY_NAMES: List[str] = ["김", "이", "박", "최", "정", "강", "조", "윤", "장", "임", "한", "오", "서", "신", "권"]
+GIVEN_NAMES: List[str] = ["민수", "서연", "지훈", "하은", "도윤", "수빈", "현우", "지민", "준호", "예린", "태현", "유진"]
+APPLICANTS: List[tuple] = [
+    ("한양대학교 산학협력단", "IUCF-HYU (Industry-University Cooperation Foundation Hanyang University)"),
+    ("한양대학교 에리카산학협력단", "INDUSTRY-UNIVERSITY COOPERATION FOUNDATION HANYANG UNIVERSITY ERICA CAMPUS"),
+    ("삼성전자주식회사", "SAMSUNG ELECTRONICS CO., LTD."),
+    ("엘지전자 주식회사", "LG ELECTRONICS INC."),
+    ("한국전자통신연구원", "ELECTRONICS AND TELECOMMUNICATIONS RESEARCH INSTITUTE"),
+]
+IPC_PREFIXES: List[str] = ["H01M", "H01L", "G06N", "G06F", "C01B", "A61K", "B25J", "H04W", "G01N", "C08L"]
+STATUSES: List[str] = ["등록", "공개", "거절", "소멸", "취하"]
+
+
+def _person(rng: random.Random) -> str:
+    return rng.choice(FAMILY_NAMES) + rng.choice(GIVEN_NAMES)
+
+
+def _sentence(rng: random.Random, templates: List[str]) -> str:
+    a, b, c = rng.sample(TECH_TERMS, 3)
+    return rng.choice(templates).format(a=a, b=b, c=c)
+
+
+def _claim(rng: random.Random, index: int) -> str:
+    target_len: int = rng.randint(120, 700)
+    parts: List[str] = []
+    if index > 0:
+        parts.append(f"제{rng.randint(1, index)}항에 있어서,")
+    while sum(len(p) for p in parts) < target_len:
+        parts.append(_sentence(rng, CLAIM_PHRASES))
+    return " ".join(parts) + " 장치."
+
+
+def make_patent(rng: random.Random, serial: int) -> Dict:
+    year: int = rng.randint(2000, 2024)
+    app_no: str = f"10{year}{serial:07d}"
+    title_terms = rng.sample(TECH_TERMS, 2)
+    applicant_ko, applicant_en = rng.choice(APPLICANTS)
+    inventors = [{"name": _person(rng), "country": "KR"} for _ in range(rng.randint(1, 6))]
+    claims = [{"claim": _claim(rng, i)} for i in range(rng.randint(3, 20))]
+    ipc = [{"ipcNumber": f"{rng.choice(IPC_PREFIXES)} {rng.randint(1, 99)}/{rng.randint(1, 999):02d}"} for _ in range(rng.randint(1, 4))]
+    return {
+        "applicationNumber": app_no,
+        "biblioSummaryInfoArray": {
+            "biblioSummaryInfo": {
+                "applicationNumber": app_no,
+                "applicationDate": f"{year}.{rng.randint(1, 12):02d}.{rng.randint(1, 28):02d}",
+                "inventionTitle": f"{title_terms[0]}를 이용한 {title_terms[1]} 및 그 제조방법",
+                "inventionTitleEng": "Synthetic patent title",
+                "registerStatus": rng.choice(STATUSES),
+                "openNumber": f"10-{year}-{rng.randint(1, 999999):07d}",
+            }
+        },
+        "abstractInfoArray": {
+            "abstractInfo": {"astrtCont": " ".join(_sentence(rng, ABSTRACT_TEMPLATES) for _ in range(rng.randint(2, 5)))}
+        },
+        "claimInfoArray": {"claimInfo": claims},
+        "applicantInfoArray": {"applicantInfo": [{"name": applicant_ko, "engName": applicant_en, "country": "KR"}]},
+        "inventorInfoArray": {"inventorInfo": inventors},
+        "ipcInfoArray": {"ipcInfo": ipc},
+    }
+
+
+def iter_patents(size: int, seed: int = 42) -> Iterator[Dict]:
+    rng = random.Random(seed)
+    for serial in range(size):
+        yield make_patent(rng, serial)
+
+
+def write_corpus(path: str, size: int, seed: int = 42) -> str:
+    """JSON 배열 파일로 스트리밍 저장 (이미 같은 크기/seed 파일이 있으면 재사용)"""
+    marker: str = f"{path}.meta"
+    expected: str = json.dumps({"size": size, "seed": seed})
+    if os.path.exists(path) and os.path.exists(marker):
+        with open(marker, "r", encoding="utf-8") as f:
+            if f.read() == expected:
+                return path
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    # 임시 파일에 쓴 뒤 교체 (여러 uvicorn 워커가 동시에 읽어도 반쯤 쓰인 파일을 보지 않도록)
+    tmp_path: str = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, patent in enumerate(iter_patents(size, seed)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(patent, ensure_ascii=False))
+        f.write("]")
+    os.replace(tmp_path, path)
+    with open(marker, "w", encoding="utf-8") as f:
+        f.write(expected)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KIPRIS 형태의 합성 특허 JSON 생성")
+    parser.add_argument("--size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+    print(f"📝 {write_corpus(args.out, args.size, args.seed)} ({args.size}건)")
@@ -0,0 +1,130 @@
+"""
+보호가 필요한 엔드포인트용 JWT 인증 의존성
+
+- HS256 서명/만료(exp) 검증 후 디코딩된 claims를 토큰별로 LRU 캐시 (만료 시각까지만 보관)
+- 역할(role)은 users 컬렉션에서 짧은 TTL로 캐시해 조회 (AUTH_ROLE_CACHE_TTL_S=0이면 토큰의 role claim 사용)
+- 캐시가 따뜻한 상태에서는 요청마다 JWT 디코딩이나 MongoDB 왕복이 없다
+
+사용 예:
+    @router.get("/...")
+    async def handler(user: dict = Depends(get_current_user)): ...
+
+    @router.post("/admin/...", dependencies=[Depends(require_role("admin"))])
+"""
+import logging
+import os
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from backend.core import metrics
+from backend.core.cache import TTLCache
+from backend.core.security import ACCESS_TOKEN_EXPIRE_MINUTES, ALGORITHM, SECRET_KEY
+from backend.database import db_manager
+
+logger = logging.getLogger(__name__)
+
+AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_ROLE_CACHE_SIZE: int = int(os.getenv("AUTH_ROLE_CACHE_SIZE", "10000"))
+# 역할/상태 변경이 반영되기까지의 최대 지연 (0이면 users 조회 없이 토큰 claim만 사용)
+AUTH_ROLE_CACHE_TTL_S: float = float(os.getenv("AUTH_ROLE_CACHE_TTL_S", "60"))
+
+# 토큰 문자열 → 디코딩된 claims (항목별 TTL = exp까지 남은 시간)
+token_cache: TTLCache = TTLCache(maxsize=AUTH_TOKEN_CACHE_SIZE, ttl_s=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+# 이메일 → {"role", "status"} (계정이 없으면 빈 dict)
+role_cache: TTLCache = TTLCache(maxsize=AUTH_ROLE_CACHE_SIZE, ttl_s=AUTH_ROLE_CACHE_TTL_S)
+
+metrics.register_cache("auth_tokens", token_cache)
+metrics.register_cache("auth_roles", role_cache)
+
+bearer_scheme = HTTPBearer(auto_error=False)
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def decode_access_token(token: str) -> dict:
+    """서명/만료를 검증한 claims 반환 (캐시 적중 시 디코딩 생략)"""
+    claims: Optional[dict] = token_cache.get(token)
+    if claims is not None:
+        return claims
+    # python-jose(cryptography)는 첫 토큰 검증 시 로드
+    from jose import ExpiredSignatureError, JWTError, jwt
+
+    try:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except ExpiredSignatureError:
+        raise _unauthorized("토큰이 만료되었습니다.")
+    except JWTError:
+        raise _unauthorized("유효하지 않은 토큰입니다.")
+    if not claims.get("sub"):
+        raise _unauthorized("유효하지 않은 토큰입니다.")
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(token, claims, ttl_s=exp - time.time())
+    return claims
+
+
+async def _load_user_auth_info(email: str) -> dict:
+    info: Optional[dict] = role_cache.get(email)
+    if info is not None:
+        return info
+    user = await db_manager.db["users"].find_one({"email": email}, {"_id": 0, "role": 1, "status": 1})
+    info = {"role": user.get("role", "user"), "status": user.get("status", "active")} if user else {}
+    role_cache.set(email, info)
+    return info
+
+
+def invalidate_user_cache(email: str) -> None:
+    """역할 변경/계정 비활성화 직후 즉시 반영하고 싶을 때 호출"""
+    role_cache.pop(email)
+
+
+async def _authenticate(credentials: Optional[HTTPAuthorizationCredentials]) -> Optional[dict]:
+    if credentials is None or credentials.scheme.lower() != "bearer":
+        return None
+    claims: dict = decode_access_token(credentials.credentials)
+    email: str = claims["sub"]
+    if AUTH_ROLE_CACHE_TTL_S <= 0:
+        return {"email": email, "role": claims.get("role", "user"), "claims": claims}
+
+    info: dict = await _load_user_auth_info(email)
+    if not info or info.get("status", "active") != "active":
+        raise _unauthorized("사용할 수 없는 계정입니다.")
+    return {"email": email, "role": info["role"], "claims": claims}
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> dict:
+    """Authorization: Bearer <token> 필수. {"email", "role", "claims"} 반환"""
+    user: Optional[dict] = await _authenticate(credentials)
+    if user is None:
+        raise _unauthorized("로그인이 필요합니다.")
+    return user
+
+
+async def get_optional_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(bearer_scheme),
+) -> Optional[dict]:
+    """토큰이 없으면 None (있는데 잘못된 토큰이면 401)"""
+    return await _authenticate(credentials)
+
+
+def require_role(*roles: str):
+    """지정한 역할 중 하나를 가진 사용자만 허용하는 의존성"""
+
+    async def dependency(user: dict = Depends(get_current_user)) -> dict:
+        if user["role"] not in roles:
+            logger.warning("auth_forbidden email=%s role=%s required=%s", user["email"], user["role"], roles)
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="권한이 없습니다.")
+        return user
+
+    return dependency
@@ -0,0 +1,222 @@
+"""
+외부 서비스 클라이언트 (MongoDB, Elasticsearch, OpenAI, Qdrant) 생성/종료를 한 곳에서 관리
+
+- 프로세스(워커)당 서비스별 클라이언트 하나 → 연결 풀 하나 (Motor 클라이언트는 db_manager와 ChatbotEngine이 공유)
+- 풀 크기, keep-alive, 타임아웃은 환경 변수로 조정
+- HTTP/2는 httpx 기반 클라이언트(OpenAI, Qdrant)에만 적용 (h2 패키지가 있을 때)
+  Elasticsearch(aiohttp)는 HTTP/1.1 keep-alive 풀을 사용한다
+- 처음 요청할 때 생성하고, warm_up()으로 시작 직후 연결을 미리 맺어 첫 요청의 TCP/TLS 핸드셰이크 비용을 없앤다
+- close_all()은 종료 시 한 번 호출 (main.shutdown)
+- SDK(motor/elasticsearch/openai/qdrant_client/httpx)는 해당 클라이언트를 처음 만들 때 import한다
+  (backend.main import와 워커 재시작, CLI/벤치마크 시작이 SDK 로딩 비용을 치르지 않도록)
+"""
+import asyncio
+import importlib.util
+import logging
+import os
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlsplit
+
+from backend.database import _is_running_in_docker, _resolve_local_mongo_uri
+
+if TYPE_CHECKING:
+    import httpx
+    from elasticsearch import AsyncElasticsearch
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from openai import AsyncOpenAI
+    from qdrant_client import AsyncQdrantClient
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return (os.getenv(name) or default).strip().lower() in ["1", "true", "yes", "y", "on"]
+
+
+# 공통 (httpx 기반 클라이언트)
+CLIENT_HTTP2: bool = _env_flag("CLIENT_HTTP2", "true") and importlib.util.find_spec("h2") is not None
+# 유휴 연결 유지 시간. httpx 기본값(5초)은 요청 간격이 조금만 벌어져도 연결을 닫아 다시 핸드셰이크하게 만든다
+CLIENT_KEEPALIVE_EXPIRY_S: float = float(os.getenv("CLIENT_KEEPALIVE_EXPIRY_S", "60"))
+CLIENT_CONNECT_TIMEOUT_S: float = float(os.getenv("CLIENT_CONNECT_TIMEOUT_S", "5"))
+# warm_up 단계별 제한 시간
+CLIENT_WARMUP_TIMEOUT_S: float = float(os.getenv("CLIENT_WARMUP_TIMEOUT_S", "5"))
+
+# MongoDB (워커당 풀; Atlas 연결 수 한도 = 워커 수 × MONGO_MAX_POOL_SIZE 이내로)
+MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+
+# Elasticsearch
+ES_CONNECTIONS_PER_NODE: int = int(os.getenv("ES_CONNECTIONS_PER_NODE", "20"))
+ES_REQUEST_TIMEOUT_S: float = float(os.getenv("ES_REQUEST_TIMEOUT_S", "30"))
+ES_MAX_RETRIES: int = int(os.getenv("ES_MAX_RETRIES", "2"))
+ES_HTTP_COMPRESS: bool = _env_flag("ES_HTTP_COMPRESS", "false")
+
+# OpenAI
+OPENAI_API_KEY: Optional[str] = os.getenv("OPENAI_API_KEY")
+OPENAI_MAX_CONNECTIONS: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", "50"))
+OPENAI_MAX_KEEPALIVE: int = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+# LLM 생성은 수십 초 걸릴 수 있으므로 읽기 타임아웃은 길게, 연결 타임아웃은 짧게
+OPENAI_TIMEOUT_S: float = float(os.getenv("OPENAI_TIMEOUT_S", "120"))
+OPENAI_MAX_RETRIES: int = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# Qdrant
+QDRANT_URL: Optional[str] = os.getenv("QDRANT_URL")
+QDRANT_API_KEY: Optional[str] = os.getenv("QDRANT_API_KEY")
+QDRANT_MAX_CONNECTIONS: int = int(os.getenv("QDRANT_MAX_CONNECTIONS", "20"))
+QDRANT_TIMEOUT_S: int = int(os.getenv("QDRANT_TIMEOUT_S", "10"))
+
+# 생성된 클라이언트 (get_*로 접근; 테스트/벤치마크에서는 직접 대입해 대체 가능)
+mongo_client: Optional["AsyncIOMotorClient"] = None
+elasticsearch_client: Optional["AsyncElasticsearch"] = None
+openai_client: Optional["AsyncOpenAI"] = None
+qdrant_client: Optional["AsyncQdrantClient"] = None
+
+
+def resolve_mongo_uri() -> str:
+    mongo_uri: Optional[str] = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
+    if not mongo_uri:
+        print("⚠️  MONGODB_URI/MONGO_URI 환경 변수가 설정되지 않았습니다. 기본값을 사용합니다.")
+        return "mongodb://localhost:27017"
+    return _resolve_local_mongo_uri(mongo_uri)
+
+
+def resolve_elasticsearch_url(raw_url: Optional[str] = None) -> str:
+    default_url: str = "http://127.0.0.1:9200"
+    raw_url = raw_url if raw_url is not None else os.getenv("ELASTICSEARCH_URL")
+    if not raw_url:
+        return default_url
+    normalized_url: str = raw_url.strip()
+    if not normalized_url:
+        return default_url
+    if "://" not in normalized_url:
+        normalized_url = "http://" + normalized_url
+    try:
+        host: str = urlsplit(normalized_url).hostname or ""
+        if host == "elasticsearch" and not _is_running_in_docker():
+            return default_url
+        return normalized_url
+    except Exception:
+        return default_url
+
+
+def _httpx_limits(max_connections: int, max_keepalive: int) -> "httpx.Limits":
+    import httpx
+
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=CLIENT_KEEPALIVE_EXPIRY_S,
+    )
+
+
+def get_mongo_client() -> "AsyncIOMotorClient":
+    global mongo_client
+    if mongo_client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        mongo_client = AsyncIOMotorClient(
+            resolve_mongo_uri(),
+            maxPoolSize=MONGO_MAX_POOL_SIZE,
+            minPoolSize=MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=int(CLIENT_CONNECT_TIMEOUT_S * 1000),
+            serverSelectionTimeoutMS=MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=MONGO_SOCKET_TIMEOUT_MS,
+        )
+        logger.info("client_created kind=mongo max_pool=%s min_pool=%s", MONGO_MAX_POOL_SIZE, MONGO_MIN_POOL_SIZE)
+    return mongo_client
+
+
+def get_elasticsearch() -> "AsyncElasticsearch":
+    global elasticsearch_client
+    if elasticsearch_client is None:
+        from elasticsearch import AsyncElasticsearch
+
+        elasticsearch_client = AsyncElasticsearch(
+            resolve_elasticsearch_url(),
+            verify_certs=False,
+            ssl_show_warn=False,
+            request_timeout=ES_REQUEST_TIMEOUT_S,
+            connections_per_node=ES_CONNECTIONS_PER_NODE,
+            max_retries=ES_MAX_RETRIES,
+            retry_on_timeout=True,
+            http_compress=ES_HTTP_COMPRESS,
+        )
+        logger.info("client_created kind=elasticsearch connections_per_node=%s", ES_CONNECTIONS_PER_NODE)
+    return elasticsearch_client
+
+
+def get_openai() -> "AsyncOpenAI":
+    global openai_client
+    if openai_client is None:
+        import httpx
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        openai_client = AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            timeout=httpx.Timeout(OPENAI_TIMEOUT_S, connect=CLIENT_CONNECT_TIMEOUT_S),
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=DefaultAsyncHttpxClient(
+                http2=CLIENT_HTTP2,
+                limits=_httpx_limits(OPENAI_MAX_CONNECTIONS, OPENAI_MAX_KEEPALIVE),
+            ),
+        )
+        logger.info("client_created kind=openai http2=%s max_connections=%s", CLIENT_HTTP2, OPENAI_MAX_CONNECTIONS)
+    return openai_client
+
+
+def get_qdrant() -> "AsyncQdrantClient":
+    global qdrant_client
+    if qdrant_client is None:
+        from qdrant_client import AsyncQdrantClient
+
+        # 추가 인자는 내부 httpx.AsyncClient로 전달된다 (limits를 주지 않으면 keep-alive 연결을 재사용하지 않음)
+        qdrant_client = AsyncQdrantClient(
+            url=QDRANT_URL,
+            api_key=QDRANT_API_KEY,
+            timeout=QDRANT_TIMEOUT_S,
+            http2=CLIENT_HTTP2,
+            limits=_httpx_limits(QDRANT_MAX_CONNECTIONS, QDRANT_MAX_CONNECTIONS),
+        )
+        logger.info("client_created kind=qdrant http2=%s max_connections=%s", CLIENT_HTTP2, QDRANT_MAX_CONNECTIONS)
+    return qdrant_client
+
+
+async def _warm(name: str, probe) -> None:
+    try:
+        await asyncio.wait_for(probe(), timeout=CLIENT_WARMUP_TIMEOUT_S)
+        logger.info("client_warmup_ok kind=%s", name)
+    except Exception as e:
+        logger.warning("client_warmup_failed kind=%s err=%r", name, e)
+
+
+async def warm_up() -> None:
+    """이미 만들어진 클라이언트마다 가벼운 요청 한 번으로 풀에 연결을 맺어 둔다 (실패해도 무시)"""
+    probes: list = []
+    if mongo_client is not None:
+        probes.append(_warm("mongo", lambda: mongo_client.admin.command("ping")))
+    if elasticsearch_client is not None:
+        probes.append(_warm("elasticsearch", elasticsearch_client.ping))
+    if qdrant_client is not None:
+        probes.append(_warm("qdrant", qdrant_client.get_collections))
+    if openai_client is not None:
+        probes.append(_warm("openai", openai_client.models.list))
+    await asyncio.gather(*probes)
+
+
+async def close_all() -> None:
+    """생성된 클라이언트를 모두 닫고 초기화 (각각 실패해도 나머지는 계속 닫는다)"""
+    global mongo_client, elasticsearch_client, openai_client, qdrant_client
+    for name, client in (("elasticsearch", elasticsearch_client), ("openai", openai_client), ("qdrant", qdrant_client)):
+        if client is None:
+            continue
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning("client_close_failed kind=%s err=%r", name, e)
+    if mongo_client is not None:
+        mongo_client.close()
+    mongo_client = elasticsearch_client = openai_client = qdrant_client = None
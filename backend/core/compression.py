@@ -0,0 +1,208 @@
+"""
+HTTP 응답 압축 (brotli/gzip) ASGI 미들웨어
+
+- Accept-Encoding 협상: br(brotli 패키지가 있을 때) > gzip, q=0으로 거부한 인코딩은 사용하지 않음
+- 한 번에 끝나는 응답은 COMPRESSION_MIN_SIZE 미만이면 그대로 보낸다 (작은 응답은 압축 이득보다 CPU 비용이 큼)
+- 스트리밍 응답(more_body)은 청크마다 flush하며 압축 → 청크가 버퍼에 묶이지 않고 바로 전달된다
+- 압축하지 않는 응답: text/event-stream(SSE), 이미 Content-Encoding이 있는 응답, PDF/이미지 등 이미 압축된 형식,
+  Range 응답(206), Cache-Control: no-transform
+- 압축하면 strong ETag를 weak ETag로 바꾼다 (표현이 달라지므로; etag_matches는 W/ 비교를 지원)
+"""
+import importlib.util
+import os
+import zlib
+from typing import List, Optional, Tuple
+
+
+def _env_flag(name: str, default: str) -> bool:
+    return (os.getenv(name) or default).strip().lower() in ["1", "true", "yes", "y", "on"]
+
+
+COMPRESSION_ENABLED: bool = _env_flag("COMPRESSION_ENABLED", "true")
+COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# 동적 응답용 brotli 품질 (11은 정적 파일 사전 압축용; 요청마다 쓰기엔 너무 느림)
+COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_BROTLI: bool = _env_flag("COMPRESSION_BROTLI", "true") and importlib.util.find_spec("brotli") is not None
+
+_COMPRESSIBLE_TYPES: tuple = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type: str = content_type.split(";", 1)[0].strip().lower()
+    if not media_type or media_type == "text/event-stream":
+        return False
+    return media_type.startswith(_COMPRESSIBLE_TYPES) or media_type.endswith(("+json", "+xml"))
+
+
+def negotiate_encoding(accept_encoding: str, brotli_enabled: bool = COMPRESSION_BROTLI) -> Optional[str]:
+    """Accept-Encoding 헤더에서 사용할 인코딩 선택 (br > gzip, 없으면 None)"""
+    weights: dict = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q: float = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+    candidates: Tuple[str, ...] = ("br", "gzip") if brotli_enabled else ("gzip",)
+    for encoding in candidates:
+        if weights.get(encoding, weights.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class _Encoder:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            import brotli
+
+            self._brotli = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+            self._zlib = None
+        else:
+            self._brotli = None
+            # wbits=31 → gzip 헤더/트레일러
+            self._zlib = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool = False) -> bytes:
+        if self._brotli is not None:
+            out: bytes = self._brotli.process(data)
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data)
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Accept-Encoding에 따라 응답 본문을 brotli/gzip으로 압축"""
+
+    def __init__(self, app, min_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.min_size: int = min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding: str = ""
+        for name, value in scope.get("headers", []):
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+        encoding: Optional[str] = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressionResponder(self.app, encoding, self.min_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: str, min_size: int):
+        self.app = app
+        self.encoding: str = encoding
+        self.min_size: int = min_size
+        self.send = None
+        self.start_message: Optional[dict] = None
+        # None: 아직 결정 전, False: 그대로 전달, True: 압축 중(스트리밍)
+        self.compressing: Optional[bool] = None
+        self.encoder: Optional[_Encoder] = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    def _should_compress(self, message: dict) -> bool:
+        if message["status"] < 200 or message["status"] in (204, 206, 304):
+            return False
+        headers: dict = {}
+        for name, value in message.get("headers", []):
+            headers[name.lower()] = value
+        if b"content-encoding" in headers or b"content-range" in headers:
+            return False
+        if b"no-transform" in headers.get(b"cache-control", b"").lower():
+            return False
+        return _is_compressible(headers.get(b"content-type", b"").decode("latin-1"))
+
+    def _compressed_headers(self, content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+        headers: List[Tuple[bytes, bytes]] = []
+        vary: Optional[bytes] = None
+        for name, value in self.start_message.get("headers", []):
+            lowered: bytes = name.lower()
+            if lowered == b"content-length":
+                continue
+            if lowered == b"vary":
+                vary = value
+                continue
+            if lowered == b"etag" and not value.startswith(b"W/"):
+                value = b"W/" + value
+            headers.append((name, value))
+        if vary is None:
+            vary = b"Accept-Encoding"
+        elif b"accept-encoding" not in vary.lower() and vary.strip() != b"*":
+            vary = vary + b", Accept-Encoding"
+        headers.append((b"vary", vary))
+        headers.append((b"content-encoding", self.encoding.encode("latin-1")))
+        if content_length is not None:
+            headers.append((b"content-length", str(content_length).encode("latin-1")))
+        return headers
+
+    async def send_wrapper(self, message: dict) -> None:
+        message_type: str = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            if not self._should_compress(message):
+                self.compressing = False
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.compressing is False:
+            await self.send(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.compressing is None:
+            if not more_body:
+                # 한 번에 끝나는 응답: 크기를 보고 결정
+                if len(body) < self.min_size:
+                    self.compressing = False
+                    await self.send(self.start_message)
+                    await self.send(message)
+                    return
+                encoder = _Encoder(self.encoding)
+                compressed: bytes = encoder.compress(body) + encoder.finish()
+                self.start_message["headers"] = self._compressed_headers(len(compressed))
+                self.compressing = False
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            # 스트리밍 응답: 전체 길이를 알 수 없으므로 Content-Length 없이 청크 단위로 압축
+            self.compressing = True
+            self.encoder = _Encoder(self.encoding)
+            self.start_message["headers"] = self._compressed_headers(None)
+            await self.send(self.start_message)
+
+        if more_body:
+            chunk: bytes = self.encoder.compress(body, flush=True)
+            if chunk:
+                await self.send({"type": "http.response.body", "body": chunk, "more_body": True})
+            return
+        await self.send({"type": "http.response.body", "body": self.encoder.compress(body) + self.encoder.finish()})
@@ -0,0 +1,6 @@
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 (weak 비교, `*` 지원)"""
+    if not if_none_match:
+        return False
+    candidates: list[str] = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
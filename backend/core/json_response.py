@@ -0,0 +1,40 @@
+"""
+orjson 기반 JSON 응답 (큰 검색 결과/대화 내역 직렬화용)
+
+- 라우트에서 dict/list 대신 ORJSONResponse(...)를 직접 반환하면 FastAPI의 jsonable_encoder 단계를 건너뛰고
+  orjson이 한 번에 bytes로 직렬화한다 (stdlib json + jsonable_encoder 이중 순회 제거)
+- MongoDB 값도 그대로 넣을 수 있다: ObjectId → 문자열, datetime → epoch milliseconds(int, naive는 UTC로 간주)
+"""
+from datetime import date, datetime, timezone
+from typing import Any
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+
+_OPTIONS: int = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, datetime):
+        if obj.tzinfo is None:
+            obj = obj.replace(tzinfo=timezone.utc)
+        return int(obj.timestamp() * 1000)
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
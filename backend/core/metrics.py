@@ -0,0 +1,284 @@
+"""
+Prometheus 텍스트 형식(/metrics) in-process 메트릭
+
+- Counter / Gauge / Histogram: label 값 튜플 → 숫자(또는 버킷 배열) dict 하나로 관리하는 저비용 구현
+  (이벤트 루프에서 갱신하는 것을 전제로 별도 lock을 두지 않는다)
+- MetricsMiddleware: 라우트별 요청 지연 히스토그램 + 처리 중 요청 gauge (순수 ASGI, 응답 본문을 감싸지 않음)
+- MetricsSpanExporter: tracing span을 받아 RAG 단계별 히스토그램, OpenAI/Qdrant 호출/오류 수, 토큰 수를 집계
+- register_collector: 캐시 적중률/코퍼스 크기처럼 조회 시점에 계산하는 값
+"""
+import bisect
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+CONTENT_TYPE_LATEST: str = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 기본 버킷 (ES/ API 지연은 수 ms ~ 수 초, LLM 생성은 수십 초까지)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts: List[str] = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name: str = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # label 키 → [버킷별 개수..., +Inf 개수], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key in sorted(self._counts):
+            counts = self._counts[key]
+            cumulative: int = 0
+            for upper, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(upper)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# ---------- registry ----------
+_metrics: List[_Metric] = []
+_collectors: List[Callable[[], None]] = []
+
+
+def _register(metric: _Metric) -> _Metric:
+    _metrics.append(metric)
+    return metric
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """/metrics 조회 직전에 호출되어 gauge 값을 채우는 함수 등록"""
+    _collectors.append(collector)
+
+
+def render_latest() -> str:
+    for collector in list(_collectors):
+        try:
+            collector()
+        except Exception:
+            # 수집 실패가 /metrics 전체를 깨뜨리지 않도록 무시
+            pass
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------- 공용 메트릭 ----------
+http_requests_total = _register(Counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")
+))
+http_request_duration_seconds = _register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route")
+))
+http_requests_in_flight = _register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being processed"
+))
+rag_stage_duration_seconds = _register(Histogram(
+    "rag_stage_duration_seconds", "Chatbot/RAG pipeline stage latency", ("stage",)
+))
+rag_stage_docs = _register(Histogram(
+    "rag_stage_docs", "Documents produced per RAG stage", ("stage",),
+    buckets=(0, 1, 5, 10, 20, 50, 100, 500, 1000, 5000),
+))
+openai_tokens_total = _register(Counter(
+    "openai_tokens_total", "OpenAI tokens used per stage", ("stage", "kind")
+))
+external_calls_total = _register(Counter(
+    "external_calls_total", "Outbound calls to external services", ("service", "operation")
+))
+external_call_errors_total = _register(Counter(
+    "external_call_errors_total", "Failed outbound calls to external services", ("service", "operation")
+))
+es_search_took_seconds = _register(Histogram(
+    "es_search_took_seconds", "Elasticsearch server-side search time (response took)", ("endpoint",)
+))
+es_search_client_seconds = _register(Histogram(
+    "es_search_client_seconds", "Elasticsearch search time observed by the client", ("endpoint",)
+))
+cache_hits_total = _register(Counter("cache_hits_total", "In-process cache hits", ("cache",)))
+cache_misses_total = _register(Counter("cache_misses_total", "In-process cache misses", ("cache",)))
+cache_hit_ratio = _register(Gauge("cache_hit_ratio", "In-process cache hit ratio", ("cache",)))
+cache_entries = _register(Gauge("cache_entries", "In-process cache entries", ("cache",)))
+corpus_documents = _register(Gauge("corpus_documents", "Documents loaded in the in-memory corpus", ("kind",)))
+
+
+def register_cache(name: str, cache) -> None:
+    """TTLCache처럼 hits/misses 카운터를 가진 캐시의 적중률을 /metrics에 노출"""
+
+    def collect() -> None:
+        hits, misses = cache.hits, cache.misses
+        cache_hits_total._values[(name,)] = float(hits)
+        cache_misses_total._values[(name,)] = float(misses)
+        cache_hit_ratio.set(hits / (hits + misses) if hits + misses else 0.0, cache=name)
+        cache_entries.set(len(cache), cache=name)
+
+    register_collector(collect)
+
+
+# ---------- tracing 연동 ----------
+# span 이름 → (외부 서비스, 작업)
+_EXTERNAL_STAGES: Dict[str, Tuple[str, str]] = {
+    "rag.keyword_llm": ("openai", "chat.completions"),
+    "rag.generation": ("openai", "chat.completions"),
+    "rag.embedding": ("openai", "embeddings"),
+    "rag.qdrant_query": ("qdrant", "query_points"),
+}
+
+
+class MetricsSpanExporter:
+    """끝난 tracing span을 단계별 히스토그램/외부 호출 카운터로 집계"""
+
+    def export(self, span) -> None:
+        rag_stage_duration_seconds.observe((span.duration_ms or 0.0) / 1000.0, stage=span.name)
+        docs = span.attributes.get("docs")
+        if isinstance(docs, int):
+            rag_stage_docs.observe(docs, stage=span.name)
+        for kind in ("prompt", "completion"):
+            tokens = span.attributes.get(f"tokens.{kind}")
+            if isinstance(tokens, int):
+                openai_tokens_total.inc(tokens, stage=span.name, kind=kind)
+        external: Optional[Tuple[str, str]] = _EXTERNAL_STAGES.get(span.name)
+        if external:
+            service, operation = external
+            external_calls_total.inc(service=service, operation=operation)
+            if span.error:
+                external_call_errors_total.inc(service=service, operation=operation)
+
+
+# ---------- ASGI middleware ----------
+class MetricsMiddleware:
+    """
+    라우트 템플릿(/api/patents/{application_number}) 단위로 지연/상태 코드를 집계.
+    매칭되는 라우트가 없으면 route="<unmatched>"로 묶어 label 수가 무한히 늘지 않게 한다.
+    """
+
+    def __init__(self, app, exclude_paths: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths: set = set(exclude_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+
+        status_code: List[int] = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start: float = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_s: float = time.perf_counter() - start
+            http_requests_in_flight.dec()
+            route = scope.get("route")
+            route_path: str = getattr(route, "path_format", None) or getattr(route, "path", None) or "<unmatched>"
+            method: str = scope.get("method", "")
+            http_request_duration_seconds.observe(elapsed_s, method=method, route=route_path)
+            http_requests_total.inc(method=method, route=route_path, status=str(status_code[0]))
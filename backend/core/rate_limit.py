@@ -0,0 +1,48 @@
+import time
+from collections import deque
+from typing import Deque, Dict, Hashable, Optional
+
+
+class SlidingWindowRateLimiter:
+    """
+    key별로 window_s 동안 max_events번까지만 허용하는 in-process 슬라이딩 윈도우 제한기.
+    - 이벤트 루프 안에서만 사용하는 것을 전제로 하므로 별도 lock은 두지 않는다 (TTLCache와 동일).
+    - 워커 프로세스마다 따로 카운트하므로 실제 허용량은 max_events * 워커 수까지 늘어날 수 있다.
+    """
+
+    def __init__(self, max_events: int, window_s: float, max_keys: int = 10000):
+        self.max_events: int = max(1, max_events)
+        self.window_s: float = window_s
+        self.max_keys: int = max(1, max_keys)
+        self._events: Dict[Hashable, Deque[float]] = {}
+
+    def _prune(self, key: Hashable, now: float) -> Deque[float]:
+        events = self._events.get(key)
+        if events is None:
+            return deque()
+        while events and events[0] <= now - self.window_s:
+            events.popleft()
+        if not events:
+            del self._events[key]
+        return events
+
+    def retry_after(self, key: Hashable) -> Optional[float]:
+        """제한에 걸려 있으면 다시 시도할 수 있을 때까지 남은 초, 아니면 None"""
+        now: float = time.monotonic()
+        events = self._prune(key, now)
+        if len(events) < self.max_events:
+            return None
+        return max(0.0, events[0] + self.window_s - now)
+
+    def hit(self, key: Hashable) -> None:
+        now: float = time.monotonic()
+        events = self._prune(key, now)
+        if not events:
+            if len(self._events) >= self.max_keys:
+                # 오래된 key부터 정리 (dict는 삽입 순서를 유지)
+                self._events.pop(next(iter(self._events)))
+            self._events[key] = events
+        events.append(now)
+
+    def reset(self, key: Hashable) -> None:
+        self._events.pop(key, None)
@@ -1,10 +1,13 @@
+import asyncio
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta 
-from typing import Optional
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from typing import TYPE_CHECKING, Optional, Tuple
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 load_dotenv()
 
 # 1. 보안 설정 (T를 추가하여 SECRET_KEY로 통일)
@@ -12,14 +15,65 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-super-secret-key-12345")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib(+bcrypt)은 처음 비밀번호를 다룰 때 로드 (import만 하는 CLI/워커 시작을 가볍게)
+_pwd_context: Optional["CryptContext"] = None
+
+
+def get_pwd_context() -> "CryptContext":
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 # 2. 비밀번호 관련 유틸리티
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+# 비동기 라우트용: bcrypt는 일부러 느린(~100-300ms) CPU 작업이므로 이벤트 루프 밖의 전용 스레드 풀에서 실행
+# (bcrypt 해싱은 GIL을 놓기 때문에 스레드로도 병렬 처리된다)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 풀에 대기 중인 작업 수 상한. 넘으면 PasswordHashBusyError (로그인 폭주 시 대기열이 무한히 쌓이지 않도록)
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+_password_executor = ThreadPoolExecutor(max_workers=max(1, PASSWORD_HASH_WORKERS), thread_name_prefix="password-hash")
+_password_pending = 0
+
+
+class PasswordHashBusyError(Exception):
+    """비밀번호 해시 대기열이 가득 찬 경우"""
+
+
+async def _run_password_task(func, *args):
+    global _password_pending
+    if _password_pending >= PASSWORD_HASH_MAX_PENDING:
+        raise PasswordHashBusyError()
+    _password_pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_pending -= 1
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_password_task(get_pwd_context().hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: Optional[str]) -> Tuple[bool, Optional[str]]:
+    """
+    (검증 결과, 새 해시)를 반환.
+    pwd_context 설정(스킴/rounds)이 바뀌어 기존 해시가 deprecated이면 새 해시를 함께 돌려주므로
+    호출 측에서 저장하면 로그인 시점에 자연스럽게 재해싱된다.
+    hashed_password가 없으면(존재하지 않는 계정) 같은 비용의 더미 검증을 수행해 응답 시간으로 계정 존재 여부가 드러나지 않게 한다.
+    """
+    if not hashed_password:
+        await _run_password_task(get_pwd_context().dummy_verify)
+        return False, None
+    return await _run_password_task(get_pwd_context().verify_and_update, plain_password, hashed_password)
 
 # 3. JWT 토큰 생성 유틸리티
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
@@ -32,5 +86,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode.update({"exp": expire})
     
     # 이 부분의 SECRE_KEY를 SECRET_KEY로 수정했습니다.
+    from jose import jwt
+
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
\ No newline at end of file
@@ -0,0 +1,212 @@
+"""
+RAG 파이프라인 단계별 span 추적
+
+- 단계(span)마다 time.perf_counter 기반 소요 시간과 속성(토큰 수, 문서 수 등)을 기록
+- request_id는 contextvars로 전파되므로 asyncio.gather로 병렬 실행되는 하위 단계에도 자동으로 붙는다
+- 끝난 span은 등록된 exporter로 전달
+    - memory: 최근 span을 메모리에 보관 (테스트/단계별 p95 확인용)
+    - otel:   opentelemetry-api가 설치되어 있으면 OpenTelemetry span으로 내보냄
+    - print:  DEBUG_PERF=true일 때 기존 perf_log처럼 소요 시간을 출력
+  TRACING_EXPORTERS="memory,otel" 처럼 지정 (기본: memory + otel(설치된 경우) + print(DEBUG_PERF))
+
+사용 예:
+    with tracing.span("rag.embedding", model="text-embedding-3-large") as s:
+        emb = await client.embeddings.create(...)
+        s.set_attribute("tokens.prompt", emb.usage.prompt_tokens)
+"""
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACING_MEMORY_MAX_SPANS: int = int(os.getenv("TRACING_MEMORY_MAX_SPANS", "10000"))
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span_var: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = (
+        "name",
+        "request_id",
+        "span_id",
+        "parent_id",
+        "start_time_ns",
+        "start",
+        "duration_ms",
+        "attributes",
+        "error",
+    )
+
+    def __init__(self, name: str, request_id: Optional[str], parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name: str = name
+        self.request_id: Optional[str] = request_id
+        self.span_id: str = uuid.uuid4().hex[:16]
+        self.parent_id: Optional[str] = parent_id
+        # 외부 exporter(OTel)용 wall clock + 소요 시간 측정용 monotonic clock
+        self.start_time_ns: int = time.time_ns()
+        self.start: float = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.attributes: Dict[str, Any] = attributes
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "request_id": self.request_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "duration_ms": self.duration_ms,
+            "attributes": dict(self.attributes),
+            "error": self.error,
+        }
+
+
+# ---------- exporters ----------
+class InMemorySpanExporter:
+    def __init__(self, max_spans: int = TRACING_MEMORY_MAX_SPANS):
+        self._spans: Deque[Span] = deque(maxlen=max(1, max_spans))
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def get_finished_spans(self, name: Optional[str] = None, request_id: Optional[str] = None) -> List[Span]:
+        return [
+            s
+            for s in list(self._spans)
+            if (name is None or s.name == name) and (request_id is None or s.request_id == request_id)
+        ]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+    def stage_summary(self) -> Dict[str, dict]:
+        """단계별 count / p50 / p95 / max (ms)"""
+        durations: Dict[str, List[float]] = {}
+        for s in list(self._spans):
+            if s.duration_ms is not None:
+                durations.setdefault(s.name, []).append(s.duration_ms)
+        summary: Dict[str, dict] = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            summary[name] = {
+                "count": len(values),
+                "p50_ms": round(_percentile(values, 0.50), 2),
+                "p95_ms": round(_percentile(values, 0.95), 2),
+                "max_ms": round(values[-1], 2),
+            }
+        return summary
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    index: int = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+class PrintSpanExporter:
+    def export(self, span: Span) -> None:
+        details: str = ", ".join(f"{k}={v}" for k, v in span.attributes.items())
+        print(f"⏱️ [{span.name}] {span.duration_ms / 1000:.2f}초" + (f" ({details})" if details else ""))
+
+
+class OpenTelemetrySpanExporter:
+    """
+    끝난 span을 시작/종료 시각을 지정해 OpenTelemetry span으로 다시 기록.
+    자식 span이 부모보다 먼저 끝나므로 OTel 부모-자식 관계 대신 request.id / span.parent_id 속성으로 묶는다.
+    """
+
+    def __init__(self):
+        from opentelemetry import trace  # opentelemetry-api (선택 의존성)
+
+        self._trace = trace
+        self._tracer = trace.get_tracer("backend.rag")
+
+    def export(self, span: Span) -> None:
+        otel_span = self._tracer.start_span(span.name, start_time=span.start_time_ns)
+        otel_span.set_attribute("span.id", span.span_id)
+        if span.parent_id:
+            otel_span.set_attribute("span.parent_id", span.parent_id)
+        if span.request_id:
+            otel_span.set_attribute("request.id", span.request_id)
+        for key, value in span.attributes.items():
+            if isinstance(value, (str, bool, int, float)):
+                otel_span.set_attribute(key, value)
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.start_time_ns + int((span.duration_ms or 0) * 1_000_000))
+
+
+memory_exporter: InMemorySpanExporter = InMemorySpanExporter()
+_exporters: List[Any] = []
+
+
+def add_exporter(exporter: Any) -> None:
+    _exporters.append(exporter)
+
+
+def remove_exporter(exporter: Any) -> None:
+    if exporter in _exporters:
+        _exporters.remove(exporter)
+
+
+def _configure_default_exporters() -> None:
+    debug_perf: bool = os.getenv("DEBUG_PERF", "false").lower() == "true"
+    default_names: str = "memory,otel" + (",print" if debug_perf else "")
+    names: List[str] = [n.strip() for n in os.getenv("TRACING_EXPORTERS", default_names).split(",") if n.strip()]
+    for name in names:
+        if name == "memory":
+            add_exporter(memory_exporter)
+        elif name == "print":
+            add_exporter(PrintSpanExporter())
+        elif name == "otel":
+            try:
+                add_exporter(OpenTelemetrySpanExporter())
+            except ImportError:
+                logger.debug("tracing_otel_unavailable")
+
+
+_configure_default_exporters()
+
+
+# ---------- API ----------
+def start_request(request_id: Optional[str] = None) -> str:
+    """현재 컨텍스트(요청)의 request_id를 설정하고 반환"""
+    request_id = request_id or uuid.uuid4().hex
+    request_id_var.set(request_id)
+    return request_id
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    parent: Optional[Span] = _current_span_var.get()
+    current = Span(name, request_id_var.get(), parent.span_id if parent else None, attributes)
+    token = _current_span_var.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - current.start) * 1000
+        _current_span_var.reset(token)
+        for exporter in list(_exporters):
+            try:
+                exporter.export(current)
+            except Exception as e:
+                logger.debug("tracing_export_failed exporter=%s err=%r", type(exporter).__name__, e)
@@ -1,5 +1,4 @@
 import os
-from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 from urllib.parse import urlsplit
 
@@ -36,26 +35,24 @@ class MongoDB:
         self.db = None
 
     def connect(self):
-        mongo_uri = os.getenv("MONGODB_URI") or os.getenv("MONGO_URI")
+        # 클라이언트(연결 풀)는 core.clients가 소유하고 ChatbotEngine 등과 공유한다
+        from backend.core import clients
+
         db_name = os.getenv("DB_NAME")
         
-        if not mongo_uri:
-            print("⚠️  MONGODB_URI/MONGO_URI 환경 변수가 설정되지 않았습니다. 기본값을 사용합니다.")
-            mongo_uri = "mongodb://localhost:27017"
-        else:
-            mongo_uri = _resolve_local_mongo_uri(mongo_uri)
-        
         if not db_name:
             print("⚠️  DB_NAME 환경 변수가 설정되지 않았습니다. 기본값을 사용합니다.")
             db_name = "moaai_db"
         
-        self.client = AsyncIOMotorClient(mongo_uri)
+        self.client = clients.get_mongo_client()
         self.db = self.client[db_name]
         print(f"✅ MongoDB 비동기 연결 성공 (DB: {db_name})")
 
     def close(self):
+        # 실제 연결 종료는 clients.close_all()에서 한 번만
         if self.client:
-            self.client.close()
+            self.client = None
+            self.db = None
             print("❌ MongoDB 연결 종료")
 
 db_manager = MongoDB()
\ No newline at end of file
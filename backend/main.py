@@ -1,11 +1,11 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware # 1. 미들웨어 추가
-from fastapi.staticfiles import StaticFiles
+import asyncio
 import os 
-from pathlib import Path
 import logging
+from backend.core import clients, compression, metrics, tracing
 from backend.database import db_manager
-from backend.routes import patents, auth, chatbot 
+from backend.routes import patents, auth, chatbot, pdfs, health, admin
 from backend.services import search_service
 
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
@@ -25,6 +25,8 @@ if should_quiet_third_party_logs:
     logging.getLogger("motor").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="LinkAI 서비스 API")
 
 # 2. CORS 설정 추가 (라우터 연결보다 반드시 위에 위치!)
@@ -49,59 +51,84 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (brotli/gzip, SSE/PDF/이미지 제외). MetricsMiddleware 안쪽에 두어 압축 시간도 라우트 지연에 포함
+if compression.COMPRESSION_ENABLED:
+    app.add_middleware(compression.CompressionMiddleware)
 
+# 라우트별 지연/처리 중 요청 수 (/metrics)
+app.add_middleware(metrics.MetricsMiddleware)
+# RAG 단계별 span → 단계 히스토그램, OpenAI/Qdrant 호출/오류 수
+tracing.add_exporter(metrics.MetricsSpanExporter())
 
-# 3. 정적 파일(PDF) 경로 설정 추가
-backend_dir: Path = Path(__file__).resolve().parent
-default_pdf_dir: str = str(backend_dir / "storage" / "pdfs")
-PDF_DIR: str = os.getenv("PDF_DIR", default_pdf_dir)
 
-# 폴더가 없으면 생성 (Docker/배포 환경에서 PDF를 별도로 마운트하는 경우가 많음)
-try:
-    os.makedirs(PDF_DIR, exist_ok=True)
-except Exception as e:
-    print(f"⚠️ PDF 폴더 생성 실패: {PDF_DIR} ({e})")
+def _collect_corpus_metrics() -> None:
+    corpus = search_service.corpus
+    metrics.corpus_documents.set(len(corpus.patents), kind="patents")
+    metrics.corpus_documents.set(len(corpus.flattened), kind="flattened")
+    for field, trie in corpus.suggest_indexes.items():
+        metrics.corpus_documents.set(trie.size, kind=f"suggest_{field}")
 
-if os.path.isdir(PDF_DIR):
-    app.mount("/static/pdfs", StaticFiles(directory=PDF_DIR), name="static_pdfs")
-else:
-    print(f"⚠️ 경고: PDF 폴더를 찾을 수 없습니다: {PDF_DIR}")
 
-@app.on_event("startup")
-async def startup():
-    db_manager.connect()
-    
-    #챗봇 검색 서비스 초기화
+metrics.register_collector(_collect_corpus_metrics)
+
+
+
+# 3. 정적 파일(PDF)은 routes/pdfs.py에서 Range/ETag/썸네일을 지원하며 서빙 (/static/pdfs)
+
+async def _initialize_search_service():
+    """챗봇 검색 서비스 초기화 (백그라운드). 실패해도 서버는 계속 동작하고 /readyz와 챗봇 503으로 드러난다."""
     try:
         await search_service.initialize_data()
         print("챗봇 검색 서비스 초기화 완료")
+        # 첫 챗봇 요청이 OpenAI/Qdrant 연결 수립 비용을 치르지 않도록
+        await clients.warm_up()
     except Exception as e:
-        print("챗봇 검색 서비스 초기화 실패:{e}")
-        #서버는 시작하되 챗봇 기능만 비활성화
-        
-    print("모든 서비스가 준비되었습니다.")
+        logger.exception("search_service_init_failed err=%r", e)
+        print(f"챗봇 검색 서비스 초기화 실패: {e}")
+
+    # 초기 로딩이 실패해도 파일이 고쳐지면 감시자가 다시 로드한다
+    if search_service.CORPUS_WATCH_INTERVAL_S > 0:
+        app.state.corpus_watch_task = asyncio.create_task(
+            search_service.watch_corpus_file(search_service.CORPUS_WATCH_INTERVAL_S)
+        )
+        print(f"코퍼스 파일 감시 시작 (주기 {search_service.CORPUS_WATCH_INTERVAL_S:.0f}s)")
+
+
+@app.on_event("startup")
+async def startup():
+    db_manager.connect()
+    clients.get_elasticsearch()
+    app.state.client_warmup_task = asyncio.create_task(clients.warm_up())
+    
+    # 코퍼스 로딩은 오래 걸리므로 기다리지 않는다 (/healthz는 바로 응답, 준비 여부는 /readyz)
+    app.state.search_init_task = asyncio.create_task(_initialize_search_service())
+    print("서버 시작 완료 (챗봇 코퍼스는 백그라운드에서 로딩 중, /readyz 참고)")
     
     
     
 @app.on_event("shutdown")
 async def shutdown():
+    for task_name in ("client_warmup_task", "search_init_task", "corpus_watch_task"):
+        task = getattr(app.state, task_name, None)
+        if task and not task.done():
+            task.cancel()
     db_manager.close()
     
-    
-    #비동기 클라이언트 정리
-    try:
-        if search_service.client_openai_async:
-            await search_service.client_openai_async.close()
-        if search_service.client_qdrant_async:
-            await search_service.client_qdrant_async.close()
-        print("챗봇 검색 서비스 종료 완료")
-    except Exception as e:
-        print(f"챗봇 검색 서비스 종료 중 오류 발생!: {e}")
+    #외부 서비스 클라이언트 정리 (MongoDB, Elasticsearch, OpenAI, Qdrant)
+    await clients.close_all()
+    print("외부 서비스 연결 종료 완료")
 
 # 라우터 연결
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
 app.include_router(patents.router, prefix="/api/patents", tags=["Patents"])
 app.include_router(chatbot.router, prefix="/api/chatbot", tags=["Chatbot"])
+app.include_router(pdfs.router, prefix="/static/pdfs", tags=["PDFs"])
+app.include_router(health.router, tags=["Health"])
+app.include_router(admin.router, prefix="/api/admin", tags=["Admin"])
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(content=metrics.render_latest(), media_type=metrics.CONTENT_TYPE_LATEST)
 
 @app.get("/")
 async def index():
@@ -0,0 +1,47 @@
+"""
+관리자 전용 API (admin 역할 필요)
+
+- POST /api/admin/corpus/reload: 챗봇 검색 코퍼스를 무중단으로 다시 로드 (백그라운드, 202)
+- GET  /api/admin/corpus: 현재 코퍼스와 재로딩 진행 상황
+여러 워커로 실행 중이면 요청을 받은 워커만 재로딩한다 (전체 워커는 CORPUS_WATCH_INTERVAL_S 파일 감시 사용).
+"""
+import logging
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+
+from backend.core.auth import get_current_user, require_role
+from backend.services import search_service
+
+router = APIRouter(dependencies=[Depends(require_role("admin"))])
+logger = logging.getLogger(__name__)
+
+
+async def _reload_in_background(force: bool, requested_by: str) -> None:
+    try:
+        result: dict = await search_service.reload_corpus(force=force)
+        logger.info(
+            "corpus_reload_done by=%s reloaded=%s documents=%s duration_s=%s",
+            requested_by, result["reloaded"], result.get("documents"), result.get("duration_s"),
+        )
+    except search_service.CorpusReloadBusyError:
+        logger.warning("corpus_reload_skipped by=%s reason=busy", requested_by)
+    except Exception as e:
+        logger.exception("corpus_reload_failed by=%s err=%r", requested_by, e)
+
+
+@router.post("/corpus/reload", status_code=status.HTTP_202_ACCEPTED)
+async def reload_corpus(
+    background_tasks: BackgroundTasks,
+    force: bool = Query(False, description="파일 내용(sha256)이 같아도 다시 구축"),
+    user: dict = Depends(get_current_user),
+):
+    if search_service.is_corpus_reload_blocked():
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="코퍼스 로딩이 이미 진행 중입니다.")
+    background_tasks.add_task(_reload_in_background, force, user["email"])
+    logger.info("corpus_reload_requested by=%s force=%s", user["email"], force)
+    return {"status": "accepted", "corpus": search_service.corpus_summary()}
+
+
+@router.get("/corpus")
+async def corpus_info():
+    return search_service.corpus_summary()
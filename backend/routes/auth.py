@@ -1,17 +1,70 @@
-from fastapi import APIRouter, HTTPException, status
+import logging
+import math
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr
 from datetime import datetime, timedelta 
-from backend.core.security import get_password_hash, verify_password, create_access_token 
+from backend.core.auth import get_current_user
+from backend.core.rate_limit import SlidingWindowRateLimiter
+from backend.core.security import (
+    PasswordHashBusyError,
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from backend.database import db_manager
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# 로그인 시도 제한 (bcrypt 검증 전에 거르므로 제한에 걸린 요청은 CPU를 쓰지 않는다)
+# - IP별 전체 시도 횟수 (강의실 하나가 NAT 뒤 같은 IP로 몰려 로그인하는 경우를 고려해 넉넉하게)
+# - 이메일별 연속 실패 횟수 (성공하면 초기화) → 계정 단위 추측 공격은 이쪽에서 막는다
+login_ip_limiter = SlidingWindowRateLimiter(
+    max_events=int(os.getenv("LOGIN_RATE_LIMIT_PER_IP", "120")),
+    window_s=float(os.getenv("LOGIN_RATE_LIMIT_WINDOW_S", "60")),
+)
+login_failure_limiter = SlidingWindowRateLimiter(
+    max_events=int(os.getenv("LOGIN_FAILURE_LIMIT", "5")),
+    window_s=float(os.getenv("LOGIN_FAILURE_WINDOW_S", "300")),
+)
+# 앞단 리버스 프록시 수 (Railway 등). 0이면 TCP peer 주소를 사용
+# 프록시는 X-Forwarded-For 끝에 자신이 본 주소를 덧붙이므로, 뒤에서 N번째 항목만 신뢰한다
+# (클라이언트가 보낸 앞쪽 항목은 위조 가능)
+TRUSTED_PROXY_HOPS: int = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+
+def _client_ip(request: Request) -> str:
+    if TRUSTED_PROXY_HOPS > 0:
+        forwarded: list[str] = [
+            hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()
+        ]
+        if len(forwarded) >= TRUSTED_PROXY_HOPS:
+            return forwarded[-TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+def _too_many_attempts(retry_after_s: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after_s)))},
+    )
+
+
+def _password_hash_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+        headers={"Retry-After": "1"},
+    )
 
 # --- 데이터 모델 ---
 class UserSignup(BaseModel):
+    # role은 받지 않는다 (가입은 항상 "user", 관리자 권한은 DB에서 직접 부여)
     email: EmailStr
     password: str
     name: str
-    role: str = "user"
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -27,12 +80,18 @@ async def signup(user_data: UserSignup):
     if existing_user:
         raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다.")
     
+    # 비밀번호 해시 (이벤트 루프 밖에서 실행)
+    try:
+        password_hash = await get_password_hash_async(user_data.password)
+    except PasswordHashBusyError:
+        raise _password_hash_busy()
+
     # 새 유저 저장
     new_user = {
         "email": user_data.email,
-        "password": get_password_hash(user_data.password),
+        "password": password_hash,
         "name": user_data.name,
-        "role": user_data.role,
+        "role": "user",
         "status": "active",
         "metadata": {
             "createdAt": datetime.utcnow(), 
@@ -45,22 +104,39 @@ async def signup(user_data: UserSignup):
 
 # --- 2. 로그인 API  ---
 @router.post("/login")
-async def login(user_data: UserLogin):
+async def login(user_data: UserLogin, request: Request):
     users_col = db_manager.db["users"]
 
-    # 유저 확인
+    # 시도 횟수 제한
+    client_ip: str = _client_ip(request)
+    email_key: str = user_data.email.lower()
+    retry_after_s = login_ip_limiter.retry_after(client_ip) or login_failure_limiter.retry_after(email_key)
+    if retry_after_s is not None:
+        logger.warning("auth_login_rate_limited ip=%s", client_ip)
+        raise _too_many_attempts(retry_after_s)
+    login_ip_limiter.hit(client_ip)
+
+    # 유저 확인 + 비밀번호 검증 (계정이 없어도 같은 비용의 검증을 수행)
     user = await users_col.find_one({"email": user_data.email})
-    if not user:
-        raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 잘못되었습니다.")
+    try:
+        verified, new_hash = await verify_password_async(user_data.password, user.get("password") if user else None)
+    except PasswordHashBusyError:
+        raise _password_hash_busy()
 
-    # 비밀번호 검증 (오타 수정: verify_password)
-    if not verify_password(user_data.password, user["password"]):
+    if not user or not verified:
+        login_failure_limiter.hit(email_key)
         raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 잘못되었습니다.")
+    login_failure_limiter.reset(email_key)
+
+    # pwd_context 설정이 바뀐 경우 현재 설정으로 재해싱해 저장
+    if new_hash:
+        await users_col.update_one({"_id": user["_id"]}, {"$set": {"password": new_hash}})
+        logger.info("auth_password_rehashed user_id=%s", user["_id"])
 
     # 토큰 생성 (오타 수정: access_token, user["email"])
     access_token_expires = timedelta(minutes=30)
     access_token = create_access_token(
-        data={"sub": user["email"]}, expires_delta=access_token_expires
+        data={"sub": user["email"], "role": user.get("role", "user")}, expires_delta=access_token_expires
     )
     
     return {
@@ -69,4 +145,14 @@ async def login(user_data: UserLogin):
         "role": user.get("role", "user"),
         "name": user.get("name","사용자"),
         "message": "로그인 성공!"
-    }
\ No newline at end of file
+    }
+
+
+# --- 3. 내 정보 API (토큰 검증) ---
+@router.get("/me")
+async def me(current_user: dict = Depends(get_current_user)):
+    return {
+        "email": current_user["email"],
+        "role": current_user["role"],
+        "expires_at": current_user["claims"].get("exp"),
+    }
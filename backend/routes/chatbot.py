@@ -1,19 +1,39 @@
 from functools import lru_cache
-from fastapi import APIRouter, HTTPException, Depends
+import os
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 
+from backend.core.json_response import ORJSONResponse
+from backend.services import search_service
 from backend.services.chatbot_engine import ChatbotEngine
 
 
 router = APIRouter()
 
+# 코퍼스 로딩 중 503 응답에 넣는 재시도 대기 시간
+CHATBOT_NOT_READY_RETRY_AFTER_S: int = int(os.getenv("CHATBOT_NOT_READY_RETRY_AFTER_S", "10"))
+
+
 @lru_cache(maxsize=1)
 def get_chatbot_engine() -> ChatbotEngine:
     return ChatbotEngine()
 
 
+def require_corpus_ready() -> None:
+    """코퍼스가 준비되기 전에는 검색/LLM 호출 없이 바로 503 (빈 컨텍스트로 답변하지 않도록)"""
+    if search_service.is_corpus_ready():
+        return
+    state: str = search_service.corpus_status["state"]
+    detail: str = "챗봇 검색 서비스 초기화에 실패했습니다." if state == "failed" else "챗봇 데이터를 불러오는 중입니다. 잠시 후 다시 시도해 주세요."
+    raise HTTPException(
+        status_code=503,
+        detail=detail,
+        headers={"Retry-After": str(CHATBOT_NOT_READY_RETRY_AFTER_S)},
+    )
+
+
 # --- 모델 정의 ---
 class ChatRequest(BaseModel):
     query: str 
@@ -21,11 +41,15 @@ class ChatRequest(BaseModel):
     
 # --- API 엔드포인트---
 
-@router.post("/ask")
-async def ask_chatbot(request: ChatRequest, engine: ChatbotEngine = Depends(get_chatbot_engine)):
+@router.post("/ask", dependencies=[Depends(require_corpus_ready)])
+async def ask_chatbot(
+    request: ChatRequest,
+    engine: ChatbotEngine = Depends(get_chatbot_engine),
+    x_request_id: Optional[str] = Header(None, description="추적용 요청 ID (없으면 서버에서 생성)"),
+):
     try:
         #엔진을 통해 답변 생성
-        result = await engine.answer(request.query, session_id=request.session_id)
+        result = await engine.answer(request.query, session_id=request.session_id, request_id=x_request_id)
         return result if isinstance(result, dict) else {"answer": result, "session_id": request.session_id}
     except Exception as e:
         print(f"챗봇 에러: {e}")
@@ -33,30 +57,51 @@ async def ask_chatbot(request: ChatRequest, engine: ChatbotEngine = Depends(get_
 
 
 # Frontend compatibility (chatService.ts uses /answer)
-@router.post("/answer")
-async def answer_chatbot(request: ChatRequest, engine: ChatbotEngine = Depends(get_chatbot_engine)):
-    return await ask_chatbot(request, engine)
+@router.post("/answer", dependencies=[Depends(require_corpus_ready)])
+async def answer_chatbot(
+    request: ChatRequest,
+    engine: ChatbotEngine = Depends(get_chatbot_engine),
+    x_request_id: Optional[str] = Header(None),
+):
+    return await ask_chatbot(request, engine, x_request_id)
     
 
 # 2. 모든 세션 목록 가져오기
-@router.get("/sessions")
+@router.get("/sessions", response_class=ORJSONResponse)
 async def get_sessions(engine: ChatbotEngine = Depends(get_chatbot_engine)):
     try:
         sessions = await engine.get_all_session()
-        return sessions
+        # updated_at(datetime)은 ORJSONResponse가 epoch milliseconds로 변환
+        return ORJSONResponse(sessions)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"세션 목록 로드 실패: {e}")
     
     
 # 3. 특정 세션의 대화 내역 가져오기 (사이드바 클릭 시)
-@router.get("/sessions/{session_id}")
+@router.get("/sessions/{session_id}", response_class=ORJSONResponse)
 async def get_session_history(session_id: str, engine: ChatbotEngine = Depends(get_chatbot_engine)):
     try:
         # ChatbotEngine에 구현된 get_chat_history 호출
         history = await engine.get_chat_history(session_id)
         if not history:
             raise HTTPException(status_code=404, detail="대화 내역을 찾을 수 없습니다.")
-        return history
+        return ORJSONResponse(history)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"내역 로드 실패: {e}")
+
+
+# 3-1. 특정 세션의 대화 내역을 최신 메시지부터 페이지 단위로 가져오기
+@router.get("/sessions/{session_id}/messages", response_class=ORJSONResponse)
+async def get_session_messages(
+    session_id: str,
+    limit: int = Query(50, ge=1, le=200, description="가져올 메시지 수"),
+    before: Optional[float] = Query(None, description="이 timestamp 이전 메시지 (이전 응답의 next_before)"),
+    engine: ChatbotEngine = Depends(get_chatbot_engine),
+):
+    try:
+        return ORJSONResponse(await engine.get_chat_messages(session_id, limit=limit, before=before))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"내역 로드 실패: {e}")
 
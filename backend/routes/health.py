@@ -0,0 +1,80 @@
+"""
+헬스 체크
+
+- /healthz: 프로세스가 살아 있고 이벤트 루프가 응답하는지만 확인 (외부 의존성 조회 없음 → 플랫폼 liveness/재시작 판단용)
+- /readyz: 서브시스템별 준비 상태 (MongoDB, Elasticsearch, 챗봇 코퍼스). 하나라도 준비되지 않으면 503
+  → 롤링 배포 시 새 인스턴스가 코퍼스 로딩을 마친 뒤에만 트래픽을 받도록 readiness 경로로 사용
+"""
+import asyncio
+import os
+import time
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from backend.core import clients
+from backend.database import db_manager
+from backend.services import search_service
+
+router = APIRouter()
+
+# 외부 의존성 ping 제한 시간 (readiness 체크가 느린 의존성 때문에 오래 걸리지 않도록)
+READINESS_TIMEOUT_S: float = float(os.getenv("READINESS_TIMEOUT_S", "1.0"))
+
+
+async def _check(probe) -> dict:
+    start_s: float = time.perf_counter()
+    try:
+        ok: bool = bool(await asyncio.wait_for(probe(), timeout=READINESS_TIMEOUT_S))
+        result: dict = {"ready": ok}
+    except asyncio.TimeoutError:
+        result = {"ready": False, "error": f"timeout after {READINESS_TIMEOUT_S}s"}
+    except Exception as e:
+        result = {"ready": False, "error": repr(e)}
+    result["latency_ms"] = round((time.perf_counter() - start_s) * 1000, 1)
+    return result
+
+
+async def _ping_mongo() -> bool:
+    if db_manager.client is None:
+        return False
+    await db_manager.client.admin.command("ping")
+    return True
+
+
+async def _ping_elasticsearch() -> bool:
+    return await clients.get_elasticsearch().ping()
+
+
+def _corpus_readiness() -> dict:
+    status: dict = search_service.corpus_status
+    result: dict = {
+        "ready": search_service.is_corpus_ready(),
+        "state": status["state"],
+        "documents": status["documents"],
+    }
+    if status["state"] == "loading":
+        result["phase"] = status["phase"]
+        result["progress"] = round(status["progress"], 3)
+    if status["error"]:
+        result["error"] = status["error"]
+    if status["started_at"]:
+        result["elapsed_s"] = round((status["finished_at"] or time.time()) - status["started_at"], 1)
+    return result
+
+
+@router.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+async def readyz():
+    mongo, elasticsearch = await asyncio.gather(_check(_ping_mongo), _check(_ping_elasticsearch))
+    checks: dict = {"mongo": mongo, "elasticsearch": elasticsearch, "corpus": _corpus_readiness()}
+    ready: bool = all(check["ready"] for check in checks.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "checks": checks},
+        headers={"Cache-Control": "no-store"},
+    )
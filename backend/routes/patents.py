@@ -1,92 +1,258 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
-from elasticsearch import AsyncElasticsearch
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Optional, List, Literal
+import hashlib
+import json
 import os
 import re
 import logging
 import time
 import uuid
-from urllib.parse import urlsplit
+from backend.core.cache import TTLCache
+from backend.core.http_cache import etag_matches
+from backend.core.json_response import ORJSONResponse
+from backend.core import clients, metrics
+from backend.services.es_index import PATENTS_ALIAS
+from backend.services import suggest_service
 
 router = APIRouter(tags=["특허 API"])
 logger = logging.getLogger(__name__)
 
-def _is_running_in_docker() -> bool:
-    if os.path.exists("/.dockerenv"):
-        return True
-    env_raw: str = (os.getenv("RUNNING_IN_DOCKER") or "").strip().lower()
-    return env_raw in ["1", "true", "yes", "y", "on"]
-
-def _resolve_local_elasticsearch_url(raw_url: str | None) -> str:
-    default_url: str = "http://127.0.0.1:9200"
-    if not raw_url:
-        return default_url
-    normalized_url: str = raw_url.strip()
-    if not normalized_url:
-        return default_url
-    if "://" not in normalized_url:
-        normalized_url = "http://" + normalized_url
-    try:
-        host: str = urlsplit(normalized_url).hostname or ""
-        if host == "elasticsearch" and not _is_running_in_docker():
-            return default_url
-        return normalized_url
-    except Exception:
-        return default_url
-
-def _parse_and_or_query(field: str, query_str: str):
+def _split_and_or(query_str: str) -> tuple[str, list[str]]:
     """
-    AND/OR 연산자를 포함한 쿼리 문자열을 Elasticsearch 쿼리로 변환
+    AND/OR 연산자로 쿼리 문자열을 분리.
+    반환값: ("or" | "and" | "single", terms)
     """
-    if not query_str or not query_str.strip():
-        return None
-    original_query: str = query_str
-    logger.debug("parse_query field=%s query=%r", field, original_query)
-    
-    # OR 연산자가 있는 경우
+    # OR 연산자가 있는 경우 (대소문자 구분 없이 분리)
     if ' OR ' in query_str.upper() or ' or ' in query_str:
-        # 대소문자 구분 없이 OR로 분리
-        terms = re.split(r'\s+OR\s+', query_str, flags=re.IGNORECASE)
-        terms = [t.strip() for t in terms if t.strip()]
+        terms = [t.strip() for t in re.split(r'\s+OR\s+', query_str, flags=re.IGNORECASE) if t.strip()]
         if len(terms) > 1:
-            logger.debug("parse_query_or field=%s terms=%r", field, terms)
-            return {
-                "bool": {
-                    "should": [
-                        {"match": {field: term}} for term in terms
-                    ],
-                    "minimum_should_match": 1
-                }
-            }
-    
+            return "or", terms
+
     # AND 연산자가 있는 경우
     if ' AND ' in query_str.upper() or ' and ' in query_str:
-        terms = re.split(r'\s+AND\s+', query_str, flags=re.IGNORECASE)
-        terms = [t.strip() for t in terms if t.strip()]
+        terms = [t.strip() for t in re.split(r'\s+AND\s+', query_str, flags=re.IGNORECASE) if t.strip()]
         if len(terms) > 1:
-            logger.debug("parse_query_and field=%s terms=%r", field, terms)
-            return {
-                "bool": {
-                    "must": [
-                        {"match": {field: term}} for term in terms
-                    ]
-                }
-            }
-    
-    # 연산자가 없는 경우 기본 match 쿼리
-    logger.debug("parse_query_single field=%s term=%r", field, original_query.strip())
-    return {"match": {field: query_str}}
-
-# Elasticsearch 클라이언트 설정
-elasticsearch_url = _resolve_local_elasticsearch_url(os.getenv("ELASTICSEARCH_URL"))
-es = AsyncElasticsearch(
-    elasticsearch_url,
-    verify_certs=False,
-    ssl_show_warn=False,
-    request_timeout=30
-    )
-
-@router.get("/")
+            return "and", terms
+
+    return "single", [query_str]
+
+def _combine_and_or(operator: str, clauses: list[dict]) -> dict:
+    if operator == "or":
+        return {"bool": {"should": clauses, "minimum_should_match": 1}}
+    if operator == "and":
+        return {"bool": {"must": clauses}}
+    return clauses[0]
+
+def _parse_and_or_query(field: str, query_str: str):
+    """
+    AND/OR 연산자를 포함한 쿼리 문자열을 Elasticsearch 쿼리로 변환
+    """
+    if not query_str or not query_str.strip():
+        return None
+    operator, terms = _split_and_or(query_str)
+    logger.debug("parse_query field=%s operator=%s terms=%r", field, operator, terms)
+    return _combine_and_or(operator, [{"match": {field: term}} for term in terms])
+
+def _parse_and_or_multi_match(fields: list[str], query_str: str, fuzziness: str | None = None):
+    """AND/OR 연산자를 지원하는 multi_match 쿼리 (기술/제품 키워드용)"""
+    if not query_str or not query_str.strip():
+        return None
+    operator, terms = _split_and_or(query_str)
+    logger.debug("parse_multi_match fields=%r operator=%s terms=%r", fields, operator, terms)
+    clauses: list[dict] = []
+    for term in terms:
+        multi_match: dict = {"query": term, "fields": fields}
+        if fuzziness:
+            multi_match["fuzziness"] = fuzziness
+        clauses.append({"multi_match": multi_match})
+    return _combine_and_or(operator, clauses)
+
+def _number_variants(raw_number: str) -> list[str]:
+    """
+    출원/등록번호 정확 일치 조회용 후보 값.
+    사용자가 "10-2006-0006323"처럼 하이픈을 넣어 입력해도 저장 형식("1020060006323")과 일치하도록 한다.
+    """
+    stripped: str = raw_number.strip()
+    digits_only: str = re.sub(r"[^0-9]", "", stripped)
+    variants: list[str] = [stripped]
+    if digits_only and digits_only != stripped:
+        variants.append(digits_only)
+    return variants
+
+def _exact_number_filter(field: str, raw_number: str) -> dict:
+    return {"terms": {f"{field}.keyword": _number_variants(raw_number)}}
+
+def _build_search_query(
+    tech_q: Optional[str] = None,
+    prod_q: Optional[str] = None,
+    desc_q: Optional[str] = None,
+    claim_q: Optional[str] = None,
+    inventor: Optional[str] = None,
+    manager: Optional[str] = None,
+    applicant: Optional[str] = None,
+    app_num: Optional[str] = None,
+    reg_num: Optional[str] = None,
+) -> tuple[dict, Optional[dict]]:
+    """
+    검색 조건을 Elasticsearch bool 쿼리로 변환.
+    - 점수에 기여하는 전문 검색 조건은 bool.must
+    - 출원/등록번호처럼 정확 일치 조건은 bool.filter (점수 계산 생략 + 노드 쿼리 캐시 대상)
+    - 법적 상태는 여기 넣지 않는다 (_build_status_filter → post_filter, 상태 패싯이 선택값으로 좁아지지 않도록)
+    반환값: (검색 쿼리, 하이라이팅 쿼리 - 전문 검색 조건이 없으면 None)
+    """
+    must_queries: list[dict] = []
+    filter_queries: list[dict] = []
+
+    # 기술 키워드 검색 (발명의 명칭, AND/OR 연산자 지원)
+    if tech_q:
+        tech_query = _parse_and_or_multi_match(["title.ko^2", "abstract"], tech_q, fuzziness="AUTO")
+        if tech_query:
+            must_queries.append(tech_query)
+
+    # 제품 키워드 검색
+    if prod_q:
+        prod_query = _parse_and_or_multi_match(["title.ko", "abstract"], prod_q)
+        if prod_query:
+            must_queries.append(prod_query)
+
+    # 명세서 키워드 검색
+    if desc_q:
+        desc_query = _parse_and_or_query("abstract", desc_q)
+        if desc_query:
+            must_queries.append(desc_query)
+
+    # 청구범위 키워드 검색
+    if claim_q:
+        claim_query = _parse_and_or_query("claims", claim_q)
+        if claim_query:
+            must_queries.append(claim_query)
+
+    # 발명자 검색 (AND/OR 연산자 지원)
+    if inventor:
+        inventor_query = _parse_and_or_query("inventors.name", inventor)
+        if inventor_query:
+            must_queries.append(inventor_query)
+
+    # 책임연구자 검색 (responsibleInventor 필드 사용 - inventors[0].name)
+    if manager:
+        manager_query = _parse_and_or_query("responsibleInventor", manager)
+        if manager_query:
+            must_queries.append(manager_query)
+
+    # 출원인 검색 (AND/OR 연산자 지원)
+    if applicant:
+        applicant_query = _parse_and_or_query("applicant.name", applicant)
+        if applicant_query:
+            must_queries.append(applicant_query)
+
+    # 출원번호 / 등록번호: keyword 정확 일치 (filter context)
+    if app_num and app_num.strip():
+        filter_queries.append(_exact_number_filter("applicationNumber", app_num))
+    if reg_num and reg_num.strip():
+        filter_queries.append(_exact_number_filter("registrationNumber", reg_num))
+
+    if not must_queries and not filter_queries:
+        return {"match_all": {}}, None
+
+    bool_query: dict = {}
+    if must_queries:
+        bool_query["must"] = must_queries
+    if filter_queries:
+        bool_query["filter"] = filter_queries
+    highlight_query: Optional[dict] = {"bool": {"must": must_queries}} if must_queries else None
+    return {"bool": bool_query}, highlight_query
+
+def _build_status_filter(status: Optional[List[str]]) -> Optional[dict]:
+    """법적 상태 필터 (검색 결과에는 post_filter로, 상태 외 패싯에는 filter 집계로 적용)"""
+    if not status:
+        return None
+    return {"terms": {"status.keyword": status}}
+
+# 응답 projection 설정
+# 검색 목록(list)은 테이블 표시에 필요한 필드만, 상세(detail)는 전체 _source를 반환한다.
+PATENT_LIST_SOURCE_INCLUDES: list[str] = [
+    "applicationNumber",
+    "applicationDate",
+    "registrationNumber",
+    "status",
+    "title",
+    "applicant.name",
+    "inventors.name",
+    "responsibleInventor",
+    "countryCode",
+    "pdfPath",
+    "hasPdf",
+]
+# 전체(full) 목록 응답에서도 내부용 필드는 제외한다.
+PATENT_FULL_SOURCE_EXCLUDES: list[str] = ["rawRef"]
+
+def _build_source_filter(view: str) -> dict:
+    if view == "list":
+        return {"includes": PATENT_LIST_SOURCE_INCLUDES}
+    return {"excludes": PATENT_FULL_SOURCE_EXCLUDES}
+
+def _build_etag(hit: dict) -> str:
+    """_seq_no/_primary_term 기반의 strong ETag (문서가 바뀔 때만 바뀐다)"""
+    raw: str = f"{hit.get('_index')}:{hit.get('_id')}:{hit.get('_primary_term')}:{hit.get('_seq_no')}"
+    return '"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+# 패싯(집계) 설정
+FACET_TERMS_SIZE: int = int(os.getenv("PATENT_FACET_TERMS_SIZE", "20"))
+FACET_AGGREGATIONS: dict = {
+    "status": {"terms": {"field": "status.keyword", "size": FACET_TERMS_SIZE}},
+    "ipcCodes": {"terms": {"field": "ipcCodes.keyword", "size": FACET_TERMS_SIZE}},
+    "cpcCodes": {"terms": {"field": "cpcCodes.keyword", "size": FACET_TERMS_SIZE}},
+    "applicant": {"terms": {"field": "applicant.name.keyword", "size": FACET_TERMS_SIZE}},
+    "applicationYear": {
+        "date_histogram": {
+            "field": "applicationDate",
+            "calendar_interval": "year",
+            "format": "yyyy",
+            "min_doc_count": 1,
+        }
+    },
+}
+
+def _build_facet_aggregations(status_filter: Optional[dict]) -> dict:
+    """
+    상태 필터가 있으면 상태 패싯은 필터 없이(다른 상태 건수도 그대로 보이도록),
+    나머지 패싯은 상태 필터를 적용한 filter 집계 안에서 계산한다.
+    """
+    if status_filter is None:
+        return FACET_AGGREGATIONS
+    others: dict = {name: agg for name, agg in FACET_AGGREGATIONS.items() if name != "status"}
+    return {
+        "status": FACET_AGGREGATIONS["status"],
+        "status_filtered": {"filter": status_filter, "aggs": others},
+    }
+
+# 같은 검색 조건의 페이지 이동 시 집계를 다시 계산하지 않도록 쿼리 단위로 캐시
+facet_cache: TTLCache = TTLCache(
+    maxsize=int(os.getenv("PATENT_FACET_CACHE_SIZE", "256")),
+    ttl_s=float(os.getenv("PATENT_FACET_CACHE_TTL_S", "300")),
+)
+
+metrics.register_cache("patent_facets", facet_cache)
+
+def _facet_cache_key(search_query: dict, status_filter: Optional[dict]) -> str:
+    return json.dumps([search_query, status_filter], sort_keys=True, ensure_ascii=False)
+
+def _parse_facets(aggregations: dict) -> dict:
+    """ES 집계 결과를 [{value, count}] 목록으로 정리"""
+    facets: dict = {}
+    for name, agg in aggregations.items():
+        if name == "status_filtered":
+            # 상태 필터 아래에서 계산한 나머지 패싯
+            facets.update(_parse_facets({k: v for k, v in agg.items() if isinstance(v, dict)}))
+            continue
+        buckets = agg.get("buckets", [])
+        facets[name] = [
+            {"value": bucket.get("key_as_string", bucket.get("key")), "count": bucket.get("doc_count", 0)}
+            for bucket in buckets
+        ]
+    return facets
+
+@router.get("/", response_class=ORJSONResponse)
 async def get_patents(
     tech_q: Optional[str] = Query(None, description="기술 키워드"),
     prod_q: Optional[str] = Query(None, description="제품 키워드"),
@@ -99,19 +265,22 @@ async def get_patents(
     reg_num: Optional[str] = Query(None, description="등록번호"),
     status: Optional[List[str]] = Query(None, description="법적 상태 (다중 선택 가능)"),
     page: int = 1, 
-    limit: int = 10
+    limit: int = 10,
+    view: Literal["full", "list"] = Query("full", description="응답 projection (list: 목록용 최소 필드, full: 전체 필드)"),
+    facets: bool = Query(False, description="상태/IPC/CPC/출원인/출원연도 집계 포함 여부"),
 ):
     request_id: str = uuid.uuid4().hex[:10]
     start_time_s: float = time.perf_counter()
     try:
         skip = (page - 1) * limit
-        must_queries = []
         logger.info(
-            "patents_search_start request_id=%s page=%d limit=%d skip=%d",
+            "patents_search_start request_id=%s page=%d limit=%d skip=%d view=%s facets=%s",
             request_id,
             page,
             limit,
             skip,
+            view,
+            facets,
         )
         logger.debug(
             "patents_search_params request_id=%s tech_q=%r prod_q=%r desc_q=%r claim_q=%r inventor=%r manager=%r applicant=%r app_num=%r reg_num=%r status=%r",
@@ -128,201 +297,24 @@ async def get_patents(
             status,
         )
 
-        # 기술 키워드 검색 (발명의 명칭, AND/OR 연산자 지원)
-        if tech_q:
-            if ' OR ' in tech_q.upper() or ' or ' in tech_q:
-                # OR 연산자 처리
-                terms = re.split(r'\s+OR\s+', tech_q, flags=re.IGNORECASE)
-                terms = [t.strip() for t in terms if t.strip()]
-                if len(terms) > 1:
-                    logger.debug("tech_q_or request_id=%s terms=%r", request_id, terms)
-                    must_queries.append({
-                        "bool": {
-                            "should": [
-                                {
-                                    "multi_match": {
-                                        "query": term,
-                                        "fields": ["title.ko^2", "abstract"],
-                                        "fuzziness": "AUTO"
-                                    }
-                                } for term in terms
-                            ],
-                            "minimum_should_match": 1
-                        }
-                    })
-                else:
-                    must_queries.append({
-                        "multi_match": {
-                            "query": tech_q,
-                            "fields": ["title.ko^2", "abstract"],
-                            "fuzziness": "AUTO"
-                        }
-                    })
-            elif ' AND ' in tech_q.upper() or ' and ' in tech_q:
-                # AND 연산자 처리
-                terms = re.split(r'\s+AND\s+', tech_q, flags=re.IGNORECASE)
-                terms = [t.strip() for t in terms if t.strip()]
-                if len(terms) > 1:
-                    logger.debug("tech_q_and request_id=%s terms=%r", request_id, terms)
-                    must_queries.append({
-                        "bool": {
-                            "must": [
-                                {
-                                    "multi_match": {
-                                        "query": term,
-                                        "fields": ["title.ko^2", "abstract"],
-                                        "fuzziness": "AUTO"
-                                    }
-                                } for term in terms
-                            ]
-                        }
-                    })
-                else:
-                    must_queries.append({
-                        "multi_match": {
-                            "query": tech_q,
-                            "fields": ["title.ko^2", "abstract"],
-                            "fuzziness": "AUTO"
-                        }
-                    })
-            else:
-                # 연산자 없음
-                logger.debug("tech_q_single request_id=%s query=%r", request_id, tech_q)
-                must_queries.append({
-                    "multi_match": {
-                        "query": tech_q,
-                        "fields": ["title.ko^2", "abstract"],
-                        "fuzziness": "AUTO"
-                    }
-                })
-
-        # 제품 키워드 검색
-        if prod_q:
-            if ' OR ' in prod_q.upper() or ' or ' in prod_q:
-                terms = re.split(r'\s+OR\s+', prod_q, flags=re.IGNORECASE)
-                terms = [t.strip() for t in terms if t.strip()]
-                if len(terms) > 1:
-                    logger.debug("prod_q_or request_id=%s terms=%r", request_id, terms)
-                    must_queries.append({
-                        "bool": {
-                            "should": [
-                                {
-                                    "multi_match": {
-                                        "query": term,
-                                        "fields": ["title.ko", "abstract"]
-                                    }
-                                } for term in terms
-                            ],
-                            "minimum_should_match": 1
-                        }
-                    })
-                else:
-                    must_queries.append({
-                        "multi_match": {
-                            "query": prod_q,
-                            "fields": ["title.ko", "abstract"]
-                        }
-                    })
-            elif ' AND ' in prod_q.upper() or ' and ' in prod_q:
-                terms = re.split(r'\s+AND\s+', prod_q, flags=re.IGNORECASE)
-                terms = [t.strip() for t in terms if t.strip()]
-                if len(terms) > 1:
-                    logger.debug("prod_q_and request_id=%s terms=%r", request_id, terms)
-                    must_queries.append({
-                        "bool": {
-                            "must": [
-                                {
-                                    "multi_match": {
-                                        "query": term,
-                                        "fields": ["title.ko", "abstract"]
-                                    }
-                                } for term in terms
-                            ]
-                        }
-                    })
-                else:
-                    must_queries.append({
-                        "multi_match": {
-                            "query": prod_q,
-                            "fields": ["title.ko", "abstract"]
-                        }
-                    })
-            else:
-                logger.debug("prod_q_single request_id=%s query=%r", request_id, prod_q)
-                must_queries.append({
-                    "multi_match": {
-                        "query": prod_q,
-                        "fields": ["title.ko", "abstract"]
-                    }
-                })
-
-        # 명세서 키워드 검색
-        if desc_q:
-            desc_query = _parse_and_or_query("abstract", desc_q)
-            if desc_query:
-                logger.debug("desc_q_parsed request_id=%s query=%s", request_id, desc_query)
-                must_queries.append(desc_query)
-
-        # 청구범위 키워드 검색
-        if claim_q:
-            claim_query = _parse_and_or_query("claims", claim_q)
-            if claim_query:
-                logger.debug("claim_q_parsed request_id=%s query=%s", request_id, claim_query)
-                must_queries.append(claim_query)
-
-        # 발명자 검색 (AND/OR 연산자 지원)
-        if inventor:
-            inventor_query = _parse_and_or_query("inventors.name", inventor)
-            if inventor_query:
-                logger.debug("inventor_parsed request_id=%s query=%s", request_id, inventor_query)
-                must_queries.append(inventor_query)
-        
-        # 책임연구자 검색 (responsibleInventor 필드 사용 - inventors[0].name)
-        if manager:
-            manager_query = _parse_and_or_query("responsibleInventor", manager)
-            if manager_query:
-                logger.debug("manager_parsed request_id=%s query=%s", request_id, manager_query)
-                must_queries.append(manager_query)
-        
-        # 출원인 검색 (AND/OR 연산자 지원)
-        if applicant:
-            applicant_query = _parse_and_or_query("applicant.name", applicant)
-            if applicant_query:
-                logger.debug("applicant_parsed request_id=%s query=%s", request_id, applicant_query)
-                must_queries.append(applicant_query)
-        
-        # 출원번호 검색
-        if app_num:
-            logger.debug("app_num_match request_id=%s app_num=%r", request_id, app_num)
-            must_queries.append({"match": {"applicationNumber": app_num}})
-        
-        # 등록번호 검색
-        if reg_num:
-            logger.debug("reg_num_match request_id=%s reg_num=%r", request_id, reg_num)
-            must_queries.append({"match": {"registrationNumber": reg_num}})
-
-        # 법적 상태 필터링
-        if status and len(status) > 0:
-            logger.debug("status_terms request_id=%s status=%r", request_id, status)
-            must_queries.append({
-                "terms": {
-                    "status": status
-                }
-            })
-
-        # 쿼리 조합
-        if must_queries:
-            search_query = {"bool": {"must": must_queries}}
-        else:
-            search_query = {"match_all": {}}
+        # 쿼리 조합 (점수 계산 조건은 must, 정확 일치 조건은 filter)
+        search_query, highlight_query = _build_search_query(
+            tech_q=tech_q,
+            prod_q=prod_q,
+            desc_q=desc_q,
+            claim_q=claim_q,
+            inventor=inventor,
+            manager=manager,
+            applicant=applicant,
+            app_num=app_num,
+            reg_num=reg_num,
+        )
+        status_filter: Optional[dict] = _build_status_filter(status)
         logger.debug("es_query request_id=%s query=%s", request_id, search_query)
 
-        # 하이라이팅할 필드 목록 생성
+        # 하이라이팅할 필드 목록 생성 (전문 검색 조건이 있는 경우에만)
         highlight_fields = {}
-        highlight_query = None
-        
-        # 검색 키워드가 있는 경우에만 하이라이팅 활성화
-        if tech_q or prod_q or desc_q or claim_q or inventor or manager or applicant:
+        if highlight_query:
             highlight_fields = {
                 "title.ko": {"number_of_fragments": 0},  # 전체 텍스트 하이라이팅
                 "title.en": {"number_of_fragments": 0},
@@ -332,37 +324,59 @@ async def get_patents(
                 "responsibleInventor": {"number_of_fragments": 0},  # 책임연구자
                 "applicant.name": {"number_of_fragments": 0}
             }
-            # 하이라이팅 쿼리는 검색 쿼리와 동일하게 설정
-            highlight_query = search_query
+
+        # 패싯: 캐시에 없을 때만 같은 검색 요청에 집계를 포함
+        facet_result: Optional[dict] = None
+        facet_key: Optional[str] = None
+        if facets:
+            facet_key = _facet_cache_key(search_query, status_filter)
+            facet_result = facet_cache.get(facet_key)
+            logger.debug("facet_cache request_id=%s hit=%s", request_id, facet_result is not None)
+        aggregations: Optional[dict] = (
+            _build_facet_aggregations(status_filter) if facets and facet_result is None else None
+        )
 
         # Elasticsearch 실행
         es_start_time_s: float = time.perf_counter()
-        response = await es.search(
-            index="patents",
+        response = await clients.get_elasticsearch().search(
+            index=PATENTS_ALIAS,
             query=search_query,
             from_=skip,
             size=limit,
             sort=[{"_score": "desc"}],
+            source=_build_source_filter(view),
+            aggregations=aggregations,
+            # 상태 필터는 집계 이후에 적용 (hits/total에만 반영)
+            post_filter=status_filter,
             highlight={
                 "fields": highlight_fields,
                 "pre_tags": ["<mark>"],
                 "post_tags": ["</mark>"],
-                "require_field_match": False  # 모든 필드에서 하이라이팅
+                "require_field_match": False,  # 모든 필드에서 하이라이팅
+                # filter 조건(번호/상태)은 하이라이팅 대상이 아니므로 전문 검색 조건만 사용
+                "highlight_query": highlight_query,
             } if highlight_fields else None
         )
         es_elapsed_ms: float = (time.perf_counter() - es_start_time_s) * 1000.0
+        # 서버 측 실행 시간(took)과 클라이언트 관측 시간의 차이 = 네트워크 + 직렬화 + 이벤트 루프 대기
+        metrics.es_search_client_seconds.observe(es_elapsed_ms / 1000.0, endpoint="search")
+        metrics.es_search_took_seconds.observe(response.get('took', 0) / 1000.0, endpoint="search")
 
         hits = response['hits']['hits']
         logger.debug("es_result request_id=%s hits=%d elapsed_ms=%.1f", request_id, len(hits), es_elapsed_ms)
         patents = []
         for hit in hits:
-            patent = hit['_source'].copy()
+            # _source는 응답마다 새로 파싱된 dict이므로 복사 없이 그대로 사용
+            patent = hit['_source']
             # 하이라이팅 정보 추가
             if 'highlight' in hit:
                 patent['_highlight'] = hit['highlight']
             patents.append(patent)
         
         total = response['hits']['total']['value']
+        if aggregations:
+            facet_result = _parse_facets(response.get('aggregations', {}))
+            facet_cache.set(facet_key, facet_result)
         total_elapsed_ms: float = (time.perf_counter() - start_time_s) * 1000.0
         logger.info(
             "patents_search_done request_id=%s total=%d returned=%d elapsed_ms=%.1f",
@@ -372,20 +386,65 @@ async def get_patents(
             total_elapsed_ms,
         )
 
-        return {
+        result = {
             "total": total,
             "page": page,
             "limit": limit,
             "data": patents,
             "engine": "elasticsearch"
         }
+        if facets:
+            result["facets"] = facet_result or {}
+        # _source/highlight는 이미 JSON 호환 값이므로 jsonable_encoder를 거치지 않고 바로 직렬화
+        return ORJSONResponse(result)
 
     except Exception as e:
         logger.exception("patents_search_error request_id=%s err=%r", request_id, e)
         # 에러 발생 시 500 에러 반환
         raise HTTPException(status_code=500, detail=str(e))
 
-# 서버 종료 시 연결 닫기
-@router.on_event("shutdown")
-async def shutdown_event():
-    await es.close()
\ No newline at end of file
+@router.get("/suggest")
+async def suggest_terms(
+    response: Response,
+    field: Literal["inventor", "manager", "applicant", "title"] = Query(..., description="자동완성 대상 필드"),
+    q: str = Query("", description="입력 중인 접두어"),
+    limit: int = Query(suggest_service.SUGGEST_MAX_LIMIT, ge=1, le=suggest_service.SUGGEST_MAX_LIMIT),
+):
+    """발명자/책임연구자/출원인/제목 용어 자동완성 (in-process trie, ES 조회 없음)"""
+    suggestions = suggest_service.suggest(field, q, limit)
+    # 같은 접두어 반복 입력(디바운스 재요청)은 브라우저 캐시로 처리
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return {"field": field, "q": q, "suggestions": suggestions}
+
+@router.get("/{application_number}", response_class=ORJSONResponse)
+async def get_patent_detail(application_number: str, request: Request):
+    """출원번호로 특허 1건의 전체 정보를 조회 (ETag 기반 조건부 GET 지원)"""
+    request_id: str = uuid.uuid4().hex[:10]
+    app_num: str = application_number.strip()
+    try:
+        es_start_time_s: float = time.perf_counter()
+        es_response = await clients.get_elasticsearch().search(
+            index=PATENTS_ALIAS,
+            query={"term": {"applicationNumber.keyword": app_num}},
+            size=1,
+            seq_no_primary_term=True,
+            source={"excludes": PATENT_FULL_SOURCE_EXCLUDES},
+        )
+        metrics.es_search_client_seconds.observe(time.perf_counter() - es_start_time_s, endpoint="detail")
+        metrics.es_search_took_seconds.observe(es_response.get('took', 0) / 1000.0, endpoint="detail")
+    except Exception as e:
+        logger.exception("patent_detail_error request_id=%s app_num=%r err=%r", request_id, app_num, e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    hits = es_response['hits']['hits']
+    if not hits:
+        raise HTTPException(status_code=404, detail="특허를 찾을 수 없습니다.")
+
+    hit = hits[0]
+    etag: str = _build_etag(hit)
+    cache_headers: dict[str, str] = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        logger.debug("patent_detail_not_modified request_id=%s app_num=%r", request_id, app_num)
+        return Response(status_code=304, headers=cache_headers)
+
+    return ORJSONResponse(hit['_source'], headers=cache_headers)
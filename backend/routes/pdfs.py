@@ -0,0 +1,151 @@
+"""
+특허 공보 PDF 서빙 (/static/pdfs)
+
+- FileResponse가 Range/If-Range/206/416을 처리하므로 PDF 뷰어가 필요한 부분만 점진적으로 받아간다
+  (서버가 http.response.pathsend 확장을 지원하면 파일 전송도 zero-copy로 위임된다)
+- 파일 크기 + mtime 기반 strong ETag, Cache-Control, If-None-Match → 304
+- /{filename}/thumbnail: 첫 페이지 미리보기 PNG를 만들어 디스크에 캐시 (PyMuPDF 필요)
+"""
+import asyncio
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+
+from backend.core.http_cache import etag_matches
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# PDF 경로 설정
+backend_dir: Path = Path(__file__).resolve().parent.parent
+default_pdf_dir: str = str(backend_dir / "storage" / "pdfs")
+PDF_DIR: str = os.getenv("PDF_DIR", default_pdf_dir)
+PDF_THUMBNAIL_DIR: str = os.getenv("PDF_THUMBNAIL_DIR", os.path.join(PDF_DIR, ".thumbnails"))
+PDF_THUMBNAIL_WIDTH: int = int(os.getenv("PDF_THUMBNAIL_WIDTH", "320"))
+PDF_CACHE_CONTROL: str = os.getenv("PDF_CACHE_CONTROL", "public, max-age=86400")
+# 썸네일 렌더링은 CPU 작업이므로 동시에 실행되는 개수를 제한
+PDF_THUMBNAIL_CONCURRENCY: int = int(os.getenv("PDF_THUMBNAIL_CONCURRENCY", "2"))
+
+# 폴더가 없으면 생성 (Docker/배포 환경에서 PDF를 별도로 마운트하는 경우가 많음)
+try:
+    os.makedirs(PDF_DIR, exist_ok=True)
+except Exception as e:
+    print(f"⚠️ PDF 폴더 생성 실패: {PDF_DIR} ({e})")
+
+_render_semaphore = asyncio.Semaphore(PDF_THUMBNAIL_CONCURRENCY)
+
+
+class _RenderLock:
+    """썸네일 경로별 lock + 대기 중인 요청 수 (마지막 요청이 나갈 때만 _render_locks에서 제거)"""
+
+    __slots__ = ("lock", "waiters")
+
+    def __init__(self):
+        self.lock: asyncio.Lock = asyncio.Lock()
+        self.waiters: int = 0
+
+
+_render_locks: dict[str, _RenderLock] = {}
+
+
+def _resolve_pdf_path(filename: str) -> str:
+    """경로 조작(../)을 막고 PDF_DIR 안의 .pdf 파일만 허용"""
+    if filename != os.path.basename(filename) or not filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=404, detail="PDF 파일을 찾을 수 없습니다.")
+    path: str = os.path.join(PDF_DIR, filename)
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="PDF 파일을 찾을 수 없습니다.")
+    return path
+
+
+def _file_etag(stat_result: os.stat_result) -> str:
+    """내용이 바뀌면(크기/mtime) 반드시 바뀌는 strong ETag"""
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def _cached_file_response(request: Request, path: str, media_type: str) -> Response:
+    stat_result: os.stat_result = os.stat(path)
+    etag: str = _file_etag(stat_result)
+    headers: dict[str, str] = {"ETag": etag, "Cache-Control": PDF_CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        path,
+        media_type=media_type,
+        headers=headers,
+        stat_result=stat_result,
+        content_disposition_type="inline",
+    )
+
+
+def _render_first_page_png(pdf_path: str, output_path: str, width: int) -> None:
+    import fitz  # PyMuPDF (썸네일 요청 시에만 로드)
+
+    # 고유한 임시 파일에 쓴 뒤 원자적으로 교체 → 다른 워커/스레드와 겹쳐도 반쯤 쓰인 파일을 읽지 않는다
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path), suffix=".tmp.png")
+    os.close(fd)
+    try:
+        with fitz.open(pdf_path) as doc:
+            page = doc.load_page(0)
+            zoom: float = width / page.rect.width if page.rect.width else 1.0
+            pixmap = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            pixmap.save(tmp_path)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _is_thumbnail_fresh(pdf_path: str, thumbnail_path: str) -> bool:
+    try:
+        return os.stat(thumbnail_path).st_mtime_ns >= os.stat(pdf_path).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+@router.get("/{filename}/thumbnail")
+async def get_pdf_thumbnail(filename: str, request: Request):
+    """첫 페이지 미리보기 PNG (최초 요청 시 생성 후 디스크 캐시)"""
+    pdf_path: str = _resolve_pdf_path(filename)
+    thumbnail_path: str = os.path.join(PDF_THUMBNAIL_DIR, f"{os.path.splitext(filename)[0]}.png")
+
+    if not _is_thumbnail_fresh(pdf_path, thumbnail_path):
+        render_lock: _RenderLock | None = _render_locks.get(thumbnail_path)
+        if render_lock is None:
+            render_lock = _render_locks[thumbnail_path] = _RenderLock()
+        render_lock.waiters += 1
+        try:
+            async with render_lock.lock:
+                # 같은 파일을 기다리던 요청은 앞 요청이 만든 결과를 그대로 사용
+                if not _is_thumbnail_fresh(pdf_path, thumbnail_path):
+                    os.makedirs(PDF_THUMBNAIL_DIR, exist_ok=True)
+                    async with _render_semaphore:
+                        try:
+                            await run_in_threadpool(_render_first_page_png, pdf_path, thumbnail_path, PDF_THUMBNAIL_WIDTH)
+                        except ImportError:
+                            raise HTTPException(status_code=501, detail="썸네일 생성을 위해 PyMuPDF가 필요합니다.")
+                        except Exception as e:
+                            logger.exception("pdf_thumbnail_render_failed file=%s err=%r", filename, e)
+                            raise HTTPException(status_code=500, detail="썸네일 생성에 실패했습니다.")
+        finally:
+            # 성공/실패와 관계없이, 기다리는 요청이 더 없을 때만 제거 (남은 대기자와 새 요청이 같은 lock을 쓰도록)
+            render_lock.waiters -= 1
+            if render_lock.waiters == 0:
+                _render_locks.pop(thumbnail_path, None)
+
+    return _cached_file_response(request, thumbnail_path, "image/png")
+
+
+@router.api_route("/{filename}", methods=["GET", "HEAD"])
+async def get_pdf(filename: str, request: Request):
+    """PDF 원본 (Range 요청 시 206 부분 응답)"""
+    pdf_path: str = _resolve_pdf_path(filename)
+    return _cached_file_response(request, pdf_path, "application/pdf")
@@ -1,11 +1,24 @@
+import hashlib
+import json
 import os
+import sys
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 import pymongo
 from pymongo import UpdateOne
 from bson import ObjectId
 from dotenv import load_dotenv
 from tqdm import tqdm
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk 
+
+# `python backend/scripts/transform_patents.py`로 직접 실행해도 backend 패키지를 import할 수 있도록 루트 경로 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+from backend.services.es_bulk import BulkIndexer
+from backend.services.es_index import build_es_document, ensure_patents_index
 
 # 1. 환경 설정 및 DB 연결
 def get_db(db_name=None, use_cloud=False):
@@ -158,8 +171,257 @@ def transform_raw_to_service(raw):
         print(f"Error processing {raw.get('applicationNumber')}: {e}")
         return None
 
+# 2. 스트리밍 변환 파이프라인
+#   [커서 배치 읽기] → [프로세스 풀 변환] → (bounded queue) → [MongoDB bulk_write 스레드]
+#                                          → (bounded queue) → [Elasticsearch BulkIndexer 스레드]
+# 어느 단계든 느려지면 앞 단계가 큐에서 대기하므로 메모리 사용량은 코퍼스 크기와 무관하게 일정하다.
+TRANSFORM_BATCH_SIZE = int(os.getenv("TRANSFORM_BATCH_SIZE", "500"))
+TRANSFORM_WORKERS = int(os.getenv("TRANSFORM_WORKERS", str(os.cpu_count() or 1)))
+TRANSFORM_QUEUE_SIZE = int(os.getenv("TRANSFORM_QUEUE_SIZE", "8"))
+
+_SINK_DONE = object()
+
+
+def compute_content_hash(data):
+    """변환된 서비스 문서의 내용 해시 (키 순서와 무관한 정규화 JSON 기준)"""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def transform_batch(raws):
+    """프로세스 풀 작업 단위: 원본 배치를 서비스 문서 목록으로 변환 (contentHash 포함)"""
+    results = []
+    for raw in raws:
+        data = transform_raw_to_service(raw)
+        if data:
+            data["contentHash"] = compute_content_hash(data)
+            results.append(data)
+    return results
+
+
+ES_HASH_BATCH_SIZE = int(os.getenv("ES_HASH_BATCH_SIZE", "1000"))
+
+
+def load_existing_hashes(service_col):
+    """
+    이미 저장된 서비스 문서의 applicationNumber → (contentHash, esContentHash)
+    contentHash는 MongoDB에 저장된 내용, esContentHash는 Elasticsearch 색인이 확인된 내용의 해시
+    """
+    cursor = service_col.find({}, {"_id": 0, "applicationNumber": 1, "contentHash": 1, "esContentHash": 1})
+    return {
+        doc["applicationNumber"]: (doc.get("contentHash"), doc.get("esContentHash"))
+        for doc in cursor
+        if doc.get("applicationNumber")
+    }
+
+
+def save_es_hashes(service_col, es_hashes, batch_size=ES_HASH_BATCH_SIZE):
+    """
+    색인이 확인된 문서의 esContentHash 기록.
+    updatedAt은 건드리지 않는다 (sync_es 워터마크가 이 기록 때문에 다시 돌지 않도록).
+    """
+    items = list(es_hashes.items())
+    for start in range(0, len(items), batch_size):
+        service_col.bulk_write([
+            UpdateOne({"applicationNumber": app_num}, {"$set": {"esContentHash": content_hash}})
+            for app_num, content_hash in items[start:start + batch_size]
+        ], ordered=False)
+
+
+def _iter_raw_batches(raw_col, batch_size):
+    batch = []
+    for raw in raw_col.find({}, batch_size=batch_size):
+        batch.append(raw)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _SinkThread(threading.Thread):
+    """bounded queue에서 변환된 배치를 꺼내 저장하는 소비자 스레드"""
+
+    def __init__(self, name, handle_batch, queue_size):
+        super().__init__(name=name, daemon=True)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.handle_batch = handle_batch
+        self.error = None
+
+    def run(self):
+        while True:
+            batch = self.queue.get()
+            if batch is _SINK_DONE:
+                return
+            if self.error is not None:
+                continue  # 오류 이후에는 큐만 비워 생산자가 막히지 않도록 한다
+            try:
+                self.handle_batch(batch)
+            except Exception as e:
+                self.error = e
+
+    def put(self, batch):
+        if self.error is not None:
+            raise RuntimeError(f"{self.name} 단계 실패: {self.error}") from self.error
+        self.queue.put(batch)
+
+    def finish(self):
+        self.queue.put(_SINK_DONE)
+        self.join()
+        if self.error is not None:
+            raise RuntimeError(f"{self.name} 단계 실패: {self.error}") from self.error
+
+
+def run_transform_pipeline(raw_col, service_col, es=None, es_index_name=None,
+                           batch_size=TRANSFORM_BATCH_SIZE, workers=TRANSFORM_WORKERS,
+                           queue_size=TRANSFORM_QUEUE_SIZE, force=False):
+    """
+    원본 컬렉션을 스트리밍으로 변환해 MongoDB(+Elasticsearch)에 저장하고 처리 통계를 반환.
+    저장소마다 마지막으로 반영된 해시(MongoDB: contentHash, Elasticsearch: esContentHash)와 비교해
+    같은 특허는 건너뛰므로 재실행 비용은 변경분에 비례한다 (force=True면 전체 저장).
+    한쪽 저장소만 실패한 특허는 다음 실행에서 그 저장소에만 다시 저장된다.
+    """
+    es_enabled = es is not None
+    stats = {"raw": 0, "transformed": 0, "new": 0, "changed": 0, "unchanged": 0, "missing": 0, "es_stale": 0}
+    # force여도 기존 해시는 읽는다 (저장은 전체, 신규/변경/원본에 없음 통계는 그대로 정확하게)
+    existing_hashes = load_existing_hashes(service_col)
+    seen_app_numbers = set()
+    changed_samples = []
+    # ES 전송 중인 문서의 해시 → 색인이 확인되면 es_acked로 옮겨 종료 후 esContentHash로 기록
+    es_sent_hashes = {}
+    es_acked_hashes = {}
+    es_hash_lock = threading.Lock()
+
+    def write_mongo(batch):
+        # updatedAt은 sync_es 증분 동기화(워터마크 모드)의 기준 시각
+        service_col.bulk_write([
+            UpdateOne(
+                {"applicationNumber": data["applicationNumber"]},
+                {"$set": data, "$currentDate": {"updatedAt": True}},
+                upsert=True,
+            )
+            for data in batch
+        ], ordered=False)
+
+    with ExitStack() as stack:
+        sinks = [_SinkThread("mongo-sink", write_mongo, queue_size)]
+        es_indexer = None
+        if es_enabled:
+            def on_es_indexed(doc_ids):
+                with es_hash_lock:
+                    for doc_id in doc_ids:
+                        if doc_id in es_sent_hashes:
+                            es_acked_hashes[doc_id] = es_sent_hashes.pop(doc_id)
+
+            # 서비스 중인 alias에 바로 쓰므로 refresh/replica 설정은 건드리지 않는다
+            # (대량 재적재는 새 인덱스에 적재 후 alias를 교체하는 sync_es.py --clear 사용)
+            es_indexer = stack.enter_context(BulkIndexer(es, on_success=on_es_indexed))
+
+            def write_es(batch):
+                # _id는 sync_es와 동일하게 applicationNumber, 배치는 BulkIndexer가 크기 기준으로 분할
+                for data in batch:
+                    doc_id, es_doc = build_es_document(data)
+                    with es_hash_lock:
+                        es_sent_hashes[doc_id] = data["contentHash"]
+                    es_indexer.add({"_index": es_index_name, "_id": doc_id, "_source": es_doc})
+
+            sinks.append(_SinkThread("es-sink", write_es, queue_size))
+        for sink in sinks:
+            sink.start()
+
+        in_flight = deque()
+        progress = None
+
+        def drain_one():
+            batch_size_raw, future = in_flight.popleft()
+            transformed = future.result()
+            stats["transformed"] += len(transformed)
+            progress.update(batch_size_raw)
+
+            # 저장소별로 마지막 반영 해시와 다른 특허만 전달 (force면 변경 없는 특허도 다시 저장)
+            to_mongo = []
+            to_es = []
+            for data in transformed:
+                app_num = data["applicationNumber"]
+                seen_app_numbers.add(app_num)
+                mongo_hash, es_hash = existing_hashes.get(app_num, (None, None))
+                if app_num not in existing_hashes:
+                    stats["new"] += 1
+                elif mongo_hash != data["contentHash"]:
+                    stats["changed"] += 1
+                    if len(changed_samples) < 10:
+                        changed_samples.append(app_num)
+                else:
+                    stats["unchanged"] += 1
+                    if es_enabled and es_hash != data["contentHash"]:
+                        # MongoDB는 최신인데 이전 실행에서 ES 색인이 실패/누락된 특허
+                        stats["es_stale"] += 1
+                if force or mongo_hash != data["contentHash"]:
+                    to_mongo.append(data)
+                if es_enabled and (force or es_hash != data["contentHash"]):
+                    to_es.append(data)
+            if to_mongo:
+                sinks[0].put(to_mongo)
+            if to_es:
+                sinks[1].put(to_es)
+
+        pipeline_error = None
+        try:
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=max(1, workers)))
+            progress = tqdm(total=raw_col.estimated_document_count(), desc="변환 및 저장 중")
+            for raws in _iter_raw_batches(raw_col, batch_size):
+                stats["raw"] += len(raws)
+                in_flight.append((len(raws), executor.submit(transform_batch, raws)))
+                # 변환 대기 배치 수 제한 (커서를 앞서 읽어 메모리에 쌓지 않도록)
+                if len(in_flight) >= max(1, workers) * 2:
+                    drain_one()
+            while in_flight:
+                drain_one()
+        except BaseException as e:
+            pipeline_error = e
+            raise
+        finally:
+            if progress is not None:
+                progress.close()
+            # 한 sink가 실패해도 나머지 sink 스레드/BulkIndexer는 끝까지 flush하고 종료한다
+            finish_errors = []
+            for sink in sinks:
+                try:
+                    sink.finish()
+                except Exception as e:
+                    finish_errors.append(e)
+            if finish_errors:
+                if pipeline_error is None:
+                    raise finish_errors[0]
+                # 원래 예외를 가리지 않도록 sink 오류는 출력만 한다
+                for e in finish_errors:
+                    print(f"⚠️  {e}")
+
+    # ExitStack 종료로 BulkIndexer까지 모두 flush된 뒤: 바로 검색되도록 refresh, 색인이 확인된 문서만 esContentHash 기록
+    if es_enabled:
+        es.indices.refresh(index=es_index_name)
+    if es_acked_hashes:
+        save_es_hashes(service_col, es_acked_hashes)
+
+    # 원본에는 더 이상 없는 서비스 문서 (삭제는 하지 않고 보고만 한다)
+    stats["missing"] = len(existing_hashes.keys() - seen_app_numbers)
+    stats["changed_samples"] = changed_samples
+    if es_indexer is not None:
+        stats["es_indexed"] = es_indexer.success_count
+        stats["es_failed"] = len(es_indexer.errors)
+    return stats
+
+
+def _get_int_arg(name, default):
+    """`--name 값` 형태의 정수 인자 (없으면 기본값)"""
+    if name in sys.argv:
+        idx = sys.argv.index(name)
+        if idx + 1 < len(sys.argv):
+            return int(sys.argv[idx + 1])
+    return default
+
+
 if __name__ == "__main__":
-    import sys
     
     # 명령줄 인자로 클라우드 사용 여부 확인
     use_cloud = "--cloud" in sys.argv or "-c" in sys.argv
@@ -296,64 +558,40 @@ if __name__ == "__main__":
     # Elasticsearch 클라이언트 초기화
     es = get_es_client()
     es_enabled = es is not None
+    # 동적 매핑에 의존하지 않도록 명시적 매핑 인덱스(alias)를 먼저 보장
+    es_index_name = ensure_patents_index(es) if es_enabled else None
     
-    docs = list(raw_col.find())
-    print(f"🚀 [필드 정정] 데이터 이관 시작 ({len(docs)}건)...")
+    batch_size = _get_int_arg("--batch-size", TRANSFORM_BATCH_SIZE)
+    workers = _get_int_arg("--workers", TRANSFORM_WORKERS)
+    force = "--force" in sys.argv
+    print(f"🚀 [필드 정정] 데이터 이관 시작 (배치 {batch_size}건, 변환 프로세스 {workers}개)...")
     if es_enabled:
         print("📡 Elasticsearch 동기화 활성화됨")
-    
-    ops = []
-    es_actions = []  # Elasticsearch bulk actions
-    es_count = 0
-    
-    for raw in tqdm(docs, desc="변환 및 저장 중"):
-        data = transform_raw_to_service(raw)
-        if data:
-            # MongoDB 저장 준비
-            ops.append(UpdateOne({"applicationNumber": data["applicationNumber"]}, {"$set": data}, upsert=True))
-            
-            # Elasticsearch 인덱싱 준비
-            if es_enabled:
-                # _id를 applicationNumber로 사용 (또는 MongoDB _id 사용 가능)
-                doc_id = str(data.get("rawRef") or data["applicationNumber"])
-                # rawRef를 문자열로 변환
-                es_doc = data.copy()
-                if "rawRef" in es_doc:
-                    es_doc["rawRef"] = str(es_doc["rawRef"])
-                
-                es_actions.append({
-                    "_index": "patents",
-                    "_id": doc_id,
-                    "_source": es_doc
-                })
-            
-            # MongoDB bulk write (500개마다)
-            if len(ops) >= 500:
-                service_col.bulk_write(ops)
-                ops = []
-            
-            # Elasticsearch bulk index (500개마다)
-            if es_enabled and len(es_actions) >= 500:
-                success, failed = bulk(es, es_actions, raise_on_error=False)
-                es_count += success
-                if failed:
-                    print(f"⚠️  Elasticsearch 인덱싱 실패: {len(failed)}건")
-                es_actions = []
-
-    # 남은 데이터 처리
-    if ops: 
-        service_col.bulk_write(ops)
-    
+
+    stats = run_transform_pipeline(
+        raw_col,
+        service_col,
+        es=es,
+        es_index_name=es_index_name,
+        batch_size=batch_size,
+        workers=workers,
+        force=force,
+    )
+    print(f"📊 원본 {stats['raw']}건 → 변환 {stats['transformed']}건")
+    print(
+        f"📊 변경 요약: 신규 {stats['new']}건, 변경 {stats['changed']}건, "
+        f"변경 없음 {stats['unchanged']}건, 원본에 없음 {stats['missing']}건"
+    )
+    if stats["es_stale"]:
+        print(f"   Elasticsearch에만 다시 색인한 특허: {stats['es_stale']}건 (이전 색인 실패/누락분)")
+    if stats["changed_samples"]:
+        print(f"   변경된 출원번호 예시: {', '.join(stats['changed_samples'])}")
+    if stats["unchanged"] and not force:
+        print("   (변경 없는 특허는 건너뜀 - Elasticsearch 전체 재색인은 sync_es.py --clear 사용)")
     if es_enabled:
-        if es_actions:
-            success, failed = bulk(es, es_actions, raise_on_error=False)
-            es_count += success
-            if failed:
-                print(f"⚠️  Elasticsearch 인덱싱 실패: {len(failed)}건")
-        
-        # 인덱스 새로고침 (검색 가능하도록)
-        es.indices.refresh(index="patents")
-        print(f"✅ Elasticsearch 동기화 완료: {es_count}건 인덱싱됨")
+        if stats["es_failed"]:
+            print(f"⚠️  Elasticsearch 인덱싱 실패: {stats['es_failed']}건")
+        print(f"✅ Elasticsearch 동기화 완료: {stats['es_indexed']}건 인덱싱됨")
     
     print("\n✅ MongoDB 이관 완료! 이제 모달에서 요약과 청구항이 완벽히 분리되어 보입니다.")
     if es_enabled:
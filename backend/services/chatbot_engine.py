@@ -3,7 +3,8 @@ from datetime import datetime, timedelta
 import time
 import os
 import logging
-from motor.motor_asyncio import AsyncIOMotorClient
+from backend.core import tracing
+from backend.database import db_manager
 from backend.services import search_service
 
 
@@ -14,13 +15,9 @@ class ChatbotEngine:
         # initialize_data()  # search_service의 함수 호출
         
         # MongoDB 설정
-        self.mongo_uri = os.getenv("MONGO_URI")
-        self.db_name = os.getenv("DB_NAME")
         self.chat_history_ttl_days = int(os.getenv("CHAT_HISTORY_TTL_DAYS", "30"))
-        
-        # MongoDB 클라이언트
-        self.client = AsyncIOMotorClient(self.mongo_uri)
-        self.db = self.client[self.db_name]
+        # 메시지 버킷 하나에 담는 최대 메시지 수 (세션 문서가 무한히 커지지 않도록 분할 저장)
+        self.chat_bucket_size = int(os.getenv("CHAT_MESSAGE_BUCKET_SIZE", "50"))
         
         # 로거
         self.logger = logging.getLogger(__name__)
@@ -28,13 +25,18 @@ class ChatbotEngine:
         # 인덱스 생성 플래그
         self._indexes_ensured = False
     
+    @property
+    def db(self):
+        """db_manager와 같은 Motor 클라이언트(연결 풀)를 사용"""
+        return db_manager.db
+
     async def _ensure_indexes_once(self):
         """인덱스를 한 번만 생성"""
         if not self._indexes_ensured:
             await self._ensure_chat_history_indexes()
             self._indexes_ensured = True
     
-    async def answer(self, query: str, session_id: Optional[str] = None) -> dict:
+    async def answer(self, query: str, session_id: Optional[str] = None, request_id: Optional[str] = None) -> dict:
         """답변 생성 및 MongoDB에 저장"""
         await self._ensure_indexes_once()
         
@@ -43,23 +45,78 @@ class ChatbotEngine:
         # 세션 ID 생성
         if not session_id:
             session_id = str(uuid.uuid4())
+
+        # 이 요청의 모든 단계 span에 같은 request_id가 붙는다
+        request_id = tracing.start_request(request_id)
+        with tracing.span("chat.answer", session_id=session_id) as root:
+            # 직전 턴(질문/답변/검색된 출원번호): "그 중 두 번째 특허는?" 같은 후속 질문에 재사용
+            previous_turn = await self.get_last_turn(session_id)
+
+            # RAG 답변 생성
+            result = await search_service.hybrid_rag_answer_with_retrieval(query, top_k=10, previous_turn=previous_turn)
+            answer = result["answer"]
+            root.set_attributes(mode=result["mode"], docs=len(result["app_numbers"]))
             
-        # RAG 답변 생성
-        answer = await search_service.hybrid_rag_answer(query, top_k=10)
-        
-        # MongoDB에 저장
-        await self.save_message(session_id, query, answer)
+            # MongoDB에 저장
+            with tracing.span("chat.mongo_save"):
+                await self.save_message(session_id, query, answer, retrieval=result)
         
         return {
             "answer": answer,
-            "session_id": session_id
+            "session_id": session_id,
+            "request_id": request_id,
         }
     
-    async def save_message(self, session_id: str, user_query: str, ai_answer: str) -> None:
-        """메시지를 MongoDB에 저장"""
+    async def get_last_turn(self, session_id: str) -> Optional[Dict]:
+        """세션의 직전 턴 {query, answer, app_numbers} (없으면 None)"""
         collection = self.db["chat_history"]
+        doc = await collection.find_one({"session_id": session_id}, {"_id": 0, "last_turn": 1})
+        last_turn = doc.get("last_turn") if doc else None
+        return last_turn if isinstance(last_turn, dict) and last_turn.get("app_numbers") else None
+
+    async def save_message(
+        self,
+        session_id: str,
+        user_query: str,
+        ai_answer: str,
+        retrieval: Optional[Dict] = None,
+    ) -> None:
+        """
+        메시지를 MongoDB에 저장
+        - chat_history: 세션 메타데이터 (제목, 갱신 시각, 메시지 수, 직전 턴)
+        - chat_message_buckets: 메시지를 최대 chat_bucket_size개씩 나눠 담는 버킷 문서
+        - retrieval: 답변에 사용한 출원번호/검색 경로. 컨텍스트 본문은 저장하지 않고
+          후속 질문 시 메모리의 코퍼스 텍스트 인덱스(search_service.corpus.text_index)에서 다시 꺼낸다 (버킷 크기 유지)
+        """
+        collection = self.db["chat_history"]
+        buckets = self.db["chat_message_buckets"]
         now_dt: datetime = datetime.utcnow()
+        expires_at: datetime = now_dt + timedelta(days=self.chat_history_ttl_days)
         title: str = (user_query[:25] + "...") if len(user_query) > 25 else user_query
+        # 커서 페이지네이션 기준이므로 같은 턴의 두 메시지도 timestamp가 겹치지 않게 한다
+        user_ts: float = time.time()
+        assistant_ts: float = user_ts + 0.001
+        new_messages: List[Dict] = [
+            {"role": "user", "content": user_query, "timestamp": user_ts},
+            {"role": "assistant", "content": ai_answer, "timestamp": assistant_ts},
+        ]
+        session_set: Dict = {
+            "updated_at": now_dt,
+            # TTL 마지막 활동 후 N일 후 만료
+            "expires_at": expires_at,
+        }
+        if retrieval is not None:
+            retrieval_meta: Dict = {
+                "app_numbers": retrieval.get("app_numbers") or [],
+                "sources": retrieval.get("sources") or [],
+                "mode": retrieval.get("mode"),
+            }
+            new_messages[1]["retrieval"] = retrieval_meta
+            session_set["last_turn"] = {
+                "query": user_query,
+                "answer": ai_answer,
+                "app_numbers": retrieval_meta["app_numbers"],
+            }
         
         await collection.update_one(
             {"session_id": session_id},
@@ -69,23 +126,30 @@ class ChatbotEngine:
                     "created_at": now_dt,
                     "title": title,
                 },
-                "$push": {
-                    "messages": {
-                        "$each": [
-                        {"role": "user", "content": user_query, "timestamp": time.time()},
-                        {"role": "assistant", "content": ai_answer, "timestamp": time.time()},
-                        ]
-                    }
-                },
-                "$set": {
-                    "updated_at": now_dt,
-                    # TTL 마지막 활동 후 N일 후 만료
-                    "expires_at": now_dt + timedelta(days=self.chat_history_ttl_days),
-                },
+                "$inc": {"message_count": len(new_messages)},
+                "$set": session_set,
             },
             upsert=True,
         )
 
+        # 아직 여유가 있는 최신 버킷에 추가하고, 없으면 새 버킷 생성
+        await buckets.update_one(
+            {"session_id": session_id, "count": {"$lte": self.chat_bucket_size - len(new_messages)}},
+            {
+                "$push": {"messages": {"$each": new_messages}},
+                "$inc": {"count": len(new_messages)},
+                "$min": {"first_ts": user_ts},
+                "$max": {"last_ts": assistant_ts},
+                "$set": {"expires_at": expires_at},
+            },
+            upsert=True,
+        )
+        # 이전 버킷들의 만료 시각은 하루 이상 뒤처졌을 때만 갱신 (매 저장마다 전체 갱신하지 않음)
+        await buckets.update_many(
+            {"session_id": session_id, "expires_at": {"$lt": expires_at - timedelta(days=1)}},
+            {"$set": {"expires_at": expires_at}},
+        )
+
     async def get_all_session(self, limit: int = 100) -> list:
         """모든 세션 목록(MongoDB)"""
         collection = self.db["chat_history"]
@@ -94,30 +158,61 @@ class ChatbotEngine:
             .sort("updated_at", -1)
             .limit(limit)
         )
-        sessions = await cursor.to_list(length=limit)
-        
-        # updated_at을 timestamp로 변환
-        for session in sessions:
-            if "updated_at" in session and isinstance(session["updated_at"], datetime):
-                session["updated_at"] = int(session["updated_at"].timestamp() * 1000)
-                
-        return sessions
+        # updated_at(datetime)은 응답 직렬화(core.json_response)에서 epoch milliseconds로 변환
+        return await cursor.to_list(length=limit)
 
     async def get_chat_history(self, session_id: str) -> list:
-        """특정 세션의 대화 내역(MongoDB)"""
-        collection = self.db["chat_history"]
-        doc = await collection.find_one(
-            {"session_id": session_id},
-            {"_id": 0, "messages": 1}
-        )
-        
-        messages = doc.get("messages") if doc else None
-        return messages if isinstance(messages, list) else []
+        """특정 세션의 전체 대화 내역(MongoDB) - 오래된 메시지부터"""
+        page = await self.get_chat_messages(session_id, limit=0)
+        return page["messages"]
+
+    async def get_chat_messages(self, session_id: str, limit: int = 50, before: Optional[float] = None) -> dict:
+        """
+        최신 메시지부터 limit개씩 가져오는 커서 페이지네이션 (limit=0이면 전체)
+        - before: 이 timestamp보다 이전 메시지만 (이전 페이지의 next_before 값)
+        - 반환되는 messages는 화면 표시 순서(오래된 → 최신)
+        """
+        buckets = self.db["chat_message_buckets"]
+        query: Dict = {"session_id": session_id}
+        if before is not None:
+            query["first_ts"] = {"$lt": before}
+
+        collected: List[Dict] = []
+        cursor = buckets.find(query, {"_id": 0, "messages": 1}).sort("first_ts", -1)
+        async for bucket in cursor:
+            messages = bucket.get("messages") or []
+            if before is not None:
+                messages = [m for m in messages if m.get("timestamp", 0) < before]
+            collected = messages + collected
+            if limit and len(collected) > limit:
+                break
+
+        # 버킷 도입 이전 세션: 세션 문서에 남아있는 messages 배열 (버킷 메시지보다 항상 오래됨)
+        if not limit or len(collected) <= limit:
+            collection = self.db["chat_history"]
+            doc = await collection.find_one(
+                {"session_id": session_id, "messages.0": {"$exists": True}},
+                {"_id": 0, "messages": 1},
+            )
+            legacy = doc.get("messages") if doc else None
+            if isinstance(legacy, list):
+                if before is not None:
+                    legacy = [m for m in legacy if m.get("timestamp", 0) < before]
+                collected = legacy + collected
+
+        has_more: bool = bool(limit) and len(collected) > limit
+        page = collected[-limit:] if limit else collected
+        return {
+            "messages": page,
+            "has_more": has_more,
+            "next_before": page[0].get("timestamp") if has_more and page else None,
+        }
 
     async def delete_session(self, session_id: str) -> bool:
-        """세션 삭제"""
+        """세션 삭제 (메시지 버킷 포함)"""
         collection = self.db["chat_history"]
         result = await collection.delete_one({"session_id": session_id})
+        await self.db["chat_message_buckets"].delete_many({"session_id": session_id})
         return bool(getattr(result, "deleted_count", 0))
 
     async def _ensure_chat_history_indexes(self) -> None:
@@ -125,6 +220,7 @@ class ChatbotEngine:
         MongoDB 인덱스 생성:
         - session_id: 빠른 조회
         - expires_at: TTL 자동 삭제
+        - chat_message_buckets (session_id, first_ts): 최신 메시지부터 페이지 조회
         """
         try:
             collection = self.db["chat_history"]
@@ -142,6 +238,18 @@ class ChatbotEngine:
                 name="chat_history_expires_at_ttl",
             )
             
+            # 메시지 버킷: 세션별 최신 버킷 조회 + TTL
+            buckets = self.db["chat_message_buckets"]
+            await buckets.create_index(
+                [("session_id", 1), ("first_ts", -1)],
+                name="chat_message_buckets_session_first_ts_idx",
+            )
+            await buckets.create_index(
+                [("expires_at", 1)],
+                expireAfterSeconds=0,
+                name="chat_message_buckets_expires_at_ttl",
+            )
+            
             self.logger.info("✅ MongoDB indexes created successfully")
         except Exception as e:
             self.logger.debug("chatbot_engine_chat_history_index_create_failed err=%r", e)
@@ -0,0 +1,217 @@
+"""
+Elasticsearch 병렬 bulk 색인기 (sync_es.py / transform_patents.py 공용)
+
+- 문서 수가 아닌 직렬화된 바이트 크기 기준으로 배치를 나눈다 (긴 청구항 문서가 섞여도 요청 크기가 일정)
+- 배치를 여러 스레드에서 동시에 전송하고, 대기 중인 배치 수를 제한해 메모리를 일정하게 유지
+- 429(큐 포화) 응답은 해당 문서만 지수 백오프로 재시도
+- on_success 콜백으로 실제로 반영된 문서 _id를 받을 수 있다 (색인 결과를 원본 쪽에 기록할 때)
+- bulk_load_settings: 적재 동안 refresh_interval=-1, number_of_replicas=0 으로 두고 끝나면 원래 값으로 복원
+  (아직 alias 뒤에 있지 않은 새 인덱스 전용 - 서비스 중인 인덱스에 쓰면 적재 동안 검색 결과가 갱신되지 않고 복제본이 사라진다)
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterable, List, Optional
+
+from elasticsearch import ApiError
+from elasticsearch.helpers import expand_action
+from elasticsearch.serializer import JsonSerializer
+
+logger = logging.getLogger(__name__)
+
+ES_BULK_THREADS: int = int(os.getenv("ES_BULK_THREADS", "4"))
+ES_BULK_MAX_BYTES: int = int(os.getenv("ES_BULK_MAX_BYTES", str(8 * 1024 * 1024)))
+ES_BULK_MAX_DOCS: int = int(os.getenv("ES_BULK_MAX_DOCS", "5000"))
+ES_BULK_MAX_RETRIES: int = int(os.getenv("ES_BULK_MAX_RETRIES", "5"))
+ES_BULK_INITIAL_BACKOFF_S: float = float(os.getenv("ES_BULK_INITIAL_BACKOFF_S", "1.0"))
+
+_serializer = JsonSerializer()
+
+
+def _dumps(obj) -> bytes:
+    data = _serializer.dumps(obj)
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+class BulkIndexer:
+    """
+    사용 예:
+        with BulkIndexer(es) as indexer:
+            for action in actions:
+                indexer.add(action)
+        print(indexer.success_count, len(indexer.errors))
+
+    action은 elasticsearch.helpers.bulk와 같은 형식
+    ({"_op_type": "index" | "update" | "delete", "_index", "_id", "_source" | "doc"})
+    """
+
+    def __init__(
+        self,
+        es,
+        thread_count: int = ES_BULK_THREADS,
+        max_chunk_bytes: int = ES_BULK_MAX_BYTES,
+        max_chunk_docs: int = ES_BULK_MAX_DOCS,
+        max_retries: int = ES_BULK_MAX_RETRIES,
+        initial_backoff_s: float = ES_BULK_INITIAL_BACKOFF_S,
+        max_pending_chunks: Optional[int] = None,
+        on_success: Optional[Callable[[List[str]], None]] = None,
+    ):
+        self.es = es
+        self.max_chunk_bytes: int = max_chunk_bytes
+        self.max_chunk_docs: int = max_chunk_docs
+        self.max_retries: int = max_retries
+        self.initial_backoff_s: float = initial_backoff_s
+        # 배치마다 성공한 문서 _id 목록으로 호출 (전송 스레드에서 호출되므로 스레드 안전해야 함)
+        self.on_success: Optional[Callable[[List[str]], None]] = on_success
+        self._executor = ThreadPoolExecutor(max_workers=max(1, thread_count), thread_name_prefix="es-bulk")
+        self._pending = threading.BoundedSemaphore(max_pending_chunks or max(1, thread_count) * 2)
+        self._lock = threading.Lock()
+        self._futures: list = []
+        self._chunk: List[tuple[bytes, Optional[bytes]]] = []
+        self._chunk_bytes: int = 0
+        self.success_count: int = 0
+        self.retry_count: int = 0
+        self.errors: List[dict] = []
+
+    # ---------- 입력 ----------
+    def add(self, action: dict) -> None:
+        op, data = expand_action(action)
+        op_line: bytes = _dumps(op)
+        data_line: Optional[bytes] = _dumps(data) if data is not None else None
+        size: int = len(op_line) + 1 + (len(data_line) + 1 if data_line is not None else 0)
+        if self._chunk and (
+            self._chunk_bytes + size > self.max_chunk_bytes or len(self._chunk) >= self.max_chunk_docs
+        ):
+            self._submit_chunk()
+        self._chunk.append((op_line, data_line))
+        self._chunk_bytes += size
+
+    def add_many(self, actions: Iterable[dict]) -> None:
+        for action in actions:
+            self.add(action)
+
+    def flush(self) -> None:
+        if self._chunk:
+            self._submit_chunk()
+
+    def close(self) -> None:
+        self.flush()
+        for future in self._futures:
+            future.result()
+        self._futures = []
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "BulkIndexer":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------- 전송 ----------
+    def _submit_chunk(self) -> None:
+        chunk = self._chunk
+        self._chunk = []
+        self._chunk_bytes = 0
+        # 전송 대기 배치 수를 제한 (생산자가 ES보다 빠를 때 메모리 무한 증가 방지)
+        self._pending.acquire()
+        future = self._executor.submit(self._send_with_retry, chunk)
+        future.add_done_callback(lambda _: self._pending.release())
+        self._futures = [f for f in self._futures if not f.done()]
+        self._futures.append(future)
+
+    def _send_with_retry(self, chunk: List[tuple[bytes, Optional[bytes]]]) -> None:
+        backoff_s: float = self.initial_backoff_s
+        for attempt in range(self.max_retries + 1):
+            is_last_attempt: bool = attempt >= self.max_retries
+            lines: List[bytes] = []
+            for op_line, data_line in chunk:
+                lines.append(op_line)
+                if data_line is not None:
+                    lines.append(data_line)
+            try:
+                response = self.es.bulk(operations=lines)
+            except ApiError as e:
+                # 요청 전체가 429로 거절된 경우 배치 전체를 재시도
+                if e.meta.status == 429 and not is_last_attempt:
+                    self._record_retry(len(chunk))
+                    time.sleep(backoff_s)
+                    backoff_s *= 2
+                    continue
+                self._record_errors([{"error": str(e), "status": e.meta.status}] * len(chunk))
+                return
+            except Exception as e:
+                # 연결 오류 등: 배치 전체를 실패로 기록하고 나머지 배치는 계속 진행
+                logger.warning("es_bulk_chunk_failed docs=%d err=%r", len(chunk), e)
+                self._record_errors([{"error": repr(e)}] * len(chunk))
+                return
+
+            retry_chunk: List[tuple[bytes, Optional[bytes]]] = []
+            succeeded: int = 0
+            succeeded_ids: List[str] = []
+            failed: List[dict] = []
+            for item, pair in zip(response.get("items", []), chunk):
+                op_type, result = next(iter(item.items()))
+                status: int = result.get("status", 500)
+                if 200 <= status < 300 or (op_type == "delete" and status == 404):
+                    succeeded += 1
+                    succeeded_ids.append(result.get("_id"))
+                elif status == 429 and not is_last_attempt:
+                    retry_chunk.append(pair)
+                else:
+                    failed.append({op_type: result})
+
+            with self._lock:
+                self.success_count += succeeded
+            if self.on_success is not None and succeeded_ids:
+                self.on_success(succeeded_ids)
+            if failed:
+                self._record_errors(failed)
+            if not retry_chunk:
+                return
+            self._record_retry(len(retry_chunk))
+            chunk = retry_chunk
+            time.sleep(backoff_s)
+            backoff_s *= 2
+
+    def _record_retry(self, count: int) -> None:
+        with self._lock:
+            self.retry_count += count
+        logger.warning("es_bulk_rejected_retry docs=%d", count)
+
+    def _record_errors(self, errors: List[dict]) -> None:
+        with self._lock:
+            self.errors.extend(errors)
+
+
+def bulk_index(es, actions: Iterable[dict], **kwargs) -> tuple[int, List[dict]]:
+    """helpers.bulk(raise_on_error=False)와 같은 (성공 건수, 실패 목록) 형태로 반환"""
+    with BulkIndexer(es, **kwargs) as indexer:
+        indexer.add_many(actions)
+    return indexer.success_count, indexer.errors
+
+
+@contextmanager
+def bulk_load_settings(es, index: str):
+    """
+    대량 적재 동안 refresh/replica를 끄고, 끝나면 원래 설정으로 복원한 뒤 refresh 한다.
+    검색이 아직 보지 않는 새 버전 인덱스(sync_es.py --clear)에만 사용한다.
+    index가 alias여도 실제 물리 인덱스별로 원래 값을 기억한다.
+    """
+    keys: tuple[str, ...] = ("refresh_interval", "number_of_replicas")
+    original: dict = {}
+    settings_response = es.indices.get_settings(index=index)
+    for physical_index, body in settings_response.items():
+        index_settings: dict = body.get("settings", {}).get("index", {})
+        # 명시적으로 설정되지 않은 값은 None으로 복원하면 클러스터 기본값으로 돌아간다
+        original[physical_index] = {key: index_settings.get(key) for key in keys}
+
+    es.indices.put_settings(index=index, settings={"index": {"refresh_interval": "-1", "number_of_replicas": 0}})
+    try:
+        yield
+    finally:
+        for physical_index, values in original.items():
+            es.indices.put_settings(index=physical_index, settings={"index": values})
+        es.indices.refresh(index=index)
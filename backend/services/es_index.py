@@ -0,0 +1,256 @@
+"""
+Elasticsearch patents 인덱스 관리 (명시적 매핑 + 버전 인덱스 + alias 교체)
+
+- 검색/동기화 코드는 항상 alias(`patents`)만 바라본다.
+- 실제 데이터는 `patents_v<timestamp>` 형태의 물리 인덱스에 저장된다.
+- 전체 재색인 시 새 물리 인덱스를 만들어 적재한 뒤 alias를 원자적으로 교체하므로
+  검색이 비어 있는 구간(다운타임)이 없다.
+"""
+import logging
+import os
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+PATENTS_ALIAS: str = os.getenv("ES_PATENTS_ALIAS", "patents")
+PATENTS_INDEX_PREFIX: str = f"{PATENTS_ALIAS}_v"
+
+# KIPRIS 날짜는 "2006.01.20" 형태가 기본이며, 일부 데이터는 구분자가 없거나 ISO 형식이다.
+PATENT_DATE_FORMAT: str = "yyyy.MM.dd||yyyyMMdd||yyyy-MM-dd||strict_date_optional_time||epoch_millis"
+
+
+def _korean_text_field(with_keyword: bool = False, ignore_above: int = 256) -> dict:
+    """
+    nori 분석 텍스트 필드.
+    - index_options=offsets: 전체 필드 하이라이팅(number_of_fragments=0)을 unified highlighter가
+      재분석 없이 postings의 offset으로 처리하도록 한다.
+    """
+    field: dict = {
+        "type": "text",
+        "analyzer": "korean",
+        "index_options": "offsets",
+    }
+    if with_keyword:
+        field["fields"] = {"keyword": {"type": "keyword", "ignore_above": ignore_above}}
+    return field
+
+
+def _code_field() -> dict:
+    """출원번호/상태/분류코드처럼 정확 일치로 조회되는 필드 (text + keyword 서브필드)"""
+    return {
+        "type": "text",
+        "analyzer": "standard",
+        "fields": {"keyword": {"type": "keyword", "ignore_above": 64}},
+    }
+
+
+def _stored_only_object() -> dict:
+    """상세 화면 표시용으로만 쓰는 중첩 정보 (색인하지 않고 _source에만 보관)"""
+    return {"type": "object", "enabled": False}
+
+
+PATENT_INDEX_MAPPINGS: dict = {
+    "dynamic": True,
+    "properties": {
+        "applicationNumber": _code_field(),
+        "registrationNumber": _code_field(),
+        "openNumber": _code_field(),
+        "publicationNumber": _code_field(),
+        "applicationDate": {"type": "date", "format": PATENT_DATE_FORMAT, "ignore_malformed": True},
+        "registrationDate": {"type": "date", "format": PATENT_DATE_FORMAT, "ignore_malformed": True},
+        "publicationDate": {"type": "date", "format": PATENT_DATE_FORMAT, "ignore_malformed": True},
+        "status": _code_field(),
+        "title": {
+            "properties": {
+                "ko": _korean_text_field(),
+                "en": {"type": "text", "analyzer": "english", "index_options": "offsets"},
+            }
+        },
+        "applicant": {
+            "properties": {
+                "name": _korean_text_field(with_keyword=True),
+                "country": {"type": "keyword"},
+            }
+        },
+        "inventors": {
+            "properties": {
+                "name": _korean_text_field(with_keyword=True),
+            }
+        },
+        "responsibleInventor": _korean_text_field(with_keyword=True),
+        "abstract": _korean_text_field(),
+        "representativeClaim": _korean_text_field(),
+        "claims": _korean_text_field(),
+        "ipcCodes": _code_field(),
+        "cpcCodes": _code_field(),
+        "rawRef": {"type": "keyword", "index": False},
+        "mongoId": {"type": "keyword"},
+        "pdfPath": {"type": "keyword", "index": False},
+        "hasPdf": {"type": "boolean"},
+        "familyInfo": _stored_only_object(),
+        "docdbFamily": _stored_only_object(),
+        "agentInfo": _stored_only_object(),
+    },
+}
+
+
+def build_es_document(patent: dict) -> tuple[str, dict]:
+    """
+    MongoDB patents 문서를 Elasticsearch 문서로 변환하고 (doc_id, _source)를 반환.
+    - doc_id는 applicationNumber (없으면 MongoDB _id)로 통일해 동기화 경로마다 중복 문서가 생기지 않도록 한다.
+    - mongoId는 change stream 삭제 이벤트(documentKey만 제공)를 ES 문서에 연결하는 데 쓴다.
+    """
+    source: dict = {k: v for k, v in patent.items() if k != "_id"}
+    mongo_id = patent.get("_id")
+    if mongo_id is not None:
+        source["mongoId"] = str(mongo_id)
+
+    doc_id = patent.get("applicationNumber") or mongo_id or ""
+
+    # rawRef를 문자열로 변환
+    if source.get("rawRef") is not None:
+        source["rawRef"] = str(source["rawRef"])
+
+    # 책임연구자 필드 추가 (inventors[0].name)
+    inventors = source.get("inventors") or []
+    first_inventor = inventors[0] if isinstance(inventors, list) and inventors else None
+    if isinstance(first_inventor, dict):
+        source["responsibleInventor"] = first_inventor.get("name", "")
+    elif isinstance(first_inventor, str):
+        source["responsibleInventor"] = first_inventor
+    else:
+        source["responsibleInventor"] = ""
+
+    return str(doc_id), source
+
+
+def build_index_settings(use_nori: bool = True) -> dict:
+    """
+    인덱스 settings 생성.
+    analysis-nori 플러그인이 없는 클러스터에서는 내장 cjk(bigram) 분석기로 대체한다.
+    """
+    if use_nori:
+        analysis: dict = {
+            "tokenizer": {
+                "korean_nori_tokenizer": {
+                    "type": "nori_tokenizer",
+                    "decompound_mode": "mixed",
+                }
+            },
+            "analyzer": {
+                "korean": {
+                    "type": "custom",
+                    "tokenizer": "korean_nori_tokenizer",
+                    "filter": ["lowercase", "nori_readingform"],
+                }
+            },
+        }
+    else:
+        analysis = {
+            "analyzer": {
+                "korean": {
+                    "type": "custom",
+                    "tokenizer": "standard",
+                    "filter": ["cjk_width", "lowercase", "cjk_bigram"],
+                }
+            },
+        }
+    return {
+        "number_of_shards": int(os.getenv("ES_PATENTS_SHARDS", "1")),
+        "number_of_replicas": int(os.getenv("ES_PATENTS_REPLICAS", "0")),
+        "analysis": analysis,
+    }
+
+
+def is_nori_available(es) -> bool:
+    """클러스터의 모든 노드에 analysis-nori 플러그인이 설치되어 있는지 확인"""
+    try:
+        nodes = es.nodes.info(metric="plugins").get("nodes", {})
+        if not nodes:
+            return False
+        return all(
+            any(plugin.get("name") == "analysis-nori" for plugin in node.get("plugins", []))
+            for node in nodes.values()
+        )
+    except Exception as e:
+        logger.warning("es_index_plugin_check_failed err=%r", e)
+        return False
+
+
+def new_index_name() -> str:
+    return f"{PATENTS_INDEX_PREFIX}{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+
+
+def create_versioned_index(es, index_name: str | None = None) -> str:
+    """명시적 매핑으로 새 물리 인덱스를 생성하고 이름을 반환"""
+    index_name = index_name or new_index_name()
+    use_nori: bool = is_nori_available(es)
+    if not use_nori:
+        print("⚠️  analysis-nori 플러그인이 없어 cjk 분석기로 대체합니다.")
+    es.indices.create(
+        index=index_name,
+        settings=build_index_settings(use_nori=use_nori),
+        mappings=PATENT_INDEX_MAPPINGS,
+    )
+    print(f"🆕 Elasticsearch 인덱스 생성: {index_name}")
+    return index_name
+
+
+def get_alias_indices(es) -> list[str]:
+    """현재 alias가 가리키는 물리 인덱스 목록"""
+    if not es.indices.exists_alias(name=PATENTS_ALIAS):
+        return []
+    return sorted(es.indices.get_alias(name=PATENTS_ALIAS).keys())
+
+
+def _is_legacy_concrete_index(es) -> bool:
+    """alias 도입 이전에 동적 매핑으로 만들어진 `patents` 물리 인덱스가 남아있는지"""
+    return es.indices.exists(index=PATENTS_ALIAS) and not es.indices.exists_alias(name=PATENTS_ALIAS)
+
+
+def swap_alias(es, new_index: str) -> list[str]:
+    """
+    alias를 new_index로 원자적으로 교체하고, 이전에 연결되어 있던 인덱스 목록을 반환한다.
+    같은 이름의 레거시 물리 인덱스가 있으면 같은 요청 안에서 삭제한다(remove_index).
+    """
+    actions: list[dict] = []
+    previous: list[str] = []
+    if _is_legacy_concrete_index(es):
+        actions.append({"remove_index": {"index": PATENTS_ALIAS}})
+        print(f"🗑️  레거시 인덱스 '{PATENTS_ALIAS}'를 alias로 대체합니다.")
+    else:
+        previous = [name for name in get_alias_indices(es) if name != new_index]
+        for old_index in previous:
+            actions.append({"remove": {"index": old_index, "alias": PATENTS_ALIAS}})
+    actions.append({"add": {"index": new_index, "alias": PATENTS_ALIAS, "is_write_index": True}})
+    es.indices.update_aliases(actions=actions)
+    print(f"🔁 alias '{PATENTS_ALIAS}' → {new_index}")
+    return previous
+
+
+def delete_old_indices(es, keep: int = 1) -> list[str]:
+    """alias에 연결되지 않은 오래된 버전 인덱스를 최근 keep개만 남기고 삭제"""
+    live: set[str] = set(get_alias_indices(es))
+    versions: list[str] = sorted(es.indices.get(index=f"{PATENTS_INDEX_PREFIX}*").keys())
+    stale: list[str] = [name for name in versions if name not in live]
+    to_delete: list[str] = stale[:-keep] if keep > 0 else stale
+    for name in to_delete:
+        es.indices.delete(index=name)
+        print(f"🗑️  이전 인덱스 삭제: {name}")
+    return to_delete
+
+
+def ensure_patents_index(es) -> str:
+    """
+    증분 적재 전에 alias가 존재하도록 보장하고, 쓰기 대상 이름(alias)을 반환한다.
+    - alias가 있으면 그대로 사용
+    - 레거시 물리 인덱스만 있으면 그대로 사용 (다음 전체 재색인 때 alias로 전환)
+    - 아무것도 없으면 새 버전 인덱스를 만들고 alias를 연결
+    """
+    if es.indices.exists_alias(name=PATENTS_ALIAS):
+        return PATENTS_ALIAS
+    if es.indices.exists(index=PATENTS_ALIAS):
+        print(f"⚠️  '{PATENTS_ALIAS}'는 동적 매핑 인덱스입니다. --clear 재색인으로 명시적 매핑을 적용하세요.")
+        return PATENTS_ALIAS
+    swap_alias(es, create_versioned_index(es))
+    return PATENTS_ALIAS
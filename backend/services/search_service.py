@@ -2,30 +2,35 @@
 import json
 import re
 import os
-import asyncio
 import time
-from typing import List,Dict,Tuple,Optional
-from contextlib import asynccontextmanager # 시작과 종료 시점에 특정 작업을 실행하기 위한 도구
+import asyncio
+import hashlib
+from types import MappingProxyType
+from typing import TYPE_CHECKING,List,Dict,Tuple,Optional,Mapping
+
+from backend.core import clients, tracing
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel # 데이터 검증 및 데이터 변환 
-from openai import AsyncOpenAI
-from qdrant_client import AsyncQdrantClient
+# openai/qdrant_client는 타입 힌트에만 사용 (실제 import는 clients.get_openai/get_qdrant에서)
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+    from qdrant_client import AsyncQdrantClient
 
 
 #--------------------------------------
 # 환경 변수 설정 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-QDRANT_URL = os.getenv("QDRANT_URL")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "patents")
 JSON_PATH = os.getenv("JSON_PATH")
+# 0보다 크면 JSON_PATH 파일 변경을 이 주기(초)로 감시해 코퍼스를 무중단 교체
+CORPUS_WATCH_INTERVAL_S = float(os.getenv("CORPUS_WATCH_INTERVAL_S", "0"))
 
 # 디버그 성능 로그 on/off (환경변수로 제어)
 DEBUG_PERF = os.getenv("DEBUG_PERF", "false").lower() == "true"
 
 def perf_log(msg: str):
-    """DEBUG_PERF=true일 때만 출력하는 헬퍼 함수"""
+    """
+    DEBUG_PERF=true일 때만 출력하는 헬퍼 함수 (LLM 원문 등 디버그 내용용)
+    단계별 소요 시간은 backend.core.tracing의 span으로 기록한다.
+    """
     if DEBUG_PERF:
         print(msg)
 
@@ -33,14 +38,66 @@ def perf_log(msg: str):
 
 #--------------------------------------
 # 전역 변수 (시작시 초기화)
-client_openai: Optional[AsyncOpenAI] = None
-client_qdrant : Optional[AsyncQdrantClient] = None
+client_openai: Optional["AsyncOpenAI"] = None
+client_qdrant : Optional["AsyncQdrantClient"] = None
 
-#타입 힌트 
-patents: List[Dict] = []
-patent_index: Dict[str, Dict] = {}
-patent_text_index: Dict[str, str] = {}
-patent_flattened: List[Dict] = []
+class PatentCorpus:
+    """
+    검색용 코퍼스 스냅샷 (원본 특허, 출원번호/텍스트 인덱스, 스캔용 목록, 자동완성 trie)
+    만든 뒤에는 바꾸지 않고, 새 데이터는 새 객체를 만들어 전역 `corpus` 참조만 교체한다.
+    요청 처리 중에는 시작할 때 잡은 스냅샷을 끝까지 쓰므로 교체와 겹쳐도 결과가 섞이지 않고,
+    이전 스냅샷은 마지막 요청이 끝나 참조가 사라지면 해제된다.
+    """
+    __slots__ = ("patents", "index", "text_index", "flattened", "suggest_indexes", "source_path", "fingerprint", "loaded_at")
+
+    def __init__(
+        self,
+        patents: Tuple[Dict, ...],
+        index: Mapping[str, Dict],
+        text_index: Mapping[str, str],
+        flattened: Tuple[Tuple[str, str], ...],
+        suggest_indexes: Mapping[str, object],
+        source_path: Optional[str] = None,
+        fingerprint: Optional[Dict] = None,
+        loaded_at: Optional[float] = None,
+    ):
+        self.patents = patents
+        self.index = index
+        self.text_index = text_index
+        # (출원번호, 정제 텍스트) — 키워드 전체 스캔 대상
+        self.flattened = flattened
+        self.suggest_indexes = suggest_indexes
+        self.source_path = source_path
+        # {"size", "mtime_ns", "sha256"} — 파일 감시 시 변경 여부 판단
+        self.fingerprint = fingerprint or {}
+        self.loaded_at = loaded_at
+
+    @classmethod
+    def empty(cls) -> "PatentCorpus":
+        return cls((), MappingProxyType({}), MappingProxyType({}), (), MappingProxyType({}))
+
+
+# 현재 서비스 중인 코퍼스 (install_corpus로만 교체)
+corpus: PatentCorpus = PatentCorpus.empty()
+
+# 코퍼스 로딩 상태 (/readyz, 챗봇 503 판단용)
+# state: pending → loading → ready | failed
+# reload: 재로딩 중이면 진행 상황 dict (그동안은 기존 코퍼스로 서비스), last_reload: 마지막 재로딩 결과
+corpus_status: Dict = {
+    "state": "pending",
+    "phase": None,
+    "progress": 0.0,
+    "documents": 0,
+    "error": None,
+    "started_at": None,
+    "finished_at": None,
+    "reload": None,
+    "last_reload": None,
+}
+
+
+def is_corpus_ready() -> bool:
+    return corpus_status["state"] == "ready"
 
 
 
@@ -130,14 +187,27 @@ def extract_application_number(patent):
 #--------------------------------------
 #LLM 관련 함수들 
 
+def _usage_attributes(resp) -> Dict[str, int]:
+    """OpenAI 응답의 토큰 사용량을 span 속성으로 변환"""
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return {}
+    attrs: Dict[str, int] = {}
+    for key in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = getattr(usage, key, None)
+        if isinstance(value, int):
+            attrs[f"tokens.{key.replace('_tokens', '')}"] = value
+    return attrs
+
+
 async def extract_weighted_keywords_llm(query: str):
-    start = time.time()
-    resp = await client_openai.chat.completions.create(
-        model="gpt-5",
-        messages=[
-            {
-                "role": "user",
-                "content": f"""
+    with tracing.span("rag.keyword_llm", model="gpt-5") as stage:
+        resp = await client_openai.chat.completions.create(
+            model="gpt-5",
+            messages=[
+                {
+                    "role": "user",
+                    "content": f"""
 다음 문장에서 특허 검색에 **직접 사용되는 검색 조건 키워드만** 추출하세요.
 
 규칙:
@@ -156,60 +226,58 @@ async def extract_weighted_keywords_llm(query: str):
 문장:
 {query}
 """
-            }
-        ],
-    )
+                }
+            ],
+        )
+        stage.set_attributes(**_usage_attributes(resp))
     
-    raw = resp.choices[0].message.content.strip()
+        raw = resp.choices[0].message.content.strip()
     
-    perf_log("\n🧠 [RAW LLM OUTPUT]")
-    perf_log(raw)
+        perf_log("\n🧠 [RAW LLM OUTPUT]")
+        perf_log(raw)
     
-    weighted_keywords = []
+        weighted_keywords = []
     
-  
-    for line in raw.splitlines():
-        line = line.strip()
-        if not line or ":" not in line:
-            continue
+        for line in raw.splitlines():
+            line = line.strip()
+            if not line or ":" not in line:
+                continue
         
-       
-        k, w = line.split(":", 1)
+            k, w = line.split(":", 1)
         
-        try:
-            weight = float(w.strip())
-            weighted_keywords.append((k.strip(), weight))
-        except ValueError:
-            continue  
-    
-    perf_log(f"⏱️ [LLM 키워드 추출] {time.time() - start:.2f}초")
+            try:
+                weight = float(w.strip())
+                weighted_keywords.append((k.strip(), weight))
+            except ValueError:
+                continue  
+    
+        # span이 끝나기 전에 기록해야 exporter(OTel/metrics)에 전달된다
+        stage.set_attribute("keywords", len(weighted_keywords))
     return weighted_keywords
 
 #--------------------------------------
 #검색 관련 함수들
 
 async def get_query_embedding(text: str):
-    emb = await client_openai.embeddings.create(
-        model="text-embedding-3-large",
-        input = text
-    )
+    with tracing.span("rag.embedding", model="text-embedding-3-large") as stage:
+        emb = await client_openai.embeddings.create(
+            model="text-embedding-3-large",
+            input = text
+        )
+        stage.set_attributes(**_usage_attributes(emb))
     return emb.data[0].embedding
 
 async def qdrant_search_app_numbers(query:str,limit: int):
-    start = time.time()
-    
-    emb_start = time.time()
     vector = await get_query_embedding(query)
-    perf_log(f"⏱️ [임베딩 생성] {time.time() - emb_start:.2f}초")
-    
-    search_start = time.time()
-    results = await client_qdrant.query_points(
-        collection_name=COLLECTION_NAME,
-        query=vector,
-        limit=limit,
-        with_payload=True
-    )
-    perf_log(f"⏱️ [Qdrant 쿼리] {time.time() - search_start:.2f}초")
+    
+    with tracing.span("rag.qdrant_query", limit=limit) as stage:
+        results = await client_qdrant.query_points(
+            collection_name=COLLECTION_NAME,
+            query=vector,
+            limit=limit,
+            with_payload=True
+        )
+        stage.set_attribute("docs", len(results.points))
     
     apps=[]
     for r in results.points:
@@ -218,16 +286,47 @@ async def qdrant_search_app_numbers(query:str,limit: int):
         if app_no:
             apps.append(app_no)
     
-    perf_log(f"⏱️ [Qdrant 전체] {time.time() - start:.2f}초 → {len(apps)}개")
     return apps
 
 
-async def simple_match_search_app_numbers(query: str, limit: int):
+def _scan_keyword_counts(patent_flattened, weighted_keywords) -> list:
+    """키워드별 등장 횟수 벡터가 하나라도 0이 아닌 문서의 (count_vector, app_no) 목록"""
+    scored = []
+    
+    for i, (app_no, text) in enumerate(patent_flattened):
+        
+        # ✅ 2. 키워드별 등장 횟수 벡터
+        count_vector = tuple(text.count(k) for k, _ in weighted_keywords)
+        
+        # 🔍 처음 5개 특허는 상세 로그 (디버그용 - 주석 처리)
+        # if i < 5:
+        #     print(f"\n   [Patent {i}] app_no: {app_no}")
+        #     print(f"      count_vector: {count_vector}")
+        #     print(f"      text length: {len(text)}")
+        #     for j, (keyword, _) in enumerate(weighted_keywords):
+        #         print(f"      '{keyword}': {count_vector[j]} times")
+        
+        # 전부 0이면 제외
+        if all(c == 0 for c in count_vector):
+            # if i < 5:
+            #     print(f"      ❌ SKIPPED (all zeros)")
+            continue
+        
+        # if i < 5:
+        #     print(f"      ✅ MATCHED!")
+        
+        scored.append((count_vector, app_no))
+    
+    return scored
+
+
+async def simple_match_search_app_numbers(query: str, limit: int, snapshot: Optional[PatentCorpus] = None):
     """
     ✔ LLM이 준 가중치로 키워드 우선순위를 결정
     ✔ 문서 점수는 각 키워드 등장 횟수를 벡터로 만들어 사전식(lexicographic) 비교로 정렬
+    snapshot을 주지 않으면 호출 시점의 corpus를 사용한다.
     """
-    start = time.time()
+    patent_flattened = (snapshot or corpus).flattened
     perf_log(f"\n{'='*60}")
     perf_log(f"🔎 [SIMPLE MATCH SEARCH START]")
     perf_log(f"   Query: '{query}'")
@@ -255,53 +354,28 @@ async def simple_match_search_app_numbers(query: str, limit: int):
     
     # 🔍 첫 번째 문서 샘플 확인 (디버그용 - 주석 처리)
     # print(f"\n📄 [FIRST PATENT SAMPLE]")
-    # first_patent = patent_flattened[0]
-    # print(f"   app_no: {first_patent['app_no']}")
-    # print(f"   text length: {len(first_patent['text'])}")
-    # print(f"   text preview (first 300 chars):\n{first_patent['text'][:300]}")
+    # first_app_no, first_text = patent_flattened[0]
+    # print(f"   app_no: {first_app_no}")
+    # print(f"   text length: {len(first_text)}")
+    # print(f"   text preview (first 300 chars):\n{first_text[:300]}")
     
     # 🔍 키워드가 첫 번째 문서에 있는지 확인 (디버그용 - 주석 처리)
     # print(f"\n🔍 [KEYWORD CHECK IN FIRST PATENT]")
     # for keyword, weight in weighted_keywords:
-    #     count = first_patent['text'].count(keyword)
+    #     count = first_text.count(keyword)
     #     print(f"   '{keyword}': {count} occurrences")
     #     if count > 0:
-    #         idx = first_patent['text'].find(keyword)
-    #         context = first_patent['text'][max(0, idx-50):idx+len(keyword)+50]
+    #         idx = first_text.find(keyword)
+    #         context = first_text[max(0, idx-50):idx+len(keyword)+50]
     #         print(f"      Context: ...{context}...")
     
-    scored = []
-    
     # print(f"\n🔍 [SCANNING ALL PATENTS]")
     # print(f"   Total patents to scan: {len(patent_flattened)}")
     
-    matched_patents = 0
-    
-    for i, p in enumerate(patent_flattened):
-        text = p["text"]
-        
-        # ✅ 2. 키워드별 등장 횟수 벡터
-        count_vector = tuple(text.count(k) for k, _ in weighted_keywords)
-        
-        # 🔍 처음 5개 특허는 상세 로그 (디버그용 - 주석 처리)
-        # if i < 5:
-        #     print(f"\n   [Patent {i}] app_no: {p['app_no']}")
-        #     print(f"      count_vector: {count_vector}")
-        #     print(f"      text length: {len(text)}")
-        #     for j, (keyword, _) in enumerate(weighted_keywords):
-        #         print(f"      '{keyword}': {count_vector[j]} times")
-        
-        # 전부 0이면 제외
-        if all(c == 0 for c in count_vector):
-            # if i < 5:
-            #     print(f"      ❌ SKIPPED (all zeros)")
-            continue
-        
-        matched_patents += 1
-        # if i < 5:
-        #     print(f"      ✅ MATCHED!")
-        
-        scored.append((count_vector, p["app_no"]))
+    with tracing.span("rag.lexical_scan", keywords=len(weighted_keywords), corpus=len(patent_flattened)) as stage:
+        scored = _scan_keyword_counts(patent_flattened, weighted_keywords)
+        stage.set_attribute("docs", len(scored))
+    matched_patents = len(scored)
     
     # print(f"\n✅ [SCAN COMPLETE]")
     # print(f"   Total patents scanned: {len(patent_flattened)}")
@@ -329,24 +403,33 @@ async def simple_match_search_app_numbers(query: str, limit: int):
     perf_log(f"\n🎯 [FINAL RESULT]")
     perf_log(f"   Returning {len(result)} patents (limit={limit})")
     perf_log(f"   Sample app_nos: {result[:3]}")
-    perf_log(f"⏱️ [Simple Match 전체] {time.time() - start:.2f}초")
     perf_log(f"{'='*60}\n")
     
     return result
 
     
-async def hybrid_retrieve(query:str, target_k: int):
-    start = time.time()
-    
-    #병렬 실행 
-    parallel_start = time.time()
-    search_apps,qdrant_apps = await asyncio.gather(
-        simple_match_search_app_numbers(query, target_k),
-        qdrant_search_app_numbers(query, target_k * 2)
-    )
-    
-    perf_log(f"⏱️ [병렬 검색] {time.time() - parallel_start:.2f}초")
-    
+async def hybrid_retrieve(query:str, target_k: int, snapshot: Optional[PatentCorpus] = None):
+    # 스캔과 결과 결합이 같은 코퍼스 스냅샷을 보도록 한 번만 잡는다
+    snapshot = snapshot or corpus
+    #병렬 실행 (gather가 만드는 task에도 현재 span/request_id 컨텍스트가 복사된다)
+    with tracing.span("rag.retrieve", target_k=target_k):
+        search_apps,qdrant_apps = await asyncio.gather(
+            simple_match_search_app_numbers(query, target_k, snapshot),
+            qdrant_search_app_numbers(query, target_k * 2)
+        )
+
+    with tracing.span("rag.fusion", search=len(search_apps), qdrant=len(qdrant_apps)) as stage:
+        docs = fuse_results(search_apps, qdrant_apps, target_k, snapshot)
+        stage.set_attribute("docs", len(docs))
+    return docs
+
+
+def fuse_results(
+    search_apps: List[str], qdrant_apps: List[str], target_k: int, snapshot: Optional[PatentCorpus] = None
+) -> List[Tuple[str, str, str]]:
+    """키워드 매칭 결과를 우선 채우고, 부족분을 Qdrant 결과로 채운다 (최대 target_k*2개)"""
+    snapshot = snapshot or corpus
+    patent_text_index = snapshot.text_index
     s_set = set(search_apps)
     q_set = set(qdrant_apps)
     
@@ -371,7 +454,7 @@ async def hybrid_retrieve(query:str, target_k: int):
     
     #3) search 우선 추가
     for app in search_apps:
-        if app not in used and app in patent_index:
+        if app not in used and app in patent_text_index:
             used.add(app)
             docs.append(("MATCH", app, patent_text_index[app]))
             
@@ -380,7 +463,7 @@ async def hybrid_retrieve(query:str, target_k: int):
     for app in qdrant_apps:
         if len (docs) >= target_k * 2:
             break
-        if app not in used and app in patent_index:
+        if app not in used and app in patent_text_index:
             used.add(app)
             docs.append(("QDRANT",app,patent_text_index[app]))
             
@@ -401,12 +484,54 @@ async def hybrid_retrieve(query:str, target_k: int):
         f"qdrant_only={qdrant_only}, "
         f"total_docs={total_docs}"
     )
-    perf_log(f"⏱️ [Hybrid Retrieve 전체] {time.time() - start:.2f}초")
     # ---------------------------------------------
 
     return docs
 
-def build_prompt(question, context):
+#--------------------------------------
+#후속 질문(follow-up) 관련 함수들
+
+# "그 중에", "두 번째 특허", "위 특허", "해당 특허"처럼 이전 답변을 가리키는 표현
+# "그 외", "나머지", "그것 말고"는 이전 결과 밖의 특허를 묻는 경우가 많아 제외 (새 검색)
+FOLLOW_UP_PATTERN = re.compile(
+    r"(그\s*중|이\s*중|그(것|거)(의|은|는|들\s*중)|그\s*특허|이\s*특허|해당\s*특허|위\s*(의|에서|특허)|앞(의|에서)|방금|아까|"
+    r"이전\s*(답변|결과)|[첫두세네]\s*번째|다섯\s*번째|\d+\s*번째)"
+)
+
+
+def is_follow_up_question(query: str) -> bool:
+    return bool(FOLLOW_UP_PATTERN.search(query or ""))
+
+
+def select_follow_up_docs(
+    query: str, previous_turn: Optional[Dict], snapshot: Optional[PatentCorpus] = None
+) -> List[Tuple[str, str, str]]:
+    """
+    이전 턴의 검색 결과만으로 답할 수 있는 후속 질문이면 그 문서들을 반환 (아니면 빈 목록).
+    - 이전 답변을 가리키는 표현이 없으면 새 검색
+    - 이전 결과에 없는 출원번호를 직접 언급하면 새 검색
+    """
+    if not previous_turn or not is_follow_up_question(query):
+        return []
+    prior_apps: List[str] = previous_turn.get("app_numbers") or []
+    mentioned_apps = {normalize_application_number(m) for m in re.findall(r"\d[\d-]{9,}\d", query)}
+    if mentioned_apps - set(prior_apps):
+        return []
+    patent_text_index = (snapshot or corpus).text_index
+    return [("PRIOR", app, patent_text_index[app]) for app in prior_apps if app in patent_text_index]
+
+
+def build_prompt(question, context, previous_turn: Optional[Dict] = None):
+    # 후속 질문이면 "두 번째 특허" 같은 지시어를 해석할 수 있도록 직전 질문/답변을 함께 제공
+    previous_section = ""
+    if previous_turn:
+        previous_section = f"""
+[PREVIOUS QUESTION]
+{previous_turn.get("query", "")}
+
+[PREVIOUS ANSWER]
+{previous_turn.get("answer", "")}
+"""
     return f"""
 당신은 한양대학교 ERICA 산학협력단이 보유한 특허 데이터베이스(KIPRIS Detail.json)를 잘 이해하고 사용하는 전문 특허 분석가입니다.
 
@@ -420,7 +545,7 @@ RULES:
 
 [CONTEXT]
 {context}
-
+{previous_section}
 [QUESTION]
 {question}
 
@@ -429,138 +554,324 @@ RULES:
             
     
 async def hybrid_rag_answer(query:str, top_k: int):
-    overall_start = time.time()
+    result = await hybrid_rag_answer_with_retrieval(query, top_k)
+    return result["answer"]
+
+
+async def hybrid_rag_answer_with_retrieval(query: str, top_k: int, previous_turn: Optional[Dict] = None) -> Dict:
+    """
+    RAG 답변과 함께 사용한 검색 결과를 반환.
+    previous_turn({"query", "answer", "app_numbers"})이 주어지고 후속 질문으로 판단되면
+    키워드 추출/임베딩/전체 스캔 없이 직전 턴의 검색 결과를 그대로 재사용한다.
+    반환값: {"answer", "app_numbers", "sources", "mode": "full" | "follow_up"}
+    """
     perf_log(f"\n{'#'*70}")
     perf_log(f"🤖 [RAG 답변 생성 시작] Query: '{query[:50]}...'")
     perf_log(f"{'#'*70}")
     
-    # 1. 문서 검색
-    retrieve_start = time.time()
-    docs = await hybrid_retrieve(query,top_k)
-    retrieve_elapsed = time.time() - retrieve_start
-    
+    # 1. 문서 검색 (후속 질문이면 직전 턴 결과 재사용)
+    # 요청 도중 코퍼스가 교체되어도 이 요청은 시작 시점의 스냅샷으로 끝낸다
+    snapshot = corpus
+    docs = select_follow_up_docs(query, previous_turn, snapshot)
+    mode = "follow_up" if docs else "full"
     if not docs:
-        return "정보가 부족합니다."
+        previous_turn = None
+        docs = await hybrid_retrieve(query, top_k, snapshot)
     
-    perf_log(f"⏱️ [1단계: 문서 검색] {retrieve_elapsed:.2f}초 → {len(docs)}개 문서")
+    if not docs:
+        return {"answer": "정보가 부족합니다.", "app_numbers": [], "sources": [], "mode": mode}
     
     # 2. 컨텍스트 생성
-    context_start = time.time()
-    context = ""
-    for i, (source, app_no, text) in enumerate(docs):
-        context += f"""
+    with tracing.span("rag.context_build", docs=len(docs), mode=mode) as stage:
+        context = ""
+        for i, (source, app_no, text) in enumerate(docs):
+            context += f"""
 \n===========================================================================
 📄 PATENT {i+1}
 APPLICATION_NUMBER: {app_no}
 =============================================================================\n
 {text}
 """
-    context_elapsed = time.time() - context_start
-    perf_log(f"⏱️ [2단계: 컨텍스트 생성] {context_elapsed:.2f}초 → {len(context):,}자")
-
-    prompt = build_prompt(query, context)
+        prompt = build_prompt(query, context, previous_turn)
+        stage.set_attribute("chars", len(prompt))
 
     # 3. LLM 답변 생성
-    llm_start = time.time()
-    resp = await client_openai.chat.completions.create(
-        model="gpt-5",
-        messages=[{"role": "user", "content": prompt}],
-        #temperature=0.2
-    )
-    llm_elapsed = time.time() - llm_start
+    with tracing.span("rag.generation", model="gpt-5") as stage:
+        resp = await client_openai.chat.completions.create(
+            model="gpt-5",
+            messages=[{"role": "user", "content": prompt}],
+            #temperature=0.2
+        )
+        stage.set_attributes(**_usage_attributes(resp))
     
     answer = resp.choices[0].message.content.strip()
-    overall_elapsed = time.time() - overall_start
-    
-    # 최종 요약
-    perf_log(f"⏱️ [3단계: LLM 답변 생성] {llm_elapsed:.2f}초 → {len(answer)}자")
-    perf_log(f"\n{'='*70}")
-    perf_log(f"✅ [전체 완료] {overall_elapsed:.2f}초")
-    perf_log(f"   1. 문서 검색:      {retrieve_elapsed:6.2f}초 ({retrieve_elapsed/overall_elapsed*100:5.1f}%)")
-    perf_log(f"   2. 컨텍스트 생성:  {context_elapsed:6.2f}초 ({context_elapsed/overall_elapsed*100:5.1f}%)")
-    perf_log(f"   3. LLM 답변:       {llm_elapsed:6.2f}초 ({llm_elapsed/overall_elapsed*100:5.1f}%)")
-    perf_log(f"{'='*70}\n")
 
-    return answer
+    return {
+        "answer": answer,
+        "app_numbers": [app_no for _, app_no, _ in docs],
+        "sources": [source for source, _, _ in docs],
+        "mode": mode,
+    }
 
 #--------------------------------------
 #데이터 초기화 함수
 
-async def initialize_data():
-    global client_openai, client_qdrant, patents, patent_index, patent_text_index, patent_flattened
+def init_clients():
+    """OpenAI / Qdrant 비동기 클라이언트 연결 (생성/풀 설정은 backend.core.clients)"""
+    global client_openai, client_qdrant
     
     print("▶ Initializing clients...")
-    client_openai = AsyncOpenAI(api_key=OPENAI_API_KEY) 
-    client_qdrant = AsyncQdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+    client_openai = clients.get_openai()
+    client_qdrant = clients.get_qdrant()
     print("▶ Qdrant Connected")
 
-    print("▶ Loading patent data...")
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        patents = json.load(f)
-    print(f"▶ 특허 데이터 로드 완료: {len(patents)}개")
-    
-    # 🔍 첫 번째 특허 구조 확인 
-    # if patents:
-    #     perf_log("\n🔍 [FIRST PATENT STRUCTURE]")
-    #     first_patent = patents[0]
-    #     perf_log(f"   Type: {type(first_patent)}")
-    #     perf_log(f"   Keys: {list(first_patent.keys()) if isinstance(first_patent, dict) else 'Not a dict'}")
-    #     perf_log(f"   JSON preview: {json.dumps(first_patent, ensure_ascii=False, indent=2)[:500]}...")
-
-    print("\n▶ Building indexes...")
-    for p in patents:
-        raw = extract_application_number(p)
-        app_no = normalize_application_number(raw)
-        if app_no:
-            patent_index[app_no] = p
-
-    print(f"▶ applicationNumber index 생성 완료: {len(patent_index)}개")
-
-    # 🔍 첫 3개 특허에서 상세 디버깅 (주석 처리)
-    # for i, patent in enumerate(patents[:3]):
-    #     app_no = normalize_application_number(extract_application_number(patent))
-    #     if not app_no:
-    #         continue
-    #     
-    #     perf_log(f"\n🔍 [PATENT {i+1}] app_no: {app_no}")
-    #     
-    #     # 각 필드가 찾아지는지 확인
-    #     title = find_key_recursive(patent, "inventionTitle")
-    #     abstract = find_key_recursive(patent, "astrtCont")
-    #     claims = find_key_recursive(patent, "claim")
-    #     inventors = find_key_recursive(patent, "name")
-    #     
-    #     perf_log(f"   inventionTitle found: {len(title)} items → {title[:1] if title else 'NONE'}")
-    #     perf_log(f"   astrtCont found: {len(abstract)} items → {abstract[:1] if abstract else 'NONE'}")
-    #     perf_log(f"   claim found: {len(claims)} items")
-    #     perf_log(f"   name found: {len(inventors)} items → {inventors[:3] if inventors else 'NONE'}")
-    #     
-    #     cleaned_text = build_patent_context_ko(patent)
-    #     perf_log(f"   Final text length: {len(cleaned_text)}")
-    #     perf_log(f"   Text preview: {cleaned_text[:200]}...")
-    #     
-    #     patent_text_index[app_no] = cleaned_text
-    #     patent_flattened.append({"app_no": app_no, "text": cleaned_text})
-
-    # 모든 특허 처리
-    for patent in patents:
+
+_json_whitespace = re.compile(r"[ \t\n\r]*")
+
+
+def _iter_json_array(text: str):
+    """
+    최상위 JSON 배열을 원소 단위로 파싱해 (원소, 진행률)을 돌려준다.
+    json.loads 한 번으로 파싱하면 큰 파일에서 GIL을 오래 잡아 이벤트 루프(헬스 체크)가 멈추므로 원소마다 끊는다.
+    """
+    decoder = json.JSONDecoder()
+    total: int = max(1, len(text))
+    idx: int = _json_whitespace.match(text, 0).end()
+    if text[idx:idx + 1] != "[":
+        loaded = json.loads(text)
+        items = loaded if isinstance(loaded, list) else [loaded]
+        for i, item in enumerate(items, 1):
+            yield item, i / len(items)
+        return
+    idx = _json_whitespace.match(text, idx + 1).end()
+    while text[idx:idx + 1] != "]":
+        item, idx = decoder.raw_decode(text, idx)
+        yield item, idx / total
+        idx = _json_whitespace.match(text, idx).end()
+        if text[idx:idx + 1] == ",":
+            idx = _json_whitespace.match(text, idx + 1).end()
+        elif text[idx:idx + 1] != "]":
+            raise ValueError(f"JSON 배열 형식 오류 (offset {idx})")
+
+
+def build_corpus(json_path: Optional[str] = None, progress: Optional[Dict] = None) -> PatentCorpus:
+    """
+    특허 JSON을 읽어 새 PatentCorpus(출원번호/텍스트 인덱스, 스캔 목록, 자동완성 trie)를 만든다.
+    전역 corpus는 건드리지 않는다 (교체는 install_corpus). 진행 상황은 progress dict에 기록한다.
+    """
+    path: str = json_path or JSON_PATH
+    progress = progress if progress is not None else {}
+
+    print(f"▶ Loading patent data... ({path})")
+    progress.update(phase="reading", progress=0.0, documents=0)
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        raw_bytes: bytes = f.read()
+    fingerprint: Dict = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha256": hashlib.sha256(raw_bytes).hexdigest(),
+    }
+    raw_text: str = raw_bytes.decode("utf-8")
+    del raw_bytes
+
+    print("\n▶ Parsing + building indexes...")
+    progress["phase"] = "indexing"
+    loaded_patents: List[Dict] = []
+    new_patent_index: Dict[str, Dict] = {}
+    new_patent_text_index: Dict[str, str] = {}
+    new_patent_flattened: List[Tuple[str, str]] = []
+    next_report: float = 0.1
+    for patent, fraction in _iter_json_array(raw_text):
+        loaded_patents.append(patent)
+        progress["progress"] = fraction
+        progress["documents"] = len(loaded_patents)
+        if fraction >= next_report:
+            print(f"▶ {fraction:.0%} ({len(loaded_patents)}개)")
+            next_report += 0.1
         app_no = normalize_application_number(extract_application_number(patent))
         if not app_no:
             continue
+        new_patent_index[app_no] = patent
         cleaned_text = build_patent_context_ko(patent)
-        patent_text_index[app_no] = cleaned_text
-        patent_flattened.append({"app_no": app_no, "text": cleaned_text})
+        new_patent_text_index[app_no] = cleaned_text
+        new_patent_flattened.append((app_no, cleaned_text))
+    del raw_text
 
-    print(f"\n▶ patent_flattened size: {len(patent_flattened)}")
+    print(f"▶ 특허 데이터 로드 완료: {len(loaded_patents)}개")
+    print(f"▶ applicationNumber index 생성 완료: {len(new_patent_index)}개")
+    print(f"\n▶ patent_flattened size: {len(new_patent_flattened)}")
     
     # ✅ 평균 텍스트 길이 확인
-    if patent_flattened:
-        avg_length = sum(len(p["text"]) for p in patent_flattened) / len(patent_flattened)
-        min_length = min(len(p["text"]) for p in patent_flattened)
-        max_length = max(len(p["text"]) for p in patent_flattened)
-        print(f"▶ Text length stats: avg={avg_length:.0f}, min={min_length}, max={max_length}")
-    
-    print("✅ Initialization complete!")
-    
-    
-    
+    if new_patent_flattened:
+        lengths = [len(text) for _, text in new_patent_flattened]
+        print(f"▶ Text length stats: avg={sum(lengths) / len(lengths):.0f}, min={min(lengths)}, max={max(lengths)}")
+
+    # 자동완성 trie 구축 (발명자/출원인/제목 용어)
+    from backend.services.suggest_service import build_suggest_indexes
+    progress["phase"] = "suggest"
+    suggest_indexes = build_suggest_indexes(loaded_patents)
+    print(f"▶ Suggest index 생성 완료: {', '.join(f'{k}={v.size}' for k, v in suggest_indexes.items())}")
+
+    return PatentCorpus(
+        patents=tuple(loaded_patents),
+        index=MappingProxyType(new_patent_index),
+        text_index=MappingProxyType(new_patent_text_index),
+        flattened=tuple(new_patent_flattened),
+        suggest_indexes=MappingProxyType(suggest_indexes),
+        source_path=path,
+        fingerprint=fingerprint,
+        loaded_at=time.time(),
+    )
+
+
+def install_corpus(new_corpus: PatentCorpus) -> PatentCorpus:
+    """참조 대입 한 번으로 서비스 중인 코퍼스를 교체하고 이전 코퍼스를 반환"""
+    global corpus
+    previous: PatentCorpus = corpus
+    corpus = new_corpus
+    return previous
+
+
+def load_corpus(json_path: Optional[str] = None) -> PatentCorpus:
+    """
+    코퍼스를 만들어 바로 교체 (외부 서비스 없이 동작하므로 벤치마크(backend/benchmarks)에서도 그대로 호출한다).
+    """
+    new_corpus: PatentCorpus = build_corpus(json_path, corpus_status)
+    install_corpus(new_corpus)
+    return new_corpus
+
+
+def corpus_summary() -> Dict:
+    snapshot: PatentCorpus = corpus
+    return {
+        "documents": len(snapshot.patents),
+        "indexed": len(snapshot.flattened),
+        "source_path": snapshot.source_path,
+        "fingerprint": snapshot.fingerprint,
+        "loaded_at": snapshot.loaded_at,
+        "state": corpus_status["state"],
+        "reload": corpus_status["reload"],
+        "last_reload": corpus_status["last_reload"],
+    }
+
+
+async def initialize_data():
+    """
+    클라이언트 생성 후 코퍼스를 워커 스레드에서 로드 (이벤트 루프는 계속 요청을 처리한다).
+    진행 상황과 실패 원인은 corpus_status에 남는다.
+    """
+    corpus_status.update(state="loading", error=None, started_at=time.time(), finished_at=None)
+    try:
+        init_clients()
+        await asyncio.to_thread(load_corpus)
+    except Exception as e:
+        corpus_status.update(state="failed", error=repr(e), finished_at=time.time())
+        raise
+    corpus_status.update(state="ready", phase=None, progress=1.0, finished_at=time.time())
+    print(f"✅ Initialization complete! ({corpus_status['finished_at'] - corpus_status['started_at']:.1f}s)")
+
+
+#--------------------------------------
+#코퍼스 무중단 교체 (hot reload)
+
+class CorpusReloadBusyError(RuntimeError):
+    """초기 로딩 또는 다른 재로딩이 진행 중"""
+
+
+_reload_lock = asyncio.Lock()
+
+
+def is_corpus_reload_blocked() -> bool:
+    return _reload_lock.locked() or corpus_status["state"] in ("pending", "loading")
+
+
+def file_fingerprint(path: str) -> Dict:
+    """크기/mtime과 내용 해시 (mtime만 바뀐 경우 재로딩하지 않도록)"""
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+async def reload_corpus(json_path: Optional[str] = None, force: bool = False) -> Dict:
+    """
+    새 코퍼스를 워커 스레드에서 만든 뒤 참조 교체 한 번으로 바꾼다.
+    - 구축 중에도 기존 코퍼스로 계속 서비스하고, 진행 중인 요청은 잡고 있던 스냅샷으로 끝낸다
+    - 내용(sha256)이 같으면 force가 아닌 한 다시 만들지 않는다
+    - 실패하면 기존 코퍼스를 그대로 유지한다 (초기 로딩이 실패한 상태였다면 성공 시 ready로 전환)
+    - 구축하는 동안은 두 코퍼스가 함께 메모리에 있으므로 피크 메모리가 약 2배가 된다
+    """
+    if is_corpus_reload_blocked():
+        raise CorpusReloadBusyError("코퍼스 로딩이 이미 진행 중입니다.")
+    async with _reload_lock:
+        path: str = json_path or corpus.source_path or JSON_PATH
+        if not force and corpus.fingerprint.get("sha256"):
+            fingerprint: Dict = await asyncio.to_thread(file_fingerprint, path)
+            if fingerprint["sha256"] == corpus.fingerprint["sha256"]:
+                return {"reloaded": False, "reason": "unchanged", "source_path": path, "at": time.time()}
+
+        started_at: float = time.time()
+        progress: Dict = {"started_at": started_at}
+        corpus_status["reload"] = progress
+        try:
+            new_corpus: PatentCorpus = await asyncio.to_thread(build_corpus, path, progress)
+        except Exception as e:
+            corpus_status["last_reload"] = {"reloaded": False, "error": repr(e), "source_path": path, "at": time.time()}
+            raise
+        finally:
+            corpus_status["reload"] = None
+
+        previous: PatentCorpus = install_corpus(new_corpus)
+        result: Dict = {
+            "reloaded": True,
+            "source_path": path,
+            "documents": len(new_corpus.patents),
+            "previous_documents": len(previous.patents),
+            "duration_s": round(time.time() - started_at, 2),
+            "at": time.time(),
+        }
+        corpus_status.update(state="ready", error=None, documents=len(new_corpus.patents), last_reload=result)
+        # 이 함수가 잡고 있던 참조를 놓는다 (진행 중인 요청이 끝나면 이전 코퍼스 메모리가 해제됨)
+        del previous
+        print(f"♻️ 코퍼스 교체 완료: {result['previous_documents']} → {result['documents']}개 ({result['duration_s']}s)")
+        return result
+
+
+async def watch_corpus_file(interval_s: float):
+    """
+    코퍼스 JSON 파일의 크기/mtime을 주기적으로 확인해 바뀌면 재로딩.
+    쓰는 중인 파일을 읽지 않도록 같은 stat이 두 번 연속 관측된 뒤에 재로딩한다 (파일은 os.replace로 교체 권장).
+    """
+    pending_stat: Optional[Tuple[int, int]] = None
+    # 내용이 같거나 로딩에 실패한 stat (파일이 다시 바뀔 때까지 재시도하지 않음)
+    skip_stat: Optional[Tuple[int, int]] = None
+    while True:
+        await asyncio.sleep(interval_s)
+        snapshot: PatentCorpus = corpus
+        path: Optional[str] = snapshot.source_path or JSON_PATH
+        if not path or is_corpus_reload_blocked():
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            print(f"⚠️ 코퍼스 파일 확인 실패: {e}")
+            continue
+        current_stat: Tuple[int, int] = (stat.st_size, stat.st_mtime_ns)
+        if current_stat in ((snapshot.fingerprint.get("size"), snapshot.fingerprint.get("mtime_ns")), skip_stat):
+            pending_stat = None
+            continue
+        if current_stat != pending_stat:
+            pending_stat = current_stat
+            continue
+        pending_stat = None
+        try:
+            result: Dict = await reload_corpus(path)
+            skip_stat = None if result["reloaded"] else current_stat
+        except CorpusReloadBusyError:
+            continue
+        except Exception as e:
+            skip_stat = current_stat
+            print(f"⚠️ 코퍼스 재로딩 실패 (기존 코퍼스 유지): {e!r}")
@@ -0,0 +1,136 @@
+"""
+검색창 자동완성(typeahead)용 in-process prefix trie
+
+- 특허 코퍼스를 만들 때(search_service.build_corpus) 발명자/책임연구자/출원인/제목 용어를 모아 구축하고
+  PatentCorpus.suggest_indexes로 코퍼스와 함께 교체된다
+- 각 노드에 빈도 상위 SUGGEST_MAX_LIMIT개를 미리 계산해 두므로 조회는 prefix 길이에만 비례 (ES 왕복 없음)
+- 여러 단어로 된 값("한양대학교 산학협력단")은 각 단어 시작 위치에서도 매칭된다 ("산학" → "한양대학교 산학협력단")
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+from backend.services import search_service
+
+SUGGEST_MAX_LIMIT: int = 10
+SUGGEST_FIELDS: tuple[str, ...] = ("inventor", "manager", "applicant", "title")
+
+_title_token_pattern = re.compile(r"[0-9A-Za-z가-힣]{2,}")
+
+
+def normalize_suggest_key(text: str) -> str:
+    """대소문자/공백 차이를 무시하도록 정규화"""
+    return re.sub(r"\s+", "", text).lower()
+
+
+class _TrieNode:
+    __slots__ = ("children", "terms", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terms: Dict[str, int] = {}
+        self.top: List[tuple[int, str]] = []
+
+
+class PrefixTrie:
+    def __init__(self, max_suggestions: int = SUGGEST_MAX_LIMIT):
+        self.root: _TrieNode = _TrieNode()
+        self.max_suggestions: int = max_suggestions
+        self.size: int = 0
+
+    def insert(self, key: str, term: str, count: int) -> None:
+        if not key:
+            return
+        node = self.root
+        for ch in key:
+            node = node.children.setdefault(ch, _TrieNode())
+        node.terms[term] = max(node.terms.get(term, 0), count)
+        self.size += 1
+
+    def finalize(self) -> None:
+        """각 노드의 상위 후보 목록을 하위 노드부터 계산 (재귀 대신 후위 순회 스택 사용)"""
+        stack: list[tuple[_TrieNode, bool]] = [(self.root, False)]
+        while stack:
+            node, visited = stack.pop()
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+            best: Dict[str, int] = dict(node.terms)
+            for child in node.children.values():
+                for count, term in child.top:
+                    if count > best.get(term, 0):
+                        best[term] = count
+            node.top = sorted(((count, term) for term, count in best.items()), key=lambda x: (-x[0], x[1]))[
+                : self.max_suggestions
+            ]
+            node.terms = {}
+
+    def search(self, prefix: str, limit: int) -> List[dict]:
+        node: Optional[_TrieNode] = self.root
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [{"value": term, "count": count} for count, term in node.top[:limit]]
+
+
+def _word_start_keys(term: str) -> Iterable[str]:
+    """전체 값과 두 번째 단어 이후 각 단어의 시작 위치부터의 정규화 key"""
+    words: list[str] = term.split()
+    for i in range(len(words)):
+        yield normalize_suggest_key(" ".join(words[i:]))
+
+
+def _build_trie(counter: Counter) -> PrefixTrie:
+    trie = PrefixTrie()
+    for term, count in counter.items():
+        for key in _word_start_keys(term):
+            trie.insert(key, term, count)
+    trie.finalize()
+    return trie
+
+
+def _clean_names(values: Iterable) -> List[str]:
+    names: List[str] = []
+    for v in values:
+        if isinstance(v, str) and v.strip():
+            names.append(" ".join(v.split()))
+    return names
+
+
+def collect_suggest_terms(patents: Iterable[Dict]) -> Dict[str, Counter]:
+    """KIPRIS 원본 구조에서 필드별 자동완성 용어와 등장 빈도를 수집"""
+    counters: Dict[str, Counter] = {field: Counter() for field in SUGGEST_FIELDS}
+    find = search_service.find_key_recursive
+    for patent in patents:
+        inventors: List[str] = []
+        for subtree in find(patent, "inventorInfoArray"):
+            inventors.extend(_clean_names(find(subtree, "name")))
+        counters["inventor"].update(dict.fromkeys(inventors, 1))
+        if inventors:
+            counters["manager"][inventors[0]] += 1
+
+        applicants: List[str] = []
+        for subtree in find(patent, "applicantInfoArray"):
+            applicants.extend(_clean_names(find(subtree, "name")))
+        counters["applicant"].update(dict.fromkeys(applicants, 1))
+
+        titles = _clean_names(find(patent, "inventionTitle"))
+        if titles:
+            counters["title"].update(dict.fromkeys(_title_token_pattern.findall(titles[0]), 1))
+    return counters
+
+
+def build_suggest_indexes(patents: Iterable[Dict]) -> Dict[str, PrefixTrie]:
+    """필드별 trie 생성 (서비스 반영은 search_service.install_corpus의 코퍼스 교체로 이뤄진다)"""
+    counters = collect_suggest_terms(patents)
+    return {field: _build_trie(counter) for field, counter in counters.items()}
+
+
+def suggest(field: str, prefix: str, limit: int = SUGGEST_MAX_LIMIT) -> List[dict]:
+    trie = search_service.corpus.suggest_indexes.get(field)
+    key: str = normalize_suggest_key(prefix or "")
+    if trie is None or not key:
+        return []
+    return trie.search(key, min(max(limit, 1), SUGGEST_MAX_LIMIT))
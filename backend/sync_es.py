@@ -8,14 +8,36 @@ MongoDB patents 컬렉션의 데이터를 Elasticsearch로 동기화하는 스
 
 참고: transform_patents.py 실행 시 자동으로 동기화되므로,
       대부분의 경우 별도 실행이 필요 없습니다.
+
+증분 동기화 (--incremental):
+- MongoDB change stream을 따라가며 추가/수정/삭제된 특허만 Elasticsearch에 반영
+- resume token을 es_sync_state 컬렉션에 저장하므로 재시작 시 중단 지점부터 이어서 처리
+- change stream을 쓸 수 없는 환경(standalone MongoDB)에서는 updatedAt 워터마크로 대체
+  (이 모드에서는 삭제를 감지할 수 없으므로 주기적인 --clear 재색인이 필요)
+- --follow: 종료하지 않고 계속 변경 사항을 반영
 """
 import os
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
 import pymongo
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import bulk
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+# `python backend/sync_es.py`처럼 직접 실행해도 backend 패키지를 import할 수 있도록 루트 경로 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backend.services.es_bulk import BulkIndexer, bulk_index, bulk_load_settings
+from backend.services.es_index import (
+    build_es_document,
+    create_versioned_index,
+    delete_old_indices,
+    ensure_patents_index,
+    swap_alias,
+)
+
 load_dotenv()
 
 def get_db(use_cloud=False):
@@ -46,6 +68,203 @@ def get_es_client():
         print("❌ Elasticsearch 연결 실패 (서버 응답 없음)")
         return None
 
+# 증분 동기화 상태 (resume token / 워터마크) 저장 위치
+SYNC_STATE_COLLECTION = "es_sync_state"
+SYNC_STATE_ID = "patents"
+
+def load_sync_state(db) -> dict:
+    return db[SYNC_STATE_COLLECTION].find_one({"_id": SYNC_STATE_ID}) or {}
+
+def save_sync_state(db, **fields):
+    fields["updatedAt"] = datetime.utcnow()
+    db[SYNC_STATE_COLLECTION].update_one({"_id": SYNC_STATE_ID}, {"$set": fields}, upsert=True)
+
+def _server_time(db):
+    """MongoDB 서버 시각 (updatedAt은 $currentDate로 서버 시계가 찍으므로 워터마크도 같은 시계 기준)"""
+    return db.command("hello")["localTime"].replace(tzinfo=None)
+
+def _watermark_query(watermark, watermark_id):
+    """
+    (updatedAt, _id) 복합 커서 이후의 문서.
+    _id가 없으면(전체 동기화 직후 등) 같은 시각의 문서를 놓치지 않도록 $gte로 다시 읽는다 (재색인은 멱등).
+    """
+    if watermark is None:
+        return {}
+    if watermark_id is None:
+        return {"updatedAt": {"$gte": watermark}}
+    return {"$or": [
+        {"updatedAt": {"$gt": watermark}},
+        {"updatedAt": watermark, "_id": {"$gt": watermark_id}},
+    ]}
+
+def _current_resume_token(service_col):
+    """현재 시점의 change stream resume token (change stream 미지원 환경이면 None)"""
+    try:
+        with service_col.watch(max_await_time_ms=1) as stream:
+            return stream.resume_token
+    except pymongo.errors.PyMongoError:
+        return None
+
+def _flush_changes(es, target_index, pending: dict) -> tuple[int, int]:
+    """
+    모아둔 변경 사항을 한 번에 반영.
+    pending: {mongo _id 문자열: 최신 문서 (삭제면 None)} - 같은 문서의 연속 변경은 마지막 상태만 반영된다.
+    """
+    es_actions = []
+    deleted_ids = []
+    for mongo_id, patent in pending.items():
+        if patent is None:
+            deleted_ids.append(mongo_id)
+            continue
+        doc_id, es_doc = build_es_document(patent)
+        es_actions.append({"_index": target_index, "_id": doc_id, "_source": es_doc})
+
+    indexed = 0
+    if es_actions:
+        indexed, failed = bulk_index(es, es_actions)
+        if failed:
+            print(f"⚠️  인덱싱 실패: {len(failed)}건")
+    deleted = 0
+    if deleted_ids:
+        result = es.delete_by_query(
+            index=target_index,
+            query={"terms": {"mongoId": deleted_ids}},
+            conflicts="proceed",
+        )
+        deleted = result.get("deleted", 0)
+    return indexed, deleted
+
+def _sync_with_change_stream(db, es, target_index, batch_size, flush_interval_s, follow):
+    service_col = db["patents"]
+    state = load_sync_state(db)
+    resume_token = state.get("resume_token")
+    if resume_token:
+        print("▶ 저장된 resume token부터 change stream을 이어서 읽습니다.")
+    else:
+        print("▶ 저장된 resume token이 없어 현재 시점부터 change stream을 읽습니다.")
+
+    pending = {}
+    total_indexed = 0
+    total_deleted = 0
+    last_flush_s = time.monotonic()
+    with service_col.watch(
+        full_document="updateLookup",
+        resume_after=resume_token,
+        max_await_time_ms=1000,
+    ) as stream:
+        while stream.alive:
+            change = stream.try_next()
+            if change is not None:
+                operation = change.get("operationType")
+                if operation in ("insert", "update", "replace"):
+                    # updateLookup 시점에 이미 삭제된 문서는 fullDocument가 None
+                    pending[str(change["documentKey"]["_id"])] = change.get("fullDocument")
+                elif operation == "delete":
+                    pending[str(change["documentKey"]["_id"])] = None
+                elif operation in ("drop", "rename", "invalidate"):
+                    print(f"⚠️  change stream 종료 이벤트: {operation} - 전체 재색인(--clear)이 필요합니다.")
+                    break
+
+            idle = change is None
+            elapsed_s = time.monotonic() - last_flush_s
+            if pending and (len(pending) >= batch_size or idle or elapsed_s >= flush_interval_s):
+                indexed, deleted = _flush_changes(es, target_index, pending)
+                total_indexed += indexed
+                total_deleted += deleted
+                print(f"🔄 변경 반영: 색인 {indexed}건, 삭제 {deleted}건")
+                pending = {}
+                # 반영이 끝난 뒤에만 토큰을 저장해야 재시작 시 유실이 없다
+                save_sync_state(db, resume_token=stream.resume_token)
+                last_flush_s = time.monotonic()
+            elif idle and (not follow or elapsed_s >= flush_interval_s):
+                # 변경이 없어도 토큰을 주기적으로 갱신해 oplog 보존 기간을 벗어나지 않도록 한다
+                save_sync_state(db, resume_token=stream.resume_token)
+                last_flush_s = time.monotonic()
+
+            if change is None and not pending and not follow:
+                break
+
+        if pending:
+            indexed, deleted = _flush_changes(es, target_index, pending)
+            total_indexed += indexed
+            total_deleted += deleted
+            save_sync_state(db, resume_token=stream.resume_token)
+    return total_indexed, total_deleted
+
+def _sync_with_watermark(db, es, target_index, batch_size, poll_interval_s, follow):
+    """
+    change stream을 쓸 수 없을 때: (updatedAt, _id) 워터마크 이후 변경된 문서만 재색인.
+    같은 updatedAt을 가진 문서가 배치 경계에 걸려도 _id로 이어서 읽으므로 건너뛰지 않는다.
+    """
+    service_col = db["patents"]
+    total_indexed = 0
+    while True:
+        state = load_sync_state(db)
+        watermark = state.get("watermark")
+        watermark_id = state.get("watermark_id")
+        query = _watermark_query(watermark, watermark_id)
+        if not watermark:
+            print("⚠️  저장된 워터마크가 없어 전체 문서를 한 번 동기화합니다.")
+
+        pending = {}
+        latest = (watermark, watermark_id)
+        cursor = (
+            service_col.find(query)
+            .sort([("updatedAt", pymongo.ASCENDING), ("_id", pymongo.ASCENDING)])
+            .batch_size(batch_size)
+        )
+        for patent in cursor:
+            pending[str(patent["_id"])] = patent
+            # 정렬 순서대로 읽으므로 마지막으로 읽은 문서가 곧 커서 위치
+            updated_at = patent.get("updatedAt")
+            if isinstance(updated_at, datetime):
+                latest = (updated_at, patent["_id"])
+            if len(pending) >= batch_size:
+                indexed, _ = _flush_changes(es, target_index, pending)
+                total_indexed += indexed
+                pending = {}
+                save_sync_state(db, watermark=latest[0], watermark_id=latest[1])
+        if pending:
+            indexed, _ = _flush_changes(es, target_index, pending)
+            total_indexed += indexed
+        if latest[0] is not None:
+            save_sync_state(db, watermark=latest[0], watermark_id=latest[1])
+
+        if not follow:
+            return total_indexed, 0
+        time.sleep(poll_interval_s)
+
+def sync_incremental(use_cloud=False, batch_size=500, flush_interval_s=5.0, follow=False):
+    """변경된 특허만 Elasticsearch에 반영 (change stream 우선, 실패 시 워터마크)"""
+    db = get_db(use_cloud=use_cloud)
+    es = get_es_client()
+
+    if not es:
+        print("⚠️  Elasticsearch 연결 실패로 동기화를 중단합니다.")
+        return
+
+    try:
+        target_index = ensure_patents_index(es)
+        try:
+            indexed, deleted = _sync_with_change_stream(db, es, target_index, batch_size, flush_interval_s, follow)
+        except pymongo.errors.OperationFailure as e:
+            # standalone MongoDB 등 change stream 미지원 환경
+            print(f"⚠️  change stream을 사용할 수 없어 updatedAt 워터마크 모드로 전환합니다: {e}")
+            indexed, deleted = _sync_with_watermark(db, es, target_index, batch_size, flush_interval_s, follow)
+        es.indices.refresh(index=target_index)
+        print(f"🎉 증분 동기화 완료! 색인 {indexed}건, 삭제 {deleted}건")
+
+    except KeyboardInterrupt:
+        print("\n⏹️  증분 동기화 중단 (마지막으로 반영된 지점까지 저장됨)")
+    except Exception as e:
+        print(f"❌ 오류 발생: {str(e)}")
+        import traceback
+        traceback.print_exc()
+
+    finally:
+        es.close()
+        print("🔌 연결 종료")
+
 def sync_data(use_cloud=False, clear_index=False):
     """MongoDB patents 컬렉션의 모든 데이터를 Elasticsearch로 동기화"""
     db = get_db(use_cloud=use_cloud)
@@ -56,75 +275,46 @@ def sync_data(use_cloud=False, clear_index=False):
         return
     
     try:
-        # 인덱스 삭제 옵션 (중복 데이터 제거)
+        # 전체 재색인 옵션: 새 버전 인덱스에 적재한 뒤 alias를 교체 (검색 다운타임 없음)
         if clear_index:
-            if es.indices.exists(index="patents"):
-                es.indices.delete(index="patents")
-                print("🗑️  기존 Elasticsearch 인덱스 삭제 완료")
-            # 인덱스 재생성 (자동으로 생성됨)
+            target_index = create_versioned_index(es)
+        else:
+            target_index = ensure_patents_index(es)
         
         service_col = db["patents"]
         total_count = service_col.count_documents({})
         
         print(f"🚀 데이터 동기화 시작... (총 {total_count}건)")
         
-        es_actions = []
-        success_count = 0
-        
-        # MongoDB에서 데이터 읽기 및 Elasticsearch bulk 준비
-        for patent in tqdm(service_col.find({}), total=total_count, desc="동기화 중"):
-            # _id 필드 처리 - applicationNumber를 _id로 사용 (transform_patents.py와 동일하게)
-            p_id = patent.get("applicationNumber", "")
-            if not p_id:
-                # applicationNumber가 없으면 MongoDB _id 사용
-                p_id = str(patent.get("_id", ""))
-            
-            # _id 필드를 제거 (Elasticsearch _id와 충돌 방지)
-            patent_copy = patent.copy()
-            if "_id" in patent_copy:
-                del patent_copy["_id"]
-            
-            # rawRef를 문자열로 변환
-            if "rawRef" in patent_copy:
-                patent_copy["rawRef"] = str(patent_copy["rawRef"])
-            
-            # 책임연구자 필드 추가 (inventors[0].name)
-            inventors = patent_copy.get("inventors", [])
-            if inventors and len(inventors) > 0:
-                first_inventor = inventors[0]
-                if isinstance(first_inventor, dict):
-                    patent_copy["responsibleInventor"] = first_inventor.get("name", "")
-                elif isinstance(first_inventor, str):
-                    patent_copy["responsibleInventor"] = first_inventor
-                else:
-                    patent_copy["responsibleInventor"] = ""
-            else:
-                patent_copy["responsibleInventor"] = ""
-            
-            # Elasticsearch bulk action 준비
-            es_actions.append({
-                "_index": "patents",
-                "_id": str(p_id),
-                "_source": patent_copy
-            })
-            
-            # 500개마다 bulk 실행
-            if len(es_actions) >= 500:
-                success, failed = bulk(es, es_actions, raise_on_error=False)
-                success_count += success
-                if failed:
-                    print(f"⚠️  인덱싱 실패: {len(failed)}건")
-                es_actions = []
-        
-        # 남은 데이터 처리
-        if es_actions:
-            success, failed = bulk(es, es_actions, raise_on_error=False)
-            success_count += success
-            if failed:
-                print(f"⚠️  인덱싱 실패: {len(failed)}건")
+        # 전체 동기화 이후의 변경분을 증분 동기화가 이어받을 수 있도록 시작 시점을 먼저 기록
+        # (클라이언트 시계가 아닌 MongoDB 서버 시계 기준 - updatedAt과 같은 시계)
+        started_at = _server_time(db)
+        start_resume_token = _current_resume_token(service_col)
+
+        # MongoDB에서 읽으면서 바로 병렬 bulk 색인
+        # refresh/replica 비활성화는 아직 alias 뒤에 있지 않은 새 인덱스(--clear)에만 적용 (서비스 중인 인덱스는 설정 유지)
+        load_settings = bulk_load_settings(es, target_index) if clear_index else nullcontext()
+        with load_settings, BulkIndexer(es) as indexer:
+            for patent in tqdm(service_col.find({}), total=total_count, desc="동기화 중"):
+                doc_id, es_doc = build_es_document(patent)
+                indexer.add({
+                    "_index": target_index,
+                    "_id": doc_id,
+                    "_source": es_doc
+                })
+        success_count = indexer.success_count
+        if indexer.errors:
+            print(f"⚠️  인덱싱 실패: {len(indexer.errors)}건")
+        if indexer.retry_count:
+            print(f"↻  429 재시도: {indexer.retry_count}건")
         
-        # 인덱스 새로고침
-        es.indices.refresh(index="patents")
+        if clear_index:
+            swap_alias(es, target_index)
+            delete_old_indices(es, keep=1)
+        else:
+            es.indices.refresh(index=target_index)
+        # watermark_id=None → 다음 증분 동기화는 started_at과 같은 시각의 문서부터($gte) 다시 읽는다
+        save_sync_state(db, resume_token=start_resume_token, watermark=started_at, watermark_id=None)
         print(f"🎉 동기화 완료! 총 {success_count}개의 데이터가 인덱싱되었습니다.")
         
     except Exception as e:
@@ -143,8 +333,14 @@ if __name__ == "__main__":
     # 명령줄 인자로 클라우드 사용 여부 확인
     use_cloud = "--cloud" in sys.argv or "-c" in sys.argv
     clear_index = "--clear" in sys.argv or "--reset" in sys.argv
+    incremental = "--incremental" in sys.argv or "-i" in sys.argv
+    follow = "--follow" in sys.argv
     
+    if incremental:
+        sync_incremental(use_cloud=use_cloud, follow=follow)
+        sys.exit(0)
+
     if clear_index:
-        print("⚠️  기존 Elasticsearch 인덱스를 삭제하고 재생성합니다...")
+        print("⚠️  새 버전 인덱스로 전체 재색인 후 alias를 교체합니다...")
     
     sync_data(use_cloud=use_cloud, clear_index=clear_index)
\ No newline at end of file
@@ -0,0 +1,56 @@
+// 빌드 결과(dist)의 텍스트 자산을 .br/.gz로 미리 압축한다 (npm run build 마지막 단계).
+// scripts/serve-static.mjs가 Accept-Encoding에 맞춰 압축본을 그대로 보낸다 → 요청마다 압축하지 않음.
+// 사용법: node scripts/precompress.mjs [dist]
+import { readdir, readFile, stat, writeFile } from 'node:fs/promises';
+import path from 'node:path';
+import { brotliCompressSync, constants, gzipSync } from 'node:zlib';
+
+const COMPRESSIBLE_EXTENSIONS = new Set([
+  '.html', '.js', '.mjs', '.css', '.json', '.map', '.svg', '.txt', '.xml', '.webmanifest', '.ico', '.wasm',
+]);
+// 이보다 작은 파일은 압축 이득이 거의 없다
+const MIN_SIZE = 1024;
+
+async function* walk(dir) {
+  for (const entry of await readdir(dir, { withFileTypes: true })) {
+    const fullPath = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      yield* walk(fullPath);
+    } else if (entry.isFile()) {
+      yield fullPath;
+    }
+  }
+}
+
+async function precompress(root) {
+  let files = 0;
+  let originalBytes = 0;
+  let brBytes = 0;
+  let gzBytes = 0;
+  for await (const file of walk(root)) {
+    if (!COMPRESSIBLE_EXTENSIONS.has(path.extname(file).toLowerCase())) continue;
+    const { size } = await stat(file);
+    if (size < MIN_SIZE) continue;
+
+    const data = await readFile(file);
+    const br = brotliCompressSync(data, {
+      params: {
+        [constants.BROTLI_PARAM_QUALITY]: constants.BROTLI_MAX_QUALITY,
+        [constants.BROTLI_PARAM_SIZE_HINT]: data.length,
+      },
+    });
+    const gz = gzipSync(data, { level: constants.Z_BEST_COMPRESSION });
+    // 원본보다 크면 압축본을 만들지 않음 (서버가 원본으로 대체)
+    if (br.length < data.length) await writeFile(`${file}.br`, br);
+    if (gz.length < data.length) await writeFile(`${file}.gz`, gz);
+
+    files += 1;
+    originalBytes += data.length;
+    brBytes += Math.min(br.length, data.length);
+    gzBytes += Math.min(gz.length, data.length);
+  }
+  const kb = (bytes) => `${(bytes / 1024).toFixed(1)}KB`;
+  console.log(`✅ precompressed ${files} files: ${kb(originalBytes)} → br ${kb(brBytes)}, gzip ${kb(gzBytes)}`);
+}
+
+await precompress(path.resolve(process.argv[2] ?? 'dist'));
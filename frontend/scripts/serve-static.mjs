@@ -0,0 +1,129 @@
+// dist 정적 서버 (SPA fallback, `serve -s dist` 대체)
+// - scripts/precompress.mjs가 만든 .br/.gz가 있으면 Accept-Encoding에 맞춰 그대로 전송 (Vary: Accept-Encoding)
+// - 해시가 붙은 /assets/*는 1년 immutable 캐시, index.html 등은 no-cache + ETag 재검증
+// 사용법: node scripts/serve-static.mjs [dist]  (PORT 환경 변수, 기본 3000)
+import { createReadStream } from 'node:fs';
+import { stat } from 'node:fs/promises';
+import http from 'node:http';
+import path from 'node:path';
+
+const ROOT = path.resolve(process.argv[2] ?? 'dist');
+const PORT = Number(process.env.PORT ?? 3000);
+
+const CONTENT_TYPES = {
+  '.html': 'text/html; charset=utf-8',
+  '.js': 'text/javascript; charset=utf-8',
+  '.mjs': 'text/javascript; charset=utf-8',
+  '.css': 'text/css; charset=utf-8',
+  '.json': 'application/json; charset=utf-8',
+  '.map': 'application/json; charset=utf-8',
+  '.webmanifest': 'application/manifest+json',
+  '.svg': 'image/svg+xml',
+  '.txt': 'text/plain; charset=utf-8',
+  '.xml': 'application/xml',
+  '.ico': 'image/x-icon',
+  '.png': 'image/png',
+  '.jpg': 'image/jpeg',
+  '.jpeg': 'image/jpeg',
+  '.gif': 'image/gif',
+  '.webp': 'image/webp',
+  '.avif': 'image/avif',
+  '.woff': 'font/woff',
+  '.woff2': 'font/woff2',
+  '.wasm': 'application/wasm',
+  '.pdf': 'application/pdf',
+};
+
+// Accept-Encoding에서 q>0으로 허용된 인코딩 목록
+function acceptedEncodings(header = '') {
+  const accepted = new Set();
+  for (const part of header.split(',')) {
+    const [token, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.map((p) => p.trim()).find((p) => p.startsWith('q='));
+    if (token && (q === undefined || Number(q.slice(2)) > 0)) accepted.add(token);
+  }
+  return accepted;
+}
+
+async function fileStat(filePath) {
+  try {
+    const info = await stat(filePath);
+    return info.isFile() ? info : null;
+  } catch {
+    return null;
+  }
+}
+
+async function resolveFile(urlPath) {
+  let decoded;
+  try {
+    decoded = decodeURIComponent(urlPath);
+  } catch {
+    return null;
+  }
+  const filePath = path.join(ROOT, path.normalize(decoded));
+  if (filePath !== ROOT && !filePath.startsWith(ROOT + path.sep)) return null;
+  const info = await fileStat(filePath);
+  if (info) return { filePath, info };
+  // 확장자 없는 경로는 클라이언트 라우트 → index.html (serve -s와 동일)
+  if (!path.extname(decoded)) {
+    const indexPath = path.join(ROOT, 'index.html');
+    const indexInfo = await fileStat(indexPath);
+    if (indexInfo) return { filePath: indexPath, info: indexInfo };
+  }
+  return null;
+}
+
+const server = http.createServer(async (req, res) => {
+  if (req.method !== 'GET' && req.method !== 'HEAD') {
+    res.writeHead(405, { Allow: 'GET, HEAD' }).end();
+    return;
+  }
+  const urlPath = new URL(req.url ?? '/', 'http://localhost').pathname;
+  const resolved = await resolveFile(urlPath === '/' ? '/index.html' : urlPath);
+  if (!resolved) {
+    res.writeHead(404, { 'Content-Type': 'text/plain; charset=utf-8' }).end('Not Found');
+    return;
+  }
+
+  let { filePath, info } = resolved;
+  const headers = {
+    'Content-Type': CONTENT_TYPES[path.extname(filePath).toLowerCase()] ?? 'application/octet-stream',
+    'Cache-Control': urlPath.startsWith('/assets/') ? 'public, max-age=31536000, immutable' : 'no-cache',
+    Vary: 'Accept-Encoding',
+  };
+
+  const accepted = acceptedEncodings(req.headers['accept-encoding']);
+  for (const [encoding, suffix] of [['br', '.br'], ['gzip', '.gz']]) {
+    if (!accepted.has(encoding)) continue;
+    const compressedInfo = await fileStat(filePath + suffix);
+    if (compressedInfo) {
+      filePath += suffix;
+      info = compressedInfo;
+      headers['Content-Encoding'] = encoding;
+      break;
+    }
+  }
+
+  const encodingTag = headers['Content-Encoding'] ? `-${headers['Content-Encoding']}` : '';
+  headers.ETag = `W/"${info.size.toString(16)}-${Math.floor(info.mtimeMs).toString(16)}${encodingTag}"`;
+  headers['Last-Modified'] = info.mtime.toUTCString();
+  if (req.headers['if-none-match'] === headers.ETag) {
+    res.writeHead(304, headers).end();
+    return;
+  }
+
+  headers['Content-Length'] = info.size;
+  res.writeHead(200, headers);
+  if (req.method === 'HEAD') {
+    res.end();
+    return;
+  }
+  createReadStream(filePath)
+    .on('error', () => res.destroy())
+    .pipe(res);
+});
+
+server.listen(PORT, () => {
+  console.log(`✅ serving ${ROOT} on :${PORT}`);
+});
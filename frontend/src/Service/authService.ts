@@ -8,8 +8,15 @@ export const authService = {
     const response = await axios.post(`${API_URL}/login`, { email, password });
     return response.data; // 여기서 access_token이 넘어옵니다.
   },
-  signup: async (userData: {name: string; email: string; password: string; role: string}) => {
+  signup: async (userData: {name: string; email: string; password: string}) => {
     const response = await axios.post(`${API_URL}/signup`, userData);
     return response.data;
+  },
+  // 저장된 토큰 검증 + 현재 사용자 정보 (토큰이 만료/무효면 401)
+  me: async (token: string = localStorage.getItem('token') ?? '') => {
+    const response = await axios.get<{ email: string; role: string; expires_at: number }>(`${API_URL}/me`, {
+      headers: { Authorization: `Bearer ${token}` },
+    });
+    return response.data;
   }
 };
\ No newline at end of file
@@ -81,6 +81,26 @@ export const chatService = {
     }
   }
   ,
+  /**
+   * 3-1. 특정 세션의 대화 내역을 최신 메시지부터 페이지 단위로 가져오기
+   * @param before 이전 페이지 응답의 next_before (첫 페이지는 생략)
+   */
+  async getChatHistoryPage(
+    sessionId: string,
+    limit: number = 50,
+    before?: number | null
+  ): Promise<{ messages: any[]; has_more: boolean; next_before: number | null }> {
+    try {
+      const response = await apiClient.get(`/api/chatbot/sessions/${sessionId}/messages`, {
+        params: { limit, before: before ?? undefined },
+      });
+      return response.data;
+    } catch (error) {
+      console.error("Get History Page Error:", error);
+      return { messages: [], has_more: false, next_before: null };
+    }
+  }
+  ,
   /**
    * 4. 특정 세션 삭제
    */
@@ -15,6 +15,13 @@ export interface FetchPatentsParams {
   status?: string | string[]; // 법적 상태 (단일 또는 배열)
   page?: number;
   limit?: number;
+  view?: "full" | "list"; // list: 목록용 최소 필드만 반환
+  facets?: boolean; // 상태/IPC/CPC/출원인/출원연도 집계 포함
+}
+
+export interface PatentFacetBucket {
+  value: string;
+  count: number;
 }
 
 export interface PatentSearchResponse {
@@ -23,6 +30,7 @@ export interface PatentSearchResponse {
   limit: number;
   data: any[];
   engine: string;
+  facets?: Record<string, PatentFacetBucket[]>;
 }
 
 const apiClient: AxiosInstance = axios.create({
@@ -44,3 +52,24 @@ export async function fetchPatents(params: FetchPatentsParams): Promise<PatentSe
   return response.data;
 }
 
+
+export async function fetchPatentDetail(applicationNumber: string): Promise<any> {
+  const response = await apiClient.get(`/api/patents/${encodeURIComponent(applicationNumber)}`);
+  return response.data;
+}
+
+export interface PatentSuggestion {
+  value: string;
+  count: number;
+}
+
+export async function fetchSuggestions(
+  field: "inventor" | "manager" | "applicant" | "title",
+  q: string,
+  limit: number = 10
+): Promise<PatentSuggestion[]> {
+  const response = await apiClient.get<{ suggestions: PatentSuggestion[] }>("/api/patents/suggest", {
+    params: { field, q, limit }
+  });
+  return response.data.suggestions;
+}
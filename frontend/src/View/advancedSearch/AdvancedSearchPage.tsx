@@ -1,10 +1,10 @@
 import { Form, Input, Button, Card, Table, Tag, Space, Typography, Tabs, message, Skeleton, theme } from 'antd';
 import { SearchOutlined, ReloadOutlined, DownloadOutlined } from '@ant-design/icons';
-import { useState, useContext, useMemo } from 'react';
+import { useState, useContext, useMemo, useCallback, useRef } from 'react';
 import { ThemeContext } from '../../shared/theme/ThemeContext';
 import PatentDetailModal from './PatentDetailModal';
 import PatentPdfModal from './PatentPdfModal';
-import { fetchPatents } from '../../Service/ip/patentService';
+import { fetchPatents, fetchPatentDetail } from '../../Service/ip/patentService';
 import PatentAdvancedSearchModal from './PatentAdvancedSearchModal';
 
 
@@ -31,6 +31,28 @@ export default function AdvancedSearchPage() {
   const [isPdfOpen, setIsPdfOpen] = useState(false);
   const [currentPatent, setCurrentPatent] = useState<any | null>(null);
   const [isAdvModalOpen, setIsAdvModalOpen] = useState(false); 
+  // 상세 조회 결과 캐시 (출원번호 → 전체 _source)
+  const detailCacheRef = useRef<Map<string, any>>(new Map());
+
+  // 목록(view=list)에는 표시용 필드만 있으므로, 상세 모달을 열 때 전체 정보를 따로 불러온다
+  const openDetail = useCallback(async (record: any) => {
+    const listData = record.fullData || record;
+    const appNo: string | undefined = listData.applicationNumber || record.appNo;
+    const cached = appNo ? detailCacheRef.current.get(appNo) : undefined;
+    setCurrentPatent(cached ?? listData);
+    setIsDetailOpen(true);
+    if (!appNo || cached) return;
+    try {
+      const detail = await fetchPatentDetail(appNo);
+      const merged = { ...detail, _highlight: listData._highlight };
+      detailCacheRef.current.set(appNo, merged);
+      // 응답을 기다리는 동안 다른 특허를 열었으면 덮어쓰지 않음
+      setCurrentPatent((prev: any) => (prev?.applicationNumber === appNo ? merged : prev));
+    } catch (error) {
+      console.error("Detail Error:", error);
+      message.error('특허 상세 정보를 불러오지 못했습니다.');
+    }
+  }, []);
 
   // --- 탭 데이터 필터링 ---
   const filteredData = useMemo(() => {
@@ -107,7 +129,8 @@ export default function AdvancedSearchPage() {
       const response = await fetchPatents({
         ...cleanParams,
         page: 1,
-        limit: 10000 
+        limit: 10000,
+        view: 'list' // 테이블 표시용 필드만 (상세는 openDetail에서 개별 조회)
       });
 
       if (response && response.data) {
@@ -169,6 +192,7 @@ export default function AdvancedSearchPage() {
           );
         }
 
+        detailCacheRef.current.clear();
         setDataSource(patentList);
         setStats({ ...stats, total: patentList.length, KR: patentList.length });
         message.success(`검색 결과 ${patentList.length}건을 불러왔습니다.`);
@@ -245,7 +269,7 @@ export default function AdvancedSearchPage() {
     {
       title: '출원번호', dataIndex: 'appNo', width: 150, align: 'center' as const,
       render: (text: string, record: any) => (
-        <a style={{ color: token.colorLink }} onClick={() => { setCurrentPatent(record.fullData || record); setIsDetailOpen(true); }}>
+        <a style={{ color: token.colorLink }} onClick={() => { void openDetail(record); }}>
           {text}
         </a>
       )
@@ -275,7 +299,7 @@ export default function AdvancedSearchPage() {
         );
         
         return (
-          <b style={{ cursor: 'pointer', color: token.colorText, textAlign: 'left' }} onClick={() => { setCurrentPatent(record.fullData || record); setIsDetailOpen(true); }}>
+          <b style={{ cursor: 'pointer', color: token.colorText, textAlign: 'left' }} onClick={() => { void openDetail(record); }}>
             {highlightedTitle}
           </b>
         );
@@ -283,7 +307,7 @@ export default function AdvancedSearchPage() {
     },
     { title: '책임연구자', dataIndex: 'inventor', width: 120, align: 'center' as const },
     { title: '소속', dataIndex: 'affiliation', width: 250, align: 'center' as const },
-  ], [token.colorText, token.colorLink]);
+  ], [token.colorText, token.colorLink, openDetail]);
 
   // 출원번호/등록번호 필드 배경색 (다크 모드 대응)
   // 다크 모드에서는 더 밝은 회색으로, 라이트 모드에서는 연한 회색으로 설정
@@ -59,7 +59,6 @@ const LoginPage = () => {
         name: signupName,
         email: signupEmail,
         password: signupPassword,
-        role: "user" // 기본값 설정
       });
       alert('회원가입 성공! 이제 로그인해주세요.');
       toggle(); // 성공 시 로그인 폼으로 전환
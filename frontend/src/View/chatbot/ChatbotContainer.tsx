@@ -19,7 +19,12 @@ const ChatbotContainer = () => {
 
 
   //viewModel 사용
-  const { messages, sessions, currentSessionId, currentSessionKey, selectSession, createNewChat, deleteSession, sendMessage } = useChatViewModel();
+  const {
+    messages, sessions, currentSessionId, currentSessionKey, selectSession, createNewChat, deleteSession, sendMessage,
+    hasMoreHistory, isLoadingOlder, loadOlderMessages, historyVersion,
+  } = useChatViewModel();
+  // 채팅 UI는 마운트 시점의 initialMessages만 쓰므로, 서버 내역이 바뀌면 다시 마운트한다
+  const chatbotKey: string = `${currentSessionKey}:${historyVersion}`;
 
   // Fallback wiring for ActionProvider across react-chatbot-kit versions.
   // Use layout effect so it's available before the user submits the first message.
@@ -64,6 +69,24 @@ const ChatbotContainer = () => {
   const lastScrollTopRef = useRef<number | null>(null);
   const lockIntervalRef = useRef<number | null>(null);
 
+  // 0) 이전 대화를 앞에 붙이면 채팅창이 다시 마운트되므로, 보던 메시지가 제자리에 보이도록 바닥 기준 거리를 복원
+  //    (라이브러리의 마운트 스크롤 이후, 아래 리스너가 위치를 다시 계산하기 전에 실행되도록 여기 둔다)
+  const scrollFromBottomRef = useRef<number | null>(null);
+  const handleLoadOlder = async (): Promise<void> => {
+    const container = document.querySelector<HTMLDivElement>(".react-chatbot-kit-chat-message-container");
+    scrollFromBottomRef.current = container ? container.scrollHeight - container.scrollTop : null;
+    await loadOlderMessages();
+  };
+
+  useEffect(() => {
+    const fromBottom: number | null = scrollFromBottomRef.current;
+    if (fromBottom === null) return;
+    scrollFromBottomRef.current = null;
+    const container = document.querySelector<HTMLDivElement>(".react-chatbot-kit-chat-message-container");
+    if (!container) return;
+    container.scrollTop = Math.max(0, container.scrollHeight - fromBottom);
+  }, [chatbotKey]);
+
   // 1) 사용자 스크롤 방향 감지 (위로 올리면 자동 스크롤 잠금)
   useEffect(() => {
     if (!isOpen) return;
@@ -115,7 +138,7 @@ const ChatbotContainer = () => {
         lockIntervalRef.current = null;
       }
     };
-  }, [isOpen, currentSessionKey]); // 세션 바뀌거나 창이 열릴 때만 리스너 부착
+  }, [isOpen, chatbotKey]); // 세션/내역이 바뀌거나 창이 열릴 때만 리스너 부착
 
   // 2) 새 메시지가 추가될 때만, 사용자가 바닥 근처에 있을 경우에만 자동 스크롤
   useEffect(() => {
@@ -166,10 +189,20 @@ const ChatbotContainer = () => {
       {/* 오른쪽: 채팅창 영역 */}
       <div className="chatbot-window flex-1">
         {shouldShowWelcome ? <ChatWelcome onPickTemplate={handlePickTemplate} /> : null}
+        {currentSessionId && hasMoreHistory ? (
+          <button
+            type="button"
+            className="chatbot-load-older"
+            onClick={() => { void handleLoadOlder(); }}
+            disabled={isLoadingOlder}
+          >
+            {isLoadingOlder ? '불러오는 중...' : '이전 대화 더 보기'}
+          </button>
+        ) : null}
         <PatentModalProvider>
           <Chatbot
             // [핵심] key를 설정해야 세션 전환 및 '새 채팅' 클릭 시 UI가 초기화됩니다.
-            key={currentSessionKey}
+            key={chatbotKey}
             config={{
               ...config,
               state: {
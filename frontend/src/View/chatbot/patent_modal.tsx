@@ -1,6 +1,7 @@
 import { Modal, Spin, Tabs } from "antd";
+import axios from "axios";
 import { useEffect, useMemo, useState } from "react";
-import { fetchPatents } from "@/Service/ip/patentService";
+import { fetchPatentDetail } from "@/Service/ip/patentService";
 
 export type PatentDetail = {
   applicationNumber: string;
@@ -248,8 +249,12 @@ export default function PatentDetailModal(props: Props) {
       setStatus("loading");
       setErrorMessage("");
       try {
-        const response = await fetchPatents({ app_num: appNo, limit: 1, page: 1 });
-        const first: unknown = Array.isArray(response.data) ? response.data[0] : undefined;
+        // 출원번호 단건 조회 (ETag 조건부 요청 → 다시 열 때는 304)
+        const first: unknown = await fetchPatentDetail(appNo).catch((err: unknown) => {
+          // 404는 아래의 "찾을 수 없음" 메시지로 처리
+          if (axios.isAxiosError(err) && err.response?.status === 404) return undefined;
+          throw err;
+        });
         if (!first || typeof first !== "object") {
           throw new Error("특허 정보를 찾을 수 없습니다.");
         }
@@ -24,6 +24,9 @@ interface ChatSession {
     updated_at: number;
 }
 
+// 세션 선택 시 최신 메시지부터 가져올 개수 (이전 대화는 loadOlderMessages로 이어서 조회)
+const HISTORY_PAGE_SIZE: number = 50;
+
 const createDraftSessionKey = (): string => {
   if (typeof crypto !== "undefined" && "randomUUID" in crypto) {
     return `draft-${(crypto as Crypto).randomUUID()}`;
@@ -41,6 +44,12 @@ export const useChatViewModel = () => {
     const [isLoading, setIsLoading] = useState<boolean>(false);
     const loadSessionsRequestIdRef = useRef<number>(0);
     const [status, setStatus] = useState<'loading' | 'success' | 'timeout' | 'error'>('loading');
+    // 대화 내역 페이지네이션 (next_before 커서)
+    const [hasMoreHistory, setHasMoreHistory] = useState<boolean>(false);
+    const [isLoadingOlder, setIsLoadingOlder] = useState<boolean>(false);
+    const nextBeforeRef = useRef<number | null>(null);
+    // 서버에서 받은 내역으로 messages를 교체할 때마다 증가 (채팅 UI를 다시 마운트해 initialMessages 반영)
+    const [historyVersion, setHistoryVersion] = useState<number>(0);
 
     // --- 초기 데이터 로드 ---
     const loadSessions = useCallback(async () => {
@@ -79,6 +88,8 @@ export const useChatViewModel = () => {
         currentSessionIdRef.current = null;
         setDraftSessionKey(createDraftSessionKey());
         setMessages([]);
+        setHasMoreHistory(false);
+        nextBeforeRef.current = null;
         // 새 채팅이므로 localStorage에 저장할 필요 없음 (아직 세션이 생성되지 않음)
     };
 
@@ -89,6 +100,8 @@ export const useChatViewModel = () => {
     setIsLoading(true);
     setCurrentSessionId(sessionId);
     currentSessionIdRef.current = sessionId;
+    setHasMoreHistory(false);
+    nextBeforeRef.current = null;
 
 
     // 10초 지났는데 여전히 로딩 중이라면 timeout 상태로 변경
@@ -104,12 +117,17 @@ export const useChatViewModel = () => {
       setIsLoading(false);
     }
     
-    // 서버에서 최신 데이터 가져오기 (백그라운드)
+    // 서버에서 최신 페이지만 가져오기 (백그라운드) - 대화가 길어져도 세션 전환 시간은 일정
     try {
-      const history = await chatService.getChatHistory(sessionId);
-      setMessages(history);
+      const page = await chatService.getChatHistoryPage(sessionId, HISTORY_PAGE_SIZE);
+      // 기다리는 동안 다른 세션을 선택했으면 무시
+      if (currentSessionIdRef.current !== sessionId) return;
+      setMessages(page.messages);
+      setHasMoreHistory(page.has_more);
+      nextBeforeRef.current = page.next_before;
+      setHistoryVersion((v) => v + 1);
       // 서버에서 가져온 데이터를 localStorage에 저장
-      saveHistoryToStorage(sessionId, history as CachedMessage[]);
+      saveHistoryToStorage(sessionId, page.messages as CachedMessage[]);
     } catch (error) {
       console.error("내역 로드 실패:", error);
       // 에러 발생 시 캐시된 데이터가 있으면 그대로 유지
@@ -124,6 +142,25 @@ export const useChatViewModel = () => {
 
 
 
+  // 2-1. 이전 대화 더 보기 (현재 가장 오래된 메시지 이전 페이지를 앞에 붙임)
+  const loadOlderMessages = useCallback(async (): Promise<void> => {
+    const sessionId: string | null = currentSessionIdRef.current;
+    const before: number | null = nextBeforeRef.current;
+    if (!sessionId || before === null || isLoadingOlder) return;
+
+    setIsLoadingOlder(true);
+    try {
+      const page = await chatService.getChatHistoryPage(sessionId, HISTORY_PAGE_SIZE, before);
+      if (currentSessionIdRef.current !== sessionId) return;
+      setMessages((prev) => [...(page.messages as Message[]), ...prev]);
+      setHasMoreHistory(page.has_more);
+      nextBeforeRef.current = page.next_before;
+      setHistoryVersion((v) => v + 1);
+    } finally {
+      setIsLoadingOlder(false);
+    }
+  }, [isLoadingOlder]);
+
   // 3. 메시지 전송
   const sendMessage = async (userInput: string): Promise<string> => {
     if (!userInput.trim()) return "";
@@ -234,7 +271,11 @@ export const useChatViewModel = () => {
     createNewChat,
     status,
     deleteSession,
-    refreshSessions: loadSessions
+    refreshSessions: loadSessions,
+    hasMoreHistory,
+    isLoadingOlder,
+    loadOlderMessages,
+    historyVersion
   };
 };
 